@@ -1,23 +1,190 @@
-from fastapi import APIRouter, Depends, HTTPException
-from app.models.request import SentimentRequest
-from app.models.response import GraphSentimentResponse
-from app.service.pipeline_sentiment import SentimentAnalyzer
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from app.models.request import (
+    SentimentRequest,
+    LongTextSentimentRequest,
+    BatchSentimentRequest,
+    GraphSentimentRequest,
+    GraphDeltaRequest
+)
+from app.models.response import ColumnarGraphSentimentResponse, GraphSentimentResponse
+from app.service.pipeline_sentiment import SentimentAnalyzer, compute_graph_metrics
+from app.service.model_registry import model_registry, ModelNotReadyError
+from app.service.batching import batch_scheduler
+from app.service.executor import inference_executor, QueueFullError
+from app.service.health import health_monitor
+from app.service.streaming import stream_sentiments
+from app.service.serialization import RESPONSE_FORMATS, columnar_graph_response, encode_json, graph_response
+from app.service.graph_session import (
+    GraphSession,
+    SessionLimitError,
+    SessionNotFoundError,
+    graph_sessions
+)
 from app.core.security import verify_api_key
 from app.core.config import settings
+from app.core.startup_profile import startup_profile
+from app.core.metrics import stage_latency
+from app.core.profiling import PROFILE_MODES, RequestProfile, active_profile
+from typing import AsyncIterator, Dict, List, Literal, Optional, Union
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-# Dépendance pour l'analyseur de sentiment
-def get_sentiment_analyzer():
-    return SentimentAnalyzer()
+# Dépendance pour l'analyseur de sentiment : instance partagée chargée au démarrage
+def get_sentiment_analyzer() -> SentimentAnalyzer:
+    try:
+        return model_registry.get_analyzer()
+    except ModelNotReadyError:
+        raise HTTPException(status_code=503, detail="Model not ready")
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """
+    Réponse NDJSON émise pendant la lecture du corps de la requête.
+    
+    StreamingResponse écoute la déconnexion du client en consommant receive(),
+    ce qui lui ferait avaler les morceaux du corps encore attendus par
+    request.stream(). Ici la réponse se contente d'émettre ; une déconnexion
+    remonte via request.stream() (ClientDisconnect).
+    """
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+async def request_profile(
+    profile: Optional[str] = Query(
+        None,
+        description="Profilage de la requête : timings ou cprofile (équivaut à l'en-tête X-Profile)"
+    ),
+    x_profile: Optional[str] = Header(None, description="Profilage de la requête : timings ou cprofile"),
+    api_key: str = Depends(verify_api_key)
+) -> AsyncIterator[Optional[RequestProfile]]:
+    """
+    Active le profilage de la requête si demandé par une clé API valide.
+    
+    Désactivé par défaut (settings.request_profiling_enabled). Les temps par étape
+    sont ajoutés aux métadonnées de la réponse ("profile") ; en mode cprofile, un
+    dump cProfile de l'inférence est aussi écrit dans settings.request_profiling_dump_dir,
+    qui garde au plus settings.request_profiling_max_dumps dumps. Sans demande,
+    rien n'est enregistré.
+    """
+    mode = x_profile or profile
+    if not mode or not settings.request_profiling_enabled:
+        yield None
+        return
+    mode = "timings" if mode.lower() in ("1", "true") else mode.lower()
+    if mode not in PROFILE_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid profile mode: {mode} (expected one of {list(PROFILE_MODES)})"
+        )
+    with RequestProfile(capture_cprofile=mode == "cprofile").activate() as request_profile:
+        yield request_profile
+
+def profile_report(profile: RequestProfile) -> Dict:
+    """Temps par étape du profil, et chemin du dump cProfile s'il a été capturé."""
+    report = profile.to_dict()
+    if profile.capture_cprofile:
+        report["cprofile_path"] = profile.dump_cprofile(
+            settings.request_profiling_dump_dir, max_dumps=settings.request_profiling_max_dumps
+        )
+    logger.info(f"Profil de requête: {report}")
+    return report
+
+class FastJSONResponse(Response):
+    """Réponse JSON encodée par orjson (json en repli), sans passer par jsonable_encoder."""
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return encode_json(content)
+
+async def response_format(
+    response_format: Literal[RESPONSE_FORMATS] = Query(
+        "graph",
+        alias="format",
+        description="graph : un objet par node/edge ; columnar : une liste par champ (plus compact)"
+    )
+) -> str:
+    """Format de la réponse demandé par le client."""
+    return response_format
+
+def graph_responses(status_code: int = 200) -> Dict:
+    """
+    Documentation OpenAPI des routes de graphe : la réponse suit le format demandé.
+    
+    Les routes renvoient directement une FastJSONResponse, le schéma n'est donc
+    pas validé ; il décrit les deux formes possibles de la réponse.
+    """
+    return {
+        status_code: {
+            "model": Union[GraphSentimentResponse, ColumnarGraphSentimentResponse],
+            "description": "GraphSentimentResponse (?format=graph) ou ColumnarGraphSentimentResponse (?format=columnar)"
+        }
+    }
+
+def build_graph_response(
+    nodes: List[Dict],
+    edges: Optional[List[Dict]] = None,
+    metrics: Optional[Dict] = None,
+    response_format: str = "graph",
+    metadata: Optional[Dict] = None
+) -> FastJSONResponse:
+    """
+    Construit la réponse, temps mesuré dans les métriques.
+    
+    Les résultats produits par l'analyseur respectent déjà le schéma
+    GraphSentimentResponse : ils sont mis en forme sans revalidation pydantic
+    (sauf si settings.validate_responses) et encodés directement, la réponse
+    court-circuitant la validation du response_model de la route.
+    Pour une requête profilée, le profil est ajouté aux métadonnées de la réponse.
+    
+    Args:
+        nodes (List[Dict]): Analyses des nodes
+        edges (Optional[List[Dict]]): Analyses des edges
+        metrics (Optional[Dict]): Métriques globales, calculées si absentes
+        response_format (str): "graph" (schéma GraphSentimentResponse) ou "columnar"
+        metadata (Optional[Dict]): Métadonnées de la réponse
+        
+    Returns:
+        FastJSONResponse: Réponse encodée
+    """
+    edges = edges or []
+    with stage_latency.time(stage="response_build"):
+        metrics = metrics if metrics is not None else compute_graph_metrics(nodes, edges)
+        if settings.validate_responses:
+            content = GraphSentimentResponse(
+                nodes=nodes, edges=edges, metrics=metrics, metadata=metadata
+            ).dict()
+        else:
+            content = graph_response(nodes, edges, metrics, metadata)
+    profile = active_profile()
+    if profile is not None:
+        content["metadata"] = {**(content["metadata"] or {}), "profile": profile_report(profile)}
+    if response_format == "columnar":
+        content = columnar_graph_response(content)
+    with stage_latency.time(stage="serialize"):
+        return FastJSONResponse(content)
+
+def overloaded(error: QueueFullError) -> HTTPException:
+    """Réponse rapide quand la file d'inférence est pleine."""
+    logger.warning(f"Inférence rejetée: {str(error)}")
+    return HTTPException(
+        status_code=503,
+        detail="Inference queue is full, retry later",
+        headers={"Retry-After": str(error.retry_after)}
+    )
 
-@router.post("/predict", response_model=GraphSentimentResponse)
+@router.post("/predict", responses=graph_responses())
 async def predict_sentiment(
     request: SentimentRequest,
     analyzer: SentimentAnalyzer = Depends(get_sentiment_analyzer),
-    api_key: str = Depends(verify_api_key)
+    api_key: str = Depends(verify_api_key),
+    profile: Optional[RequestProfile] = Depends(request_profile),
+    output_format: str = Depends(response_format)
 ):
     """
     Endpoint d'inférence pour l'analyse de sentiment.
@@ -26,80 +193,478 @@ async def predict_sentiment(
         request (SentimentRequest): Requête contenant le texte à analyser
         analyzer (SentimentAnalyzer): Instance de l'analyseur de sentiment
         api_key (str): Clé API pour l'authentification
+        profile (Optional[RequestProfile]): Profil de la requête si demandé (X-Profile)
+        output_format (str): Format de la réponse (?format=graph ou columnar)
         
     Returns:
-        GraphSentimentResponse: Résultat de l'inférence
+        GraphSentimentResponse: Résultat de l'inférence (ou sa forme columnar)
     """
     try:
         logger.info(f"Inférence demandée pour le texte: {request.text[:50]}...")
         
-        # Inférence pour un node spécifique
+        # Inférence pour un node spécifique (regroupée avec les requêtes concurrentes)
         if request.node_id:
-            result = analyzer.analyze_node({
-                "id": request.node_id,
-                "text": request.text,
+            result = {
+                "node_id": request.node_id,
+                "sentiment": await batch_scheduler.submit(request.text),
                 "metadata": {
                     "context": request.context,
                     "inference_type": "node_sentiment"
                 }
-            })
-            return GraphSentimentResponse(
-                nodes=[result],
-                edges=[],
-                metrics={
-                    "average_node_sentiment": result["sentiment"]["score"],
-                    "average_edge_sentiment": 0.0,
-                    "sentiment_distribution": {
-                        "positive_nodes": 1 if result["sentiment"]["label"] == "positive" else 0,
-                        "negative_nodes": 1 if result["sentiment"]["label"] == "negative" else 0,
-                        "positive_edges": 0,
-                        "negative_edges": 0
-                    }
-                }
-            )
-        
-        # Inférence simple du texte
-        result = analyzer.analyze_text(request.text)
-        return GraphSentimentResponse(
-            nodes=[{
-                "node_id": "temp_node",
-                "sentiment": result,
+            }
+            return build_graph_response([result], response_format=output_format)
+        
+        # Inférence simple du texte (regroupée avec les requêtes concurrentes)
+        result = {
+            "node_id": "temp_node",
+            "sentiment": await batch_scheduler.submit(request.text),
+            "metadata": {
+                "context": request.context,
+                "inference_type": "text_sentiment"
+            }
+        }
+        return build_graph_response([result], response_format=output_format)
+        
+    except HTTPException:
+        raise
+    except QueueFullError as e:
+        raise overloaded(e)
+    except Exception as e:
+        logger.error(f"Erreur lors de l'inférence: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/predict/long", responses=graph_responses())
+async def predict_long_text_sentiment(
+    request: LongTextSentimentRequest,
+    analyzer: SentimentAnalyzer = Depends(get_sentiment_analyzer),
+    api_key: str = Depends(verify_api_key),
+    profile: Optional[RequestProfile] = Depends(request_profile),
+    output_format: str = Depends(response_format)
+):
+    """
+    Endpoint d'inférence pour les textes plus longs que la limite du modèle (en tokens).
+    
+    Le texte est découpé en fenêtres de tokens chevauchantes, toutes analysées en
+    une passe par lots, puis les scores sont agrégés selon la stratégie demandée.
+    Le nombre de fenêtres utilisées est renvoyé dans les métadonnées du node.
+    
+    Args:
+        request (LongTextSentimentRequest): Requête contenant le texte long à analyser
+        analyzer (SentimentAnalyzer): Instance de l'analyseur de sentiment
+        api_key (str): Clé API pour l'authentification
+        profile (Optional[RequestProfile]): Profil de la requête si demandé (X-Profile)
+        output_format (str): Format de la réponse (?format=graph ou columnar)
+        
+    Returns:
+        GraphSentimentResponse: Résultat agrégé de l'inférence
+    """
+    try:
+        logger.info(f"Inférence texte long demandée ({len(request.text)} caractères)")
+        
+        # Inférence hors de la boucle d'événements
+        result = await inference_executor.run_analyzer(
+            "analyze_long_text", request.text, request.aggregation
+        )
+        node = {
+            "node_id": request.node_id or "temp_node",
+            "sentiment": {"label": result["label"], "score": result["score"]},
+            "metadata": {
+                "context": request.context,
+                "inference_type": "long_text_sentiment",
+                "chunks": result["chunks"],
+                "aggregation": result["aggregation"]
+            }
+        }
+        return build_graph_response([node], response_format=output_format)
+        
+    except QueueFullError as e:
+        raise overloaded(e)
+    except Exception as e:
+        logger.error(f"Erreur lors de l'inférence texte long: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/predict/batch", responses=graph_responses())
+async def predict_sentiment_batch(
+    request: BatchSentimentRequest,
+    analyzer: SentimentAnalyzer = Depends(get_sentiment_analyzer),
+    api_key: str = Depends(verify_api_key),
+    profile: Optional[RequestProfile] = Depends(request_profile),
+    output_format: str = Depends(response_format)
+):
+    """
+    Endpoint d'inférence par lots pour une liste de textes et/ou de nodes.
+    
+    Les textes sont nettoyés puis analysés en sous-lots bornés
+    (settings.inference_batch_size) au lieu d'une requête HTTP par texte.
+    
+    Args:
+        request (BatchSentimentRequest): Requête contenant les textes et nodes à analyser
+        analyzer (SentimentAnalyzer): Instance de l'analyseur de sentiment
+        api_key (str): Clé API pour l'authentification
+        profile (Optional[RequestProfile]): Profil de la requête si demandé (X-Profile)
+        output_format (str): Format de la réponse (?format=graph ou columnar)
+        
+    Returns:
+        GraphSentimentResponse: Résultats dans l'ordre des textes puis des nodes
+    """
+    try:
+        texts = request.texts or []
+        nodes = request.nodes or []
+        logger.info(f"Inférence par lots demandée pour {len(texts) + len(nodes)} éléments")
+        
+        batch_nodes = [
+            {
+                "id": f"text_{index}",
+                "text": text,
                 "metadata": {
                     "context": request.context,
                     "inference_type": "text_sentiment"
                 }
-            }],
-            edges=[],
-            metrics={
-                "average_node_sentiment": result["score"],
-                "average_edge_sentiment": 0.0,
-                "sentiment_distribution": {
-                    "positive_nodes": 1 if result["label"] == "positive" else 0,
-                    "negative_nodes": 1 if result["label"] == "negative" else 0,
-                    "positive_edges": 0,
-                    "negative_edges": 0
+            }
+            for index, text in enumerate(texts)
+        ]
+        batch_nodes.extend(
+            {
+                "id": node.id,
+                "text": node.text,
+                "metadata": {
+                    **(node.metadata or {}),
+                    "context": request.context,
+                    "inference_type": "node_sentiment"
                 }
             }
+            for node in nodes
         )
         
+        # Inférence hors de la boucle d'événements
+        results = await inference_executor.run_analyzer("analyze_nodes", batch_nodes)
+        return build_graph_response(results, response_format=output_format)
+        
+    except QueueFullError as e:
+        raise overloaded(e)
     except Exception as e:
-        logger.error(f"Erreur lors de l'inférence: {str(e)}")
+        logger.error(f"Erreur lors de l'inférence par lots: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/predict/stream")
+async def predict_sentiment_stream(
+    request: Request,
+    text_field: str = Query("text", description="Champ contenant le texte à analyser"),
+    id_field: str = Query("id", description="Champ renvoyé comme identifiant de l'enregistrement"),
+    analyzer: SentimentAnalyzer = Depends(get_sentiment_analyzer),
+    api_key: str = Depends(verify_api_key)
+):
+    """
+    Endpoint d'inférence en flux pour le re-scoring massif d'enregistrements NDJSON.
+    
+    Le corps est lu au fil de l'eau : chaque ligne est nettoyée, regroupée en lots
+    et analysée, et une ligne NDJSON de résultat est émise par ligne d'entrée dès
+    que son lot est terminé. Le nombre de lots en cours est borné
+    (settings.stream_max_in_flight_batches), la mémoire reste donc constante
+    quelle que soit la taille de l'entrée. Une ligne invalide produit une ligne
+    {"line", "id", "error"} sans interrompre le flux.
+    
+    Args:
+        request (Request): Requête dont le corps NDJSON est lu en flux
+        text_field (str): Champ contenant le texte à analyser
+        id_field (str): Champ renvoyé comme identifiant de l'enregistrement
+        analyzer (SentimentAnalyzer): Instance de l'analyseur de sentiment
+        api_key (str): Clé API pour l'authentification
+        
+    Returns:
+        NDJSONStreamingResponse: Lignes {"line", "id", "sentiment"} dans l'ordre d'entrée
+    """
+    logger.info("Inférence en flux demandée")
+    return NDJSONStreamingResponse(
+        stream_sentiments(request.stream(), text_field=text_field, id_field=id_field)
+    )
+
+@router.post("/analyze-graph", responses=graph_responses())
+async def analyze_graph(
+    request: GraphSentimentRequest,
+    analyzer: SentimentAnalyzer = Depends(get_sentiment_analyzer),
+    api_key: str = Depends(verify_api_key),
+    profile: Optional[RequestProfile] = Depends(request_profile),
+    output_format: str = Depends(response_format)
+):
+    """
+    Endpoint d'analyse de sentiment d'un graphe complet.
+    
+    Chaque texte de node est analysé une seule fois ; les edges et les
+    métriques réutilisent les scores des nodes.
+    
+    Args:
+        request (GraphSentimentRequest): Nodes et edges du graphe
+        analyzer (SentimentAnalyzer): Instance de l'analyseur de sentiment
+        api_key (str): Clé API pour l'authentification
+        profile (Optional[RequestProfile]): Profil de la requête si demandé (X-Profile)
+        output_format (str): Format de la réponse (?format=graph ou columnar)
+        
+    Returns:
+        GraphSentimentResponse: Analyse des nodes, des edges et métriques globales
+    """
+    try:
+        logger.info(
+            f"Analyse de graphe demandée: {len(request.nodes)} nodes, {len(request.edges)} edges"
+        )
+        nodes = [node.dict() for node in request.nodes]
+        edges = [edge.dict() for edge in request.edges]
+        
+        # Inférence hors de la boucle d'événements
+        result = await inference_executor.run_analyzer("analyze_graph", nodes, edges)
+        return build_graph_response(
+            result["nodes"], result["edges"], result["metrics"], response_format=output_format
+        )
+        
+    except QueueFullError as e:
+        raise overloaded(e)
+    except Exception as e:
+        logger.error(f"Erreur lors de l'analyse du graphe: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+def get_graph_session(session_id: str) -> GraphSession:
+    """Session de graphe du chemin, 404 si inconnue ou expirée."""
+    try:
+        return graph_sessions.get(session_id)
+    except SessionNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Graph session not found: {session_id}")
+
+async def apply_graph_delta(session: GraphSession, delta: Dict) -> Dict:
+    """
+    Applique un delta à une session : seuls les textes nouveaux ou modifiés sont analysés.
+    
+    Le verrou de la session sérialise les deltas concurrents ; l'inférence
+    s'exécute hors de la boucle d'événements, entre plan() et apply().
+    
+    Args:
+        session (GraphSession): Session à mettre à jour
+        delta (Dict): Nodes et edges ajoutés ou modifiés, ids supprimés
+        
+    Returns:
+        Dict: Résultats modifiés, ids supprimés et métriques mises à jour
+    """
+    async with session.lock:
+        try:
+            texts = session.plan(delta)
+        except SessionLimitError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        sentiments = {}
+        if texts:
+            results = await inference_executor.run_analyzer("analyze_texts", texts)
+            sentiments = dict(zip(texts, results))
+        return session.apply(delta, sentiments)
+
+@router.post("/graph/sessions", responses=graph_responses(201), status_code=201)
+async def create_graph_session(
+    request: GraphSentimentRequest,
+    analyzer: SentimentAnalyzer = Depends(get_sentiment_analyzer),
+    api_key: str = Depends(verify_api_key),
+    profile: Optional[RequestProfile] = Depends(request_profile),
+    output_format: str = Depends(response_format)
+):
+    """
+    Crée une session de graphe conservée sur le serveur.
+    
+    Le graphe initial est analysé comme par /analyze-graph ; les requêtes
+    PATCH suivantes n'envoient que les changements. L'id de session est
+    renvoyé dans les métadonnées. Les sessions vivent dans la mémoire du
+    worker qui les a créées et expirent après settings.graph_session_ttl_seconds
+    d'inactivité.
+    
+    Args:
+        request (GraphSentimentRequest): Nodes et edges du graphe initial
+        analyzer (SentimentAnalyzer): Instance de l'analyseur de sentiment
+        api_key (str): Clé API pour l'authentification
+        profile (Optional[RequestProfile]): Profil de la requête si demandé (X-Profile)
+        output_format (str): Format de la réponse (?format=graph ou columnar)
+        
+    Returns:
+        GraphSentimentResponse: Analyse complète, avec session_id et version en métadonnées
+    """
+    session = graph_sessions.create()
+    delta = {
+        "nodes": [node.dict() for node in request.nodes],
+        "edges": [edge.dict() for edge in request.edges]
+    }
+    try:
+        await apply_graph_delta(session, delta)
+    except HTTPException:
+        graph_sessions.delete(session.session_id)
+        raise
+    except QueueFullError as e:
+        graph_sessions.delete(session.session_id)
+        raise overloaded(e)
+    except Exception as e:
+        graph_sessions.delete(session.session_id)
+        logger.error(f"Erreur lors de la création de la session de graphe: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+    logger.info(
+        f"Session de graphe créée: {session.session_id} "
+        f"({session.node_count} nodes, {session.edge_count} edges)"
+    )
+    snapshot = session.snapshot()
+    response = build_graph_response(
+        snapshot["nodes"], snapshot["edges"], snapshot["metrics"],
+        response_format=output_format,
+        metadata={"session_id": session.session_id, "version": session.version}
+    )
+    response.status_code = 201
+    return response
+
+@router.patch("/graph/sessions/{session_id}", responses=graph_responses())
+async def update_graph_session(
+    request: GraphDeltaRequest,
+    api_key: str = Depends(verify_api_key),
+    session: GraphSession = Depends(get_graph_session),
+    analyzer: SentimentAnalyzer = Depends(get_sentiment_analyzer),
+    profile: Optional[RequestProfile] = Depends(request_profile),
+    output_format: str = Depends(response_format)
+):
+    """
+    Applique un delta à une session de graphe.
+    
+    Seuls les nodes dont le texte est nouveau ou modifié sont analysés,
+    seules les edges qui les touchent sont recalculées, et les métriques
+    sont des agrégats tenus à jour : le coût dépend de la taille du delta,
+    pas de celle du graphe.
+    
+    Args:
+        request (GraphDeltaRequest): Nodes et edges ajoutés ou modifiés, ids supprimés
+        api_key (str): Clé API pour l'authentification
+        session (GraphSession): Session désignée par le chemin
+        analyzer (SentimentAnalyzer): Instance de l'analyseur de sentiment
+        profile (Optional[RequestProfile]): Profil de la requête si demandé (X-Profile)
+        output_format (str): Format de la réponse (?format=graph ou columnar)
+        
+    Returns:
+        GraphSentimentResponse: Nodes et edges modifiés, métriques du graphe entier ;
+            version, removed_nodes et removed_edges en métadonnées
+    """
+    try:
+        changes = await apply_graph_delta(session, request.dict())
+        return build_graph_response(
+            changes["nodes"], changes["edges"], changes["metrics"],
+            response_format=output_format,
+            metadata={
+                "session_id": session.session_id,
+                "version": session.version,
+                "removed_nodes": changes["removed_nodes"],
+                "removed_edges": changes["removed_edges"]
+            }
+        )
+        
+    except HTTPException:
+        raise
+    except QueueFullError as e:
+        raise overloaded(e)
+    except Exception as e:
+        logger.error(f"Erreur lors de la mise à jour de la session {session.session_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/graph/sessions/{session_id}", responses=graph_responses())
+async def get_graph_session_analysis(
+    api_key: str = Depends(verify_api_key),
+    session: GraphSession = Depends(get_graph_session),
+    output_format: str = Depends(response_format)
+):
+    """
+    Analyse complète de l'état courant d'une session, sans inférence.
+    
+    Returns:
+        GraphSentimentResponse: Nodes, edges et métriques, avec session_id et version en métadonnées
+    """
+    snapshot = session.snapshot()
+    return build_graph_response(
+        snapshot["nodes"], snapshot["edges"], snapshot["metrics"],
+        response_format=output_format,
+        metadata={"session_id": session.session_id, "version": session.version}
+    )
+
+@router.delete("/graph/sessions/{session_id}", status_code=204)
+async def delete_graph_session(session_id: str, api_key: str = Depends(verify_api_key)):
+    """
+    Supprime une session de graphe (404 si inconnue ou expirée).
+    """
+    if not graph_sessions.delete(session_id):
+        raise HTTPException(status_code=404, detail=f"Graph session not found: {session_id}")
+    return Response(status_code=204)
+
+# Profil de démarrage
+@router.get("/startup")
+async def startup_report():
+    """
+    Profil de démarrage : temps d'import par module, chargement du modèle et préchauffage.
+    """
+    return {
+        **startup_profile.to_dict(),
+        "registry": model_registry.status()
+    }
+
+# Sondes de l'orchestrateur : lecture de l'état en mémoire, sans inférence
+@router.get("/live")
+async def liveness():
+    """
+    Sonde de vivacité : le processus et sa boucle d'événements répondent.
+    """
+    return {"status": "alive"}
+
+@router.get("/ready")
+async def readiness():
+    """
+    Sonde de disponibilité : modèle chargé, files non saturées et dernier auto-test réussi.
+    
+    Returns:
+        Dict: Détail des vérifications et profondeur des files (503 si non disponible)
+    """
+    executor_stats = inference_executor.stats()
+    checks = {
+        "model_loaded": model_registry.is_ready,
+        "batching_running": batch_scheduler.is_running,
+        "batch_queue_available": batch_scheduler.queue_depth < batch_scheduler.max_pending,
+        "executor_queue_available": executor_stats["queue_depth"] < inference_executor.max_queue,
+        # Avant le premier auto-test, le préchauffage du démarrage fait foi
+        "self_test_passed": health_monitor.healthy is not False
+    }
+    content = {
+        "ready": all(checks.values()),
+        "checks": checks,
+        "queue_depth": {
+            "batching": batch_scheduler.queue_depth,
+            "executor": executor_stats["queue_depth"]
+        },
+        "in_flight": executor_stats["in_flight"],
+        "registry": model_registry.status()
+    }
+    return JSONResponse(status_code=200 if content["ready"] else 503, content=content)
+
 # Endpoint pour la santé du modèle
 @router.get("/health")
 async def model_health(analyzer: SentimentAnalyzer = Depends(get_sentiment_analyzer)):
     """
     Vérifie la santé du modèle d'inférence.
+    
+    Le résultat provient du dernier auto-test périodique (voir app.service.health) :
+    aucune inférence n'est lancée par la requête elle-même, et le cache persistant
+    rapporte ses dernières mesures sans interroger SQLite.
     """
-    try:
-        # Test simple pour vérifier que le modèle fonctionne
-        test_result = analyzer.analyze_text("Test health check")
-        return {
-            "status": "healthy",
-            "model": settings.model_name,
-            "test_inference": test_result
-        }
-    except Exception as e:
-        logger.error(f"Erreur de santé du modèle: {str(e)}")
-        raise HTTPException(status_code=503, detail="Model not healthy")
\ No newline at end of file
+    self_test = health_monitor.status()
+    if self_test["healthy"] is False:
+        logger.error(f"Erreur de santé du modèle: {self_test['error']}")
+        raise HTTPException(status_code=503, detail="Model not healthy")
+    return {
+        "status": "healthy" if self_test["healthy"] else "starting",
+        "model": settings.model_name,
+        "test_inference": self_test["result"],
+        "self_test": self_test,
+        "registry": model_registry.status(),
+        "batching": batch_scheduler.stats(),
+        "executor": inference_executor.stats(),
+        "graph_sessions": graph_sessions.stats(),
+        "tokenization": analyzer.tokenization.stats(),
+        "padding": analyzer.padding_stats.stats(),
+        "cache": analyzer.cache.stats() if analyzer.cache is not None else None,
+        "persistent_cache": (
+            analyzer.persistent_cache.stats(refresh=False)
+            if analyzer.persistent_cache is not None else None
+        )
+    }
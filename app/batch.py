@@ -0,0 +1,438 @@
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+import argparse
+import csv
+import glob
+import json
+import logging
+import os
+import time
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+Record = Dict[str, Any]
+
+INPUT_FORMATS = ("jsonl", "csv")
+CHECKPOINT_VERSION = 1
+PARTITIONED_CHECKPOINT = "_checkpoint.json"
+
+
+class CheckpointError(RuntimeError):
+    """Raised when a job conflicts with the checkpoint or output left by a previous run."""
+
+
+# Analyzer of the current worker process, built by _init_worker()
+_worker_analyzer = None
+
+
+def detect_format(path: str, input_format: Optional[str] = None) -> str:
+    """
+    Resolve the input format from an explicit value or the file extension.
+
+    Args:
+        path (str): Input file.
+        input_format (Optional[str]): "jsonl" or "csv"; guessed from the
+            extension when None.
+
+    Returns:
+        str: "jsonl" or "csv".
+    """
+    if input_format is None:
+        extension = os.path.splitext(path)[1].lower()
+        input_format = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}.get(extension)
+        if input_format is None:
+            raise ValueError(f"Cannot guess the format of {path}, pass --format")
+    if input_format not in INPUT_FORMATS:
+        raise ValueError(f"Unknown input format: {input_format} (expected one of {list(INPUT_FORMATS)})")
+    return input_format
+
+
+def _to_record(row_number: int, row: Dict, text_field: str, id_field: str) -> Record:
+    text = row.get(text_field)
+    if not isinstance(text, str) or not text.strip():
+        return {"row": row_number, "id": row.get(id_field), "error": f"Missing or empty '{text_field}' field"}
+    return {"row": row_number, "id": row.get(id_field), "text": text}
+
+
+def iter_records(
+    path: str,
+    input_format: str,
+    text_field: str = "text",
+    id_field: str = "id"
+) -> Iterator[Record]:
+    """
+    Read records to score from a JSONL or CSV file.
+
+    Args:
+        path (str): Input file.
+        input_format (str): "jsonl" or "csv".
+        text_field (str): Field or column holding the text.
+        id_field (str): Field or column echoed back as the record id.
+
+    Yields:
+        Record: {"row", "id", "text"} records, or {"row", "id", "error"} for rows
+            that cannot be scored. row is the JSONL line number or the CSV data
+            row number, 1-based.
+    """
+    if input_format == "csv":
+        with open(path, newline="", encoding="utf-8") as handle:
+            for row_number, row in enumerate(csv.DictReader(handle), start=1):
+                yield _to_record(row_number, row, text_field, id_field)
+        return
+
+    with open(path, encoding="utf-8") as handle:
+        for line_number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                yield {"row": line_number, "id": None, "error": "Invalid JSON"}
+                continue
+            if not isinstance(row, dict):
+                yield {"row": line_number, "id": None, "error": "Expected a JSON object"}
+                continue
+            yield _to_record(line_number, row, text_field, id_field)
+
+
+def iter_chunks(
+    records: Iterable[Record],
+    chunk_size: int,
+    skip: Set[int]
+) -> Iterator[Tuple[int, List[Record]]]:
+    """Cut records into numbered chunks, leaving out the chunk indices in skip."""
+    chunk: List[Record] = []
+    index = 0
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            if index not in skip:
+                yield index, chunk
+            index += 1
+            chunk = []
+    if chunk and index not in skip:
+        yield index, chunk
+
+
+def _init_worker(factory: Optional[Callable[[], Any]], threads: int) -> None:
+    """Build the analyzer of a worker process, with its share of the CPU threads."""
+    global _worker_analyzer
+    # Set before torch/onnxruntime are imported so workers do not oversubscribe the CPU
+    os.environ.setdefault("OMP_NUM_THREADS", str(threads))
+    if not settings.onnx_intra_op_threads:
+        settings.onnx_intra_op_threads = threads
+    if factory is None:
+        from app.service.pipeline_sentiment import SentimentAnalyzer
+        factory = SentimentAnalyzer
+    _worker_analyzer = factory()
+
+
+def _write_atomically(path: str, content: str) -> None:
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        handle.write(content)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(tmp_path, path)
+
+
+def score_chunk(chunk_index: int, records: List[Record], part_path: Optional[str] = None) -> Dict:
+    """
+    Score one chunk in the current worker.
+
+    Args:
+        chunk_index (int): Position of the chunk in the input.
+        records (List[Record]): Records from iter_records().
+        part_path (Optional[str]): Partitioned mode: file the worker writes the
+            chunk's results to. Otherwise the results are returned.
+
+    Returns:
+        Dict: Chunk index, worker pid, rows, seconds spent, and the NDJSON
+            result lines when part_path is None.
+    """
+    start = time.perf_counter()
+    texts = [record["text"] for record in records if "text" in record]
+    sentiments = iter(_worker_analyzer.analyze_texts(texts) if texts else [])
+    lines = "".join(
+        json.dumps(
+            {"row": record["row"], "id": record["id"], "sentiment": next(sentiments)}
+            if "text" in record else record,
+            ensure_ascii=False
+        ) + "\n"
+        for record in records
+    )
+    if part_path is not None:
+        _write_atomically(part_path, lines)
+        lines = None
+    return {
+        "chunk": chunk_index,
+        "pid": os.getpid(),
+        "rows": len(records),
+        "seconds": time.perf_counter() - start,
+        "lines": lines
+    }
+
+
+class BatchJob:
+    """
+    Score a JSONL or CSV file with SentimentAnalyzer, outside the HTTP stack.
+
+    The input is cut into chunks that are sharded across worker processes,
+    each with its own model. A bounded number of chunks is in flight, so
+    memory stays flat whatever the input size. Results are either appended to
+    one JSONL file in input order, or written by the workers as one part file
+    per chunk. A checkpoint is saved after every chunk, and an interrupted
+    job started again with resume=True skips the chunks already written.
+    """
+
+    def __init__(
+        self,
+        input_path: str,
+        output_path: str,
+        input_format: Optional[str] = None,
+        text_field: str = "text",
+        id_field: str = "id",
+        workers: int = 1,
+        chunk_size: int = 1000,
+        partitioned: bool = False,
+        analyzer_factory: Optional[Callable[[], Any]] = None
+    ):
+        """
+        Initialize the job.
+
+        Args:
+            input_path (str): JSONL or CSV file to score.
+            output_path (str): Ordered mode: JSONL output file. Partitioned mode:
+                directory receiving part-NNNNNN.jsonl files.
+            input_format (Optional[str]): "jsonl" or "csv"; guessed from the
+                extension when None.
+            text_field (str): Field or column holding the text.
+            id_field (str): Field or column echoed back as the record id.
+            workers (int): Worker processes; 0 scores in the current process.
+            chunk_size (int): Records per chunk, the unit of work and checkpointing.
+            partitioned (bool): Write one part file per chunk instead of one
+                ordered file.
+            analyzer_factory (Optional[Callable[[], Any]]): Builds the analyzer in
+                each worker. Defaults to SentimentAnalyzer; must be picklable.
+        """
+        self.input_path = input_path
+        self.output_path = output_path
+        self.input_format = detect_format(input_path, input_format)
+        self.text_field = text_field
+        self.id_field = id_field
+        self.workers = max(0, workers)
+        self.chunk_size = max(1, chunk_size)
+        self.partitioned = partitioned
+        self.analyzer_factory = analyzer_factory
+        self.checkpoint_path = (
+            os.path.join(output_path, PARTITIONED_CHECKPOINT)
+            if partitioned else output_path + ".checkpoint.json"
+        )
+
+    def _job_identity(self) -> Dict:
+        """Settings a checkpoint must match to be resumed."""
+        return {
+            "version": CHECKPOINT_VERSION,
+            "input": os.path.abspath(self.input_path),
+            "format": self.input_format,
+            "text_field": self.text_field,
+            "id_field": self.id_field,
+            "chunk_size": self.chunk_size,
+            "partitioned": self.partitioned
+        }
+
+    def _part_path(self, chunk_index: int) -> str:
+        return os.path.join(self.output_path, f"part-{chunk_index:06d}.jsonl")
+
+    def _load_checkpoint(self, resume: bool) -> Dict:
+        if not os.path.exists(self.checkpoint_path):
+            return {**self._job_identity(), "next_chunk": 0, "output_bytes": 0, "completed_chunks": []}
+        if not resume:
+            raise CheckpointError(
+                f"{self.checkpoint_path} exists: pass --resume to continue the interrupted job"
+            )
+        with open(self.checkpoint_path, encoding="utf-8") as handle:
+            checkpoint = json.load(handle)
+        identity = self._job_identity()
+        mismatched = [key for key, value in identity.items() if checkpoint.get(key) != value]
+        if mismatched:
+            raise CheckpointError(f"Checkpoint was written for a different job ({', '.join(mismatched)})")
+        return checkpoint
+
+    def _save_checkpoint(self, checkpoint: Dict) -> None:
+        _write_atomically(self.checkpoint_path, json.dumps(checkpoint))
+
+    def _prepare_output(self, checkpoint: Dict, resume: bool):
+        """Open the ordered output, or create the partition directory."""
+        if self.partitioned:
+            os.makedirs(self.output_path, exist_ok=True)
+            for tmp_path in glob.glob(os.path.join(self.output_path, "*.tmp")):
+                os.remove(tmp_path)
+            if not resume and glob.glob(os.path.join(self.output_path, "part-*.jsonl")):
+                raise CheckpointError(f"{self.output_path} already holds part files")
+            return None
+
+        output_dir = os.path.dirname(os.path.abspath(self.output_path))
+        os.makedirs(output_dir, exist_ok=True)
+        if checkpoint["next_chunk"]:
+            # Drop anything written after the last checkpoint
+            output = open(self.output_path, "r+b")
+            output.truncate(checkpoint["output_bytes"])
+            output.seek(checkpoint["output_bytes"])
+            return output
+        return open(self.output_path, "wb")
+
+    def run(self, resume: bool = False) -> Dict:
+        """
+        Run the job to completion.
+
+        Args:
+            resume (bool): Continue from the checkpoint of an interrupted run.
+
+        Returns:
+            Dict: Rows scored, elapsed time, overall and per-worker rows per second.
+
+        Raises:
+            CheckpointError: If a checkpoint exists and resume is False, or it was
+                written for different job settings.
+        """
+        checkpoint = self._load_checkpoint(resume)
+        completed: Set[int] = (
+            set(checkpoint["completed_chunks"]) if self.partitioned
+            else set(range(checkpoint["next_chunk"]))
+        )
+        output = self._prepare_output(checkpoint, resume)
+        chunks = iter_chunks(
+            iter_records(self.input_path, self.input_format, self.text_field, self.id_field),
+            self.chunk_size,
+            completed
+        )
+
+        threads = max(1, (os.cpu_count() or 1) // max(1, self.workers))
+        pool: Optional[ProcessPoolExecutor] = None
+        if self.workers:
+            pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.analyzer_factory, threads)
+            )
+        else:
+            _init_worker(self.analyzer_factory, threads)
+
+        per_worker: Dict[int, Dict] = {}
+        rows = 0
+        start = time.perf_counter()
+
+        def finish(result: Dict) -> None:
+            nonlocal rows
+            if self.partitioned:
+                checkpoint["completed_chunks"].append(result["chunk"])
+            else:
+                output.write(result["lines"].encode("utf-8"))
+                output.flush()
+                os.fsync(output.fileno())
+                checkpoint["next_chunk"] = result["chunk"] + 1
+                checkpoint["output_bytes"] = output.tell()
+            self._save_checkpoint(checkpoint)
+
+            worker = per_worker.setdefault(result["pid"], {"chunks": 0, "rows": 0, "busy_seconds": 0.0})
+            worker["chunks"] += 1
+            worker["rows"] += result["rows"]
+            worker["busy_seconds"] += result["seconds"]
+            rows += result["rows"]
+
+        # Two chunks per worker keep every process busy while bounding memory
+        max_in_flight = 2 * max(1, self.workers)
+        pending: Deque[Future] = deque()
+        try:
+            for chunk_index, records in chunks:
+                part_path = self._part_path(chunk_index) if self.partitioned else None
+                if pool is not None:
+                    pending.append(pool.submit(score_chunk, chunk_index, records, part_path))
+                    if len(pending) >= max_in_flight:
+                        finish(pending.popleft().result())
+                else:
+                    finish(score_chunk(chunk_index, records, part_path))
+            while pending:
+                finish(pending.popleft().result())
+        except BaseException:
+            logger.error(
+                f"Batch job interrupted, {rows} rows saved; run again with --resume to continue"
+            )
+            raise
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+            if output is not None:
+                output.close()
+
+        # The checkpoint only outlives interrupted jobs
+        if os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+        elapsed = time.perf_counter() - start
+        return {
+            "input": self.input_path,
+            "output": self.output_path,
+            "mode": "partitioned" if self.partitioned else "ordered",
+            "workers": self.workers,
+            "rows": rows,
+            "skipped_chunks": len(completed),
+            "seconds": round(elapsed, 3),
+            "rows_per_second": round(rows / elapsed, 1) if elapsed else 0.0,
+            "per_worker": [
+                {
+                    "pid": pid,
+                    **stats,
+                    "busy_seconds": round(stats["busy_seconds"], 3),
+                    "rows_per_second": (
+                        round(stats["rows"] / stats["busy_seconds"], 1) if stats["busy_seconds"] else 0.0
+                    )
+                }
+                for pid, stats in sorted(per_worker.items())
+            ]
+        }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point: score a file and print the throughput report."""
+    parser = argparse.ArgumentParser(
+        description="Score a JSONL or CSV file with the sentiment model, across worker processes"
+    )
+    parser.add_argument("input", help="JSONL or CSV file")
+    parser.add_argument("output", help="Output JSONL file, or directory with --partitioned")
+    parser.add_argument("--format", choices=INPUT_FORMATS, default=None, help="Default: from the extension")
+    parser.add_argument("--text-field", default="text")
+    parser.add_argument("--id-field", default="id")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="0 runs in-process")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Records per chunk and checkpoint")
+    parser.add_argument("--partitioned", action="store_true", help="Write one part file per chunk")
+    parser.add_argument("--resume", action="store_true", help="Continue an interrupted job")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    try:
+        job = BatchJob(
+            args.input,
+            args.output,
+            input_format=args.format,
+            text_field=args.text_field,
+            id_field=args.id_field,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            partitioned=args.partitioned
+        )
+        report = job.run(resume=args.resume)
+    except (ValueError, CheckpointError) as e:
+        parser.error(str(e))
+    for worker in report["per_worker"]:
+        logger.info(
+            f"Worker {worker['pid']}: {worker['rows']} rows in {worker['chunks']} chunks, "
+            f"{worker['rows_per_second']} rows/s"
+        )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,13 +6,87 @@ class Settings(BaseSettings):
     model_name: str = "distilbert-base-uncased-finetuned-sst-2-english"
     api_key: str = "API_KEY"
     
+    # Backend d'inférence : "torch" ou "onnx" (export ONNX unique puis ONNX Runtime)
+    inference_backend: str = "torch"
+    # Mode du modèle : "fp32" ou "quantized" (int8 dynamique des couches linéaires)
+    model_mode: str = "fp32"
+    max_sequence_length: int = 512
+    onnx_model_dir: str = "models/onnx"
+    onnx_intra_op_threads: int = 0
+    
     # Configuration du prétraitement
     max_text_length: int = 512
     language: str = "english"
+    spacy_batch_size: int = 256
+    spacy_n_process: int = 1
+    
+    # Mode texte long : fenêtres de tokens chevauchantes (limite du modèle en tokens, pas en caractères)
+    long_text_window_tokens: int = 0   # 0 : limite du modèle (max_sequence_length)
+    long_text_window_overlap: int = 128
+    long_text_aggregation: str = "mean"   # "mean", "max_confidence" ou "length_weighted"
+    long_text_max_chars: int = 100000
+    
+    # Configuration du micro-batching
+    batch_max_size: int = 32
+    batch_max_wait_ms: float = 5.0
+    batch_max_pending: int = 1024
+    
+    # Configuration de l'exécuteur d'inférence (hors boucle d'événements)
+    executor_kind: str = "thread"
+    executor_max_workers: int = 2
+    executor_max_queue: int = 64
+    executor_retry_after_seconds: int = 1
+    
+    # Configuration de l'inférence par lots
+    inference_batch_size: int = 64
+    bucket_max_tokens: int = 16384
+    batch_request_max_items: int = 5000
+    
+    # Étape de tokenisation : cache des token ids et fenêtres pipelinées
+    token_cache_max_tokens: int = 2000000
+    tokenization_window: int = 256
+    
+    # Inférence en flux NDJSON : lots bornés en cours pour une mémoire constante
+    stream_batch_size: int = 64
+    stream_max_in_flight_batches: int = 2
+    stream_max_line_bytes: int = 65536
+    stream_max_queue_wait_seconds: float = 30.0   # attente max d'une file pleine par lot
+    
+    # Configuration du cache des résultats d'inférence
+    cache_enabled: bool = True
+    cache_max_entries: int = 10000
+    cache_ttl_seconds: float = 3600.0
+    
+    # Cache persistant partagé entre workers (désactivé si aucun chemin)
+    persistent_cache_path: Optional[str] = None
+    persistent_cache_max_mb: float = 512.0
+    
+    # Démarrage : préchargement de spaCy/NLTK et première inférence avant d'accepter le trafic
+    warmup_on_startup: bool = True
+    
+    # Auto-test d'inférence périodique, servi depuis la mémoire par /health
+    health_check_interval_seconds: float = 30.0
+    health_check_timeout_seconds: float = 10.0
+    
+    # Profilage à la demande d'une requête (en-tête X-Profile ou ?profile=, clé API requise),
+    # désactivé par défaut ; seuls les request_profiling_max_dumps dumps cProfile les plus récents sont gardés
+    request_profiling_enabled: bool = False
+    request_profiling_dump_dir: str = "profiles"
+    request_profiling_max_dumps: int = 50
+    
+    # Sessions de graphe : état conservé en mémoire du processus, mis à jour par deltas
+    graph_session_max_sessions: int = 1000
+    graph_session_ttl_seconds: float = 3600.0
+    graph_session_max_nodes: int = 100000
+    graph_session_max_edges: int = 500000
+    # Edges d'un graphe soumis (/analyze-graph, création de session) ou d'un delta (PATCH)
+    graph_delta_max_edges: int = 10000
     
     # Configuration de l'API
     api_version: str = "v1"
     debug: bool = False
+    # Revalidation pydantic des réponses produites par l'analyseur (désactivée : chemin rapide)
+    validate_responses: bool = False
     
     class Config:
         env_file = ".env"
@@ -0,0 +1,221 @@
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from datetime import datetime
+import cProfile
+import marshal
+import os
+import pstats
+import threading
+import time
+import uuid
+
+# Per stage: (seconds, calls)
+StageTotals = Dict[str, Tuple[float, int]]
+# cProfile raw stats, as in cProfile.Profile.stats
+CProfileStats = Dict[Tuple[str, int, str], Tuple]
+
+PROFILE_MODES = ("timings", "cprofile")
+
+_current_profile: ContextVar[Optional["RequestProfile"]] = ContextVar("request_profile", default=None)
+
+
+class RequestProfile:
+    """
+    Stage timings of one profiled request.
+
+    A profile is made active for the code serving the request (activate()).
+    Stage observations made while it is active are added to it, including
+    those made on the inference executor and the tokenizer thread, which
+    report back to it. Nothing is recorded when no profile is active.
+    """
+
+    def __init__(self, capture_cprofile: bool = False):
+        """
+        Initialize an empty profile.
+
+        Args:
+            capture_cprofile (bool): Also run cProfile around the inference
+                calls of the request, see dump_cprofile().
+        """
+        self.capture_cprofile = capture_cprofile
+        self.started_at = time.perf_counter()
+        self.details: Dict[str, Any] = {}
+        self._stages: Dict[str, Tuple[float, int]] = {}
+        self._cprofile_stats: CProfileStats = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def activate(self) -> Iterator["RequestProfile"]:
+        """Make this profile the one stage observations go to, in the current context."""
+        token = _current_profile.set(self)
+        try:
+            yield self
+        finally:
+            _current_profile.reset(token)
+
+    def record(self, stage: str, seconds: float, calls: int = 1) -> None:
+        """Add time spent in a stage."""
+        with self._lock:
+            total, count = self._stages.get(stage, (0.0, 0))
+            self._stages[stage] = (total + seconds, count + calls)
+
+    def merge(self, stages: StageTotals) -> None:
+        """Add the stage totals of another profile, e.g. one filled in a worker process."""
+        for stage, (seconds, calls) in stages.items():
+            self.record(stage, seconds, calls)
+
+    def stage_totals(self) -> StageTotals:
+        """Seconds and calls per stage recorded so far."""
+        with self._lock:
+            return dict(self._stages)
+
+    def cprofile_stats(self) -> CProfileStats:
+        """Raw cProfile stats collected so far."""
+        with self._lock:
+            return dict(self._cprofile_stats)
+
+    def add_cprofile_stats(self, stats: CProfileStats) -> None:
+        """Add the raw cProfile stats of one inference call."""
+        with self._lock:
+            for function, stat in stats.items():
+                previous = self._cprofile_stats.get(function)
+                self._cprofile_stats[function] = (
+                    stat if previous is None else pstats.add_func_stats(previous, stat)
+                )
+
+    def dump_cprofile(self, directory: str, max_dumps: Optional[int] = None) -> Optional[str]:
+        """
+        Write the collected cProfile stats, readable with pstats.Stats(path).
+
+        Args:
+            directory (str): Directory of the dumps, created if missing.
+            max_dumps (Optional[int]): Dumps kept in the directory; the oldest
+                are deleted once it is exceeded. None keeps them all.
+
+        Returns:
+            Optional[str]: Path of the dump, or None if nothing was captured.
+        """
+        stats = self.cprofile_stats()
+        if not stats:
+            return None
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{datetime.now():%Y%m%dT%H%M%S}_{uuid.uuid4().hex[:8]}.prof")
+        with open(path, "wb") as f:
+            marshal.dump(stats, f)
+        if max_dumps is not None:
+            prune_dumps(directory, max_dumps, keep=path)
+        return path
+
+    def to_dict(self) -> Dict:
+        """
+        Report the profile.
+
+        Returns:
+            Dict: Elapsed time since the profile was created, then time and
+                call count per stage in milliseconds, plus any details.
+        """
+        return {
+            "total_ms": round(1000 * (time.perf_counter() - self.started_at), 3),
+            "stages": {
+                stage: {"ms": round(1000 * seconds, 3), "calls": calls}
+                for stage, (seconds, calls) in sorted(self.stage_totals().items())
+            },
+            **self.details
+        }
+
+
+def prune_dumps(directory: str, max_dumps: int, keep: Optional[str] = None) -> int:
+    """
+    Delete the oldest cProfile dumps of a directory beyond max_dumps.
+
+    Args:
+        directory (str): Directory of the dumps.
+        max_dumps (int): Dumps to keep, newest first.
+        keep (Optional[str]): Dump never deleted, e.g. the one just written.
+
+    Returns:
+        int: Number of dumps deleted.
+    """
+    dumps = []
+    for entry in os.scandir(directory):
+        if entry.name.endswith(".prof") and entry.is_file():
+            try:
+                dumps.append((entry.stat().st_mtime, entry.path))
+            except FileNotFoundError:
+                pass
+    dumps.sort(reverse=True)
+    deleted = 0
+    for _, path in dumps[max(max_dumps, 0):]:
+        if path == keep:
+            continue
+        try:
+            os.remove(path)
+            deleted += 1
+        except FileNotFoundError:
+            # Already pruned by a concurrent request
+            pass
+    return deleted
+
+
+def active_profile() -> Optional[RequestProfile]:
+    """Profile of the request being served in the current context, if profiled."""
+    return _current_profile.get()
+
+
+def record_stage(seconds: float, stage: str) -> None:
+    """Add a stage observation to the active profile; no-op when there is none."""
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.record(stage, seconds)
+
+
+def in_profile_context(function: Callable) -> Callable:
+    """
+    Carry the active profile over to another thread.
+
+    Pool threads do not inherit context variables; when a profile is active
+    the function is wrapped to run in a copy of the current context. Wrap
+    once per call: a context cannot be entered by two threads at a time.
+    """
+    if _current_profile.get() is None:
+        return function
+    context = copy_context()
+    return lambda *args, **kwargs: context.run(function, *args, **kwargs)
+
+
+def run_profiled(
+    function: Callable,
+    *args,
+    capture_cprofile: bool = False
+) -> Tuple[Any, StageTotals, Optional[CProfileStats]]:
+    """
+    Call a function under a fresh profile, typically in an executor worker.
+
+    Only picklable data is returned so that process workers can send it back
+    to the request's profile. cProfile only sees the calling thread.
+
+    Args:
+        function (Callable): Function to call.
+        *args: Positional arguments for the function.
+        capture_cprofile (bool): Run cProfile around the call.
+
+    Returns:
+        Tuple[Any, StageTotals, Optional[CProfileStats]]: The function's return
+            value, its stage totals and its raw cProfile stats if captured.
+    """
+    profile = RequestProfile()
+    profiler = cProfile.Profile() if capture_cprofile else None
+    with profile.activate():
+        if profiler is not None:
+            profiler.enable()
+        try:
+            result = function(*args)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+    stats = None
+    if profiler is not None:
+        profiler.create_stats()
+        stats = profiler.stats
+    return result, profile.stage_totals(), stats
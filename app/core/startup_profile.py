@@ -0,0 +1,113 @@
+from typing import Dict, Iterator, Optional
+from contextlib import contextmanager
+from types import ModuleType
+import importlib
+import logging
+import sys
+import threading
+import time
+import psutil
+
+logger = logging.getLogger(__name__)
+
+
+class StartupProfile:
+    """
+    Record where cold-start time goes.
+
+    Heavy dependencies are imported through timed_import() on first use, so
+    their import cost shows up here whether it is paid during warmup or by the
+    first request. Startup phases (model load, warmup) are timed with phase().
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.imports: Dict[str, float] = {}
+        self.phases: Dict[str, float] = {}
+        self.ready_at: Optional[float] = None
+        try:
+            self.process_started_at = psutil.Process().create_time()
+        except psutil.Error:
+            self.process_started_at = time.time()
+
+    def record_import(self, module: str, seconds: float) -> None:
+        """Record the time spent importing a module."""
+        with self._lock:
+            self.imports[module] = round(seconds, 4)
+
+    def record_phase(self, name: str, seconds: float) -> None:
+        """Record the duration of a startup phase."""
+        with self._lock:
+            self.phases[name] = round(seconds, 4)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as a startup phase, even if it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_phase(name, time.perf_counter() - start)
+
+    def mark_ready(self) -> None:
+        """Record the moment the service is ready to answer requests."""
+        self.ready_at = time.time()
+
+    @property
+    def time_to_ready_seconds(self) -> Optional[float]:
+        """Seconds from process creation to mark_ready(), or None before it."""
+        if self.ready_at is None:
+            return None
+        return round(self.ready_at - self.process_started_at, 4)
+
+    def to_dict(self) -> Dict:
+        """
+        Report the profile.
+
+        Returns:
+            Dict: Import times per module (slowest first), phase durations and
+                time from process start to ready.
+        """
+        with self._lock:
+            imports = dict(sorted(self.imports.items(), key=lambda item: item[1], reverse=True))
+            phases = dict(self.phases)
+        return {
+            "ready": self.ready_at is not None,
+            "time_to_ready_seconds": self.time_to_ready_seconds,
+            "phases": phases,
+            "imports": imports
+        }
+
+    def log_summary(self) -> None:
+        """Log the profile in one line."""
+        profile = self.to_dict()
+        phases = ", ".join(f"{name}={seconds}s" for name, seconds in profile["phases"].items())
+        imports = ", ".join(f"{name}={seconds}s" for name, seconds in profile["imports"].items())
+        logger.info(
+            f"Startup profile: ready in {profile['time_to_ready_seconds']}s "
+            f"(phases: {phases or 'none'}; imports: {imports or 'none'})"
+        )
+
+
+startup_profile = StartupProfile()
+
+
+def timed_import(name: str) -> ModuleType:
+    """
+    Import a module, recording the import time in the startup profile.
+
+    Modules that are already loaded are returned without being recorded again.
+
+    Args:
+        name (str): Dotted module name.
+
+    Returns:
+        ModuleType: The imported module.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    startup_profile.record_import(name, time.perf_counter() - start)
+    return module
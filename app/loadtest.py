@@ -0,0 +1,381 @@
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+from contextlib import asynccontextmanager, contextmanager
+import argparse
+import asyncio
+import json
+import logging
+import math
+import socket
+import threading
+import time
+from app.core.config import settings
+from app.core.metrics import LATENCY_BUCKETS
+
+logger = logging.getLogger(__name__)
+
+LoggedRequest = Dict[str, Any]
+
+PERCENTILES = (50, 95, 99)
+# Report values compared with a previous run, and whether higher is better
+COMPARED_VALUES = {
+    "rps": True,
+    "latency_ms.p50": False,
+    "latency_ms.p95": False,
+    "latency_ms.p99": False,
+    "error_rate": False
+}
+
+
+def load_requests(path: str) -> List[LoggedRequest]:
+    """
+    Read a request log to replay.
+
+    One JSON object per line: "path" (required), "method" (default POST),
+    "json" (request body) and "headers". Requests without an X-API-Key
+    header get settings.api_key.
+
+    Args:
+        path (str): JSONL request log.
+
+    Returns:
+        List[LoggedRequest]: Requests in file order.
+
+    Raises:
+        ValueError: If a line is not a JSON object with a path.
+    """
+    requests = []
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                raise ValueError(f"{path}:{number}: invalid JSON")
+            if not isinstance(record, dict) or not isinstance(record.get("path"), str):
+                raise ValueError(f"{path}:{number}: expected an object with a 'path'")
+            headers = {"X-API-Key": settings.api_key, **(record.get("headers") or {})}
+            requests.append({
+                "method": record.get("method", "POST").upper(),
+                "path": record["path"],
+                "json": record.get("json"),
+                "headers": headers
+            })
+    if not requests:
+        raise ValueError(f"{path}: no request to replay")
+    return requests
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Linearly interpolated percentile of ascending values (q in 0-100)."""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * q / 100.0
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def latency_histogram(latencies: Sequence[float], buckets: Sequence[float] = LATENCY_BUCKETS) -> List[Dict]:
+    """
+    Count latencies per bucket, with the bucket bounds of the /metrics histograms.
+
+    Returns:
+        List[Dict]: {"le_ms", "count"} per bucket (not cumulative), "+Inf" last.
+    """
+    bounds = list(buckets) + [math.inf]
+    counts = [0] * len(bounds)
+    for latency in latencies:
+        counts[next(i for i, bound in enumerate(bounds) if latency <= bound)] += 1
+    return [
+        {"le_ms": "+Inf" if math.isinf(bound) else round(bound * 1000, 3), "count": count}
+        for bound, count in zip(bounds, counts)
+    ]
+
+
+async def replay(
+    client: Any,
+    requests: Sequence[LoggedRequest],
+    concurrency: int,
+    total: Optional[int] = None,
+    rate: Optional[float] = None
+) -> Dict:
+    """
+    Replay requests with a fixed number of concurrent clients.
+
+    The log is cycled until total requests were sent. With a rate, request i
+    is not sent before start + i / rate, and its latency is counted from that
+    time: a request delayed by a slow server is charged for the delay instead
+    of hiding it (coordinated omission).
+
+    Args:
+        client (httpx.AsyncClient): Client bound to the target.
+        requests (Sequence[LoggedRequest]): Requests from load_requests().
+        concurrency (int): Requests in flight at most.
+        total (Optional[int]): Requests to send. Defaults to the log length.
+        rate (Optional[float]): Requests per second to aim for; unlimited if None.
+
+    Returns:
+        Dict: Latency percentiles and histogram, throughput and status counts.
+    """
+    total = len(requests) if total is None else total
+    concurrency = max(1, concurrency)
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    next_index = iter(range(total))
+    start = time.perf_counter()
+
+    async def worker() -> None:
+        for index in next_index:
+            request = requests[index % len(requests)]
+            sent_at = time.perf_counter()
+            if rate:
+                scheduled = start + index / rate
+                if scheduled > sent_at:
+                    await asyncio.sleep(scheduled - sent_at)
+                sent_at = scheduled
+            try:
+                response = await client.request(
+                    request["method"], request["path"], json=request["json"], headers=request["headers"]
+                )
+                status = str(response.status_code)
+            except Exception as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - sent_at)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    duration = time.perf_counter() - start
+
+    latencies.sort()
+    errors = sum(count for status, count in statuses.items() if not status.startswith("2"))
+    return {
+        "concurrency": concurrency,
+        "rate": rate,
+        "requests": total,
+        "duration_s": round(duration, 3),
+        "rps": round(total / duration, 2) if duration else 0.0,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "status_counts": dict(sorted(statuses.items())),
+        "latency_ms": {
+            **{f"p{q}": round(1000 * percentile(latencies, q), 3) for q in PERCENTILES},
+            "mean": round(1000 * sum(latencies) / len(latencies), 3) if latencies else 0.0,
+            "max": round(1000 * latencies[-1], 3) if latencies else 0.0
+        },
+        "histogram": latency_histogram(latencies)
+    }
+
+
+def _lookup(report: Dict, dotted_key: str) -> Optional[float]:
+    value: Any = report
+    for key in dotted_key.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def compare_reports(current: Dict, previous: Dict) -> List[Dict]:
+    """
+    Compare two load test reports, concurrency level by concurrency level.
+
+    Args:
+        current (Dict): Report of this run.
+        previous (Dict): Report of the run to compare with.
+
+    Returns:
+        List[Dict]: Per concurrency level present in both runs, each compared
+            value with its previous value, relative change and whether it is
+            a regression.
+    """
+    previous_runs = {run["concurrency"]: run for run in previous.get("runs", [])}
+    comparison = []
+    for run in current.get("runs", []):
+        before = previous_runs.get(run["concurrency"])
+        if before is None:
+            continue
+        values = {}
+        for key, higher_is_better in COMPARED_VALUES.items():
+            now, then = _lookup(run, key), _lookup(before, key)
+            if now is None or then is None:
+                continue
+            change = (now - then) / then if then else 0.0
+            values[key] = {
+                "previous": then,
+                "current": now,
+                "change_pct": round(100 * change, 1),
+                "regression": now < then if higher_is_better else now > then
+            }
+        comparison.append({"concurrency": run["concurrency"], "values": values})
+    return comparison
+
+
+@asynccontextmanager
+async def in_process_client(app: Any):
+    """httpx client calling the ASGI app directly, with its startup and shutdown events run."""
+    import httpx
+
+    await app.router.startup()
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://loadtest"
+        ) as client:
+            yield client
+    finally:
+        await app.router.shutdown()
+
+
+@asynccontextmanager
+async def http_client(base_url: str, concurrency: int):
+    """httpx client to a running server, with one connection per concurrent client."""
+    import httpx
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        yield client
+
+
+@contextmanager
+def local_uvicorn(app: Any, host: str = "127.0.0.1", port: int = 0) -> Iterator[str]:
+    """
+    Serve the app with uvicorn on a background thread.
+
+    Args:
+        app: ASGI application.
+        host (str): Interface to bind.
+        port (int): Port; 0 picks a free one.
+
+    Yields:
+        str: Base URL of the server.
+    """
+    import uvicorn
+
+    if not port:
+        with socket.socket() as probe:
+            probe.bind((host, 0))
+            port = probe.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, name="loadtest-uvicorn", daemon=True)
+    thread.start()
+    try:
+        while not server.started:
+            if not thread.is_alive():
+                raise RuntimeError("uvicorn failed to start")
+            time.sleep(0.05)
+        yield f"http://{host}:{port}"
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+async def run_load_test(
+    requests: Sequence[LoggedRequest],
+    concurrency_levels: Sequence[int],
+    total: Optional[int] = None,
+    rate: Optional[float] = None,
+    base_url: Optional[str] = None,
+    app: Any = None
+) -> Dict:
+    """
+    Replay the requests once per concurrency level.
+
+    Args:
+        requests (Sequence[LoggedRequest]): Requests from load_requests().
+        concurrency_levels (Sequence[int]): Concurrent clients of each run.
+        total (Optional[int]): Requests per run. Defaults to the log length.
+        rate (Optional[float]): Requests per second to aim for; unlimited if None.
+        base_url (Optional[str]): Server to target; the app is called
+            in-process when None.
+        app: ASGI application for in-process runs. Defaults to app.main.app.
+
+    Returns:
+        Dict: Target description and one replay() report per level.
+    """
+    async def replay_level(client: Any, concurrency: int) -> Dict:
+        report = await replay(client, requests, concurrency, total=total, rate=rate)
+        logger.info(
+            f"Concurrency {concurrency}: {report['rps']} req/s, p50 {report['latency_ms']['p50']} ms, "
+            f"p95 {report['latency_ms']['p95']} ms, p99 {report['latency_ms']['p99']} ms, "
+            f"error rate {report['error_rate']}"
+        )
+        return report
+
+    runs = []
+    if base_url:
+        for concurrency in concurrency_levels:
+            async with http_client(base_url, concurrency) as client:
+                runs.append(await replay_level(client, concurrency))
+    else:
+        if app is None:
+            from app.main import app as main_app
+            app = main_app
+        # One startup for all levels: the model is loaded once
+        async with in_process_client(app) as client:
+            for concurrency in concurrency_levels:
+                runs.append(await replay_level(client, concurrency))
+    return {"target": base_url or "in-process", "runs": runs}
+
+
+def format_comparison(comparison: List[Dict]) -> str:
+    """Text table of compare_reports(), regressions marked with '!'."""
+    lines = []
+    for level in comparison:
+        lines.append(f"concurrency {level['concurrency']}:")
+        for key, value in level["values"].items():
+            marker = "!" if value["regression"] and value["change_pct"] else " "
+            lines.append(
+                f" {marker} {key:<16} {value['previous']:>10} -> {value['current']:>10} "
+                f"({value['change_pct']:+.1f}%)"
+            )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point: replay a request log and write the latency report."""
+    parser = argparse.ArgumentParser(
+        description="Replay a JSONL request log against the API and report latency percentiles and throughput"
+    )
+    parser.add_argument("requests", help="JSONL request log ({'method', 'path', 'json', 'headers'} per line)")
+    parser.add_argument(
+        "--concurrency", default="1,8,32",
+        help="Comma-separated concurrency levels, one run each"
+    )
+    parser.add_argument("--requests-per-run", type=int, default=None, help="Default: the log length")
+    parser.add_argument("--rate", type=float, default=None, help="Requests per second; default unlimited")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", default=None, help="Running server to target, e.g. http://127.0.0.1:8000")
+    target.add_argument("--uvicorn", action="store_true", help="Serve app.main on a local uvicorn")
+    parser.add_argument("--output", default=None, help="Write the JSON report to this file")
+    parser.add_argument("--compare", default=None, help="Previous JSON report to compare with")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    try:
+        requests = load_requests(args.requests)
+        levels = [int(level) for level in args.concurrency.split(",") if level.strip()]
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.uvicorn:
+        from app.main import app
+
+        with local_uvicorn(app) as base_url:
+            report = asyncio.run(run_load_test(requests, levels, args.requests_per_run, args.rate, base_url))
+        report["target"] = "uvicorn"
+    else:
+        report = asyncio.run(run_load_test(requests, levels, args.requests_per_run, args.rate, args.url))
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            report["comparison"] = compare_reports(report, json.load(f))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        logger.info(f"Report written to {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
+    if args.compare:
+        print(format_comparison(report["comparison"]))
+
+if __name__ == "__main__":
+    main()
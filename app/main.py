@@ -1,12 +1,24 @@
-from fastapi import FastAPI, Depends
-from app.api.routes import router as inference_router
+from fastapi import FastAPI, Depends, Request
+from fastapi.responses import PlainTextResponse
+from app.core.startup_profile import startup_profile, timed_import
+from app.core.metrics import Gauge, metrics_registry, request_latency, requests_in_flight
 from app.core.config import settings
 import logging
+import time
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Import des routes mesuré, avant tout service : il entraîne le chargement de tous les services
+inference_router = timed_import("app.api.routes").router
+
+# Services déjà chargés par l'import des routes
+from app.service.model_registry import model_registry
+from app.service.batching import batch_scheduler
+from app.service.executor import inference_executor
+from app.service.health import health_monitor
+
 app = FastAPI(
     title="Sentiment Analysis Inference API",
     description="API d'inférence pour l'analyse de sentiment",
@@ -20,12 +32,76 @@ app.include_router(
     tags=["inference"]
 )
 
+# Profondeur des files lue au moment de l'export des métriques
+metrics_registry.register(Gauge(
+    "sentiment_batch_queue_depth",
+    "Requests waiting to be micro-batched",
+    callback=lambda: batch_scheduler.queue_depth
+))
+metrics_registry.register(Gauge(
+    "sentiment_executor_queue_depth",
+    "Inference calls waiting for a free worker",
+    callback=lambda: inference_executor.queue_depth
+))
+metrics_registry.register(Gauge(
+    "sentiment_executor_in_flight",
+    "Inference calls running or queued on the executor",
+    callback=lambda: inference_executor.in_flight
+))
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Compte les requêtes en cours et mesure leur latence par route."""
+    requests_in_flight.inc()
+    start = time.perf_counter()
+    status = "500"
+    try:
+        response = await call_next(request)
+        status = str(response.status_code)
+        return response
+    finally:
+        requests_in_flight.dec()
+        # Gabarit de la route (et non le chemin brut) pour borner le nombre de séries
+        route = request.scope.get("route")
+        request_latency.observe(
+            time.perf_counter() - start,
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status=status
+        )
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Métriques au format texte Prometheus."""
+    return PlainTextResponse(
+        metrics_registry.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
 @app.on_event("startup")
 async def startup_event():
     logger.info("Démarrage du service d'inférence...")
-    # Initialisation du modèle si nécessaire
+    # Chargement unique du modèle pour tout le processus
+    with startup_profile.phase("model_load"):
+        analyzer = model_registry.load()
+    # Préchauffage explicite : spaCy/NLTK et première inférence hors du premier appel
+    if settings.warmup_on_startup:
+        with startup_profile.phase("warmup"):
+            analyzer.warmup()
+    # Pool d'inférence borné, hors de la boucle d'événements
+    inference_executor.start()
+    # Démarrage du micro-batching des inférences
+    await batch_scheduler.start()
+    # Auto-test d'inférence en tâche de fond (les sondes lisent son dernier résultat)
+    await health_monitor.start()
+    startup_profile.mark_ready()
+    startup_profile.log_summary()
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Arrêt du service d'inférence...")
-    # Nettoyage des ressources si nécessaire
+    # Arrêt de l'auto-test, du micro-batching et du pool puis libération du modèle
+    await health_monitor.stop()
+    await batch_scheduler.stop()
+    inference_executor.shutdown()
+    model_registry.release()
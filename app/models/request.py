@@ -1,6 +1,8 @@
-from pydantic import BaseModel, Field, constr
-from typing import Optional
+from pydantic import BaseModel, Field, constr, root_validator, validator
+from typing import List, Optional
 from datetime import datetime
+from app.core.config import settings
+from app.service.windowing import AGGREGATION_STRATEGIES
 
 class SentimentRequest(BaseModel):
     """
@@ -45,3 +47,206 @@ class SentimentRequest(BaseModel):
                 }
             }
         }
+
+
+class LongTextSentimentRequest(BaseModel):
+    """
+    Request model for sentiment analysis of a text longer than the model limit.
+
+    Attributes:
+        text (str): The text to analyze, scored in overlapping token windows.
+        node_id (Optional[str]): Node identifier (optional).
+        context (Optional[str]): Additional context for analysis (optional).
+        aggregation (Optional[str]): Window aggregation strategy (optional).
+    """
+    text: constr(min_length=1, max_length=settings.long_text_max_chars) = Field(
+        ...,
+        description="The text to be analyzed, of any length up to long_text_max_chars characters"
+    )
+    node_id: Optional[str] = Field(
+        None,
+        example="node_123",
+        description="Node identifier"
+    )
+    context: Optional[str] = Field(
+        None,
+        description="Additional context for analysis"
+    )
+    aggregation: Optional[str] = Field(
+        None,
+        example="length_weighted",
+        description="How window scores are combined: mean, max_confidence or length_weighted"
+    )
+
+    @validator("aggregation")
+    def check_aggregation(cls, value):
+        if value is not None and value not in AGGREGATION_STRATEGIES:
+            raise ValueError(f"aggregation must be one of {list(AGGREGATION_STRATEGIES)}")
+        return value
+
+
+class NodeInput(BaseModel):
+    """
+    Graph node submitted for sentiment analysis.
+
+    Attributes:
+        id (str): Node identifier.
+        text (str): The node text to analyze.
+        metadata (Optional[dict]): Extra metadata returned with the result (optional).
+    """
+    id: str = Field(..., example="node_123", description="Node identifier")
+    text: constr(min_length=1, max_length=1000) = Field(
+        ...,
+        example="Create Game – Architecture",
+        description="The node text to be analyzed"
+    )
+    metadata: Optional[dict] = Field(
+        None,
+        description="Extra metadata returned with the node result"
+    )
+
+
+class BatchSentimentRequest(BaseModel):
+    """
+    Request model for batch sentiment analysis.
+
+    Attributes:
+        texts (Optional[List[str]]): Plain texts to analyze (optional).
+        nodes (Optional[List[NodeInput]]): Graph nodes to analyze (optional).
+        context (Optional[str]): Additional context for analysis (optional).
+    """
+    texts: Optional[List[constr(min_length=1, max_length=1000)]] = Field(
+        None,
+        example=["Create Game – Architecture", "Fix login bug"],
+        description="Plain texts to be analyzed"
+    )
+    nodes: Optional[List[NodeInput]] = Field(
+        None,
+        description="Graph nodes to be analyzed"
+    )
+    context: Optional[str] = Field(
+        None,
+        example="Nightly rescoring of the project graph.",
+        description="Additional context for analysis"
+    )
+
+    @root_validator(skip_on_failure=True)
+    def check_items(cls, values):
+        count = len(values.get("texts") or []) + len(values.get("nodes") or [])
+        if count == 0:
+            raise ValueError("At least one text or node is required")
+        if count > settings.batch_request_max_items:
+            raise ValueError(
+                f"At most {settings.batch_request_max_items} texts and nodes per request"
+            )
+        return values
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "texts": ["Create Game – Architecture"],
+                "nodes": [
+                    {"id": "node_123", "text": "Fix login bug", "metadata": {"type": "task"}}
+                ],
+                "context": "Nightly rescoring of the project graph."
+            }
+        }
+
+
+class EdgeInput(BaseModel):
+    """
+    Graph edge submitted for sentiment analysis.
+
+    Attributes:
+        id (str): Edge identifier.
+        source (str): Identifier of the source node.
+        target (str): Identifier of the target node.
+        metadata (Optional[dict]): Extra metadata returned with the result (optional).
+    """
+    id: str = Field(..., example="edge_1", description="Edge identifier")
+    source: str = Field(..., example="node_1", description="Source node identifier")
+    target: str = Field(..., example="node_2", description="Target node identifier")
+    metadata: Optional[dict] = Field(
+        None,
+        description="Extra metadata returned with the edge result"
+    )
+
+
+class GraphSentimentRequest(BaseModel):
+    """
+    Request model for whole-graph sentiment analysis.
+
+    Attributes:
+        nodes (List[NodeInput]): Graph nodes to analyze.
+        edges (List[EdgeInput]): Graph edges, scored from their connected nodes.
+    """
+    nodes: List[NodeInput] = Field(..., min_items=1, description="Graph nodes")
+    edges: List[EdgeInput] = Field(default_factory=list, description="Graph edges")
+
+    @root_validator(skip_on_failure=True)
+    def check_size(cls, values):
+        if len(values["nodes"]) > settings.batch_request_max_items:
+            raise ValueError(
+                f"At most {settings.batch_request_max_items} nodes per graph"
+            )
+        if len(values["edges"]) > settings.graph_delta_max_edges:
+            raise ValueError(
+                f"At most {settings.graph_delta_max_edges} edges per graph"
+            )
+        return values
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "nodes": [
+                    {"id": "node_1", "text": "Create Game – Architecture"},
+                    {"id": "node_2", "text": "Fix login bug"}
+                ],
+                "edges": [
+                    {"id": "edge_1", "source": "node_1", "target": "node_2"}
+                ]
+            }
+        }
+
+
+class GraphDeltaRequest(BaseModel):
+    """
+    Changes applied to a graph session.
+
+    Removals are applied first, then added or changed nodes and edges. A node
+    or edge whose id already exists in the session replaces it.
+
+    Attributes:
+        nodes (List[NodeInput]): Nodes added or changed.
+        removed_nodes (List[str]): Ids of the nodes to remove.
+        edges (List[EdgeInput]): Edges added or changed.
+        removed_edges (List[str]): Ids of the edges to remove.
+    """
+    nodes: List[NodeInput] = Field(default_factory=list, description="Nodes added or changed")
+    removed_nodes: List[str] = Field(default_factory=list, description="Ids of the nodes to remove")
+    edges: List[EdgeInput] = Field(default_factory=list, description="Edges added or changed")
+    removed_edges: List[str] = Field(default_factory=list, description="Ids of the edges to remove")
+
+    @root_validator(skip_on_failure=True)
+    def check_changes(cls, values):
+        if not any(values[field] for field in ("nodes", "removed_nodes", "edges", "removed_edges")):
+            raise ValueError("At least one change is required")
+        if len(values["nodes"]) > settings.batch_request_max_items:
+            raise ValueError(
+                f"At most {settings.batch_request_max_items} nodes per delta"
+            )
+        if len(values["edges"]) > settings.graph_delta_max_edges:
+            raise ValueError(
+                f"At most {settings.graph_delta_max_edges} edges per delta"
+            )
+        return values
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "nodes": [{"id": "node_2", "text": "Login bug fixed"}],
+                "removed_nodes": ["node_3"],
+                "edges": [{"id": "edge_2", "source": "node_1", "target": "node_4"}],
+                "removed_edges": ["edge_1"]
+            }
+        }
@@ -157,4 +157,55 @@ class GraphSentimentResponse(BaseModel):
                     "model_version": "1.0.0"
                 }
             }
-        }
\ No newline at end of file
+        }
+
+class ColumnarNodes(BaseModel):
+    """
+    Nodes en colonnes : la ligne i de chaque liste décrit le même node.
+    
+    Attributes:
+        node_id (List[str]): Identifiants des nodes
+        label (List[Literal]): Labels des sentiments
+        score (List[float]): Scores de confiance
+        metadata (List[Optional[dict]]): Métadonnées des nodes
+    """
+    node_id: List[str] = Field(..., description="Identifiants des nodes")
+    label: List[Literal["positive", "negative", "neutral"]] = Field(..., description="Labels des sentiments")
+    score: List[float] = Field(..., description="Scores de confiance")
+    metadata: List[Optional[dict]] = Field(..., description="Métadonnées des nodes")
+
+
+class ColumnarEdges(BaseModel):
+    """
+    Edges en colonnes : la ligne i de chaque liste décrit le même edge.
+    
+    Attributes:
+        edge_id (List[str]): Identifiants des edges
+        label (List[Literal]): Labels des sentiments
+        score (List[float]): Scores de confiance
+        connected_nodes (List[List[str]]): Nodes connectés par chaque edge
+        metadata (List[Optional[dict]]): Métadonnées des edges
+    """
+    edge_id: List[str] = Field(..., description="Identifiants des edges")
+    label: List[Literal["positive", "negative", "neutral"]] = Field(..., description="Labels des sentiments")
+    score: List[float] = Field(..., description="Scores de confiance")
+    connected_nodes: List[List[str]] = Field(..., description="Nodes connectés par chaque edge")
+    metadata: List[Optional[dict]] = Field(..., description="Métadonnées des edges")
+
+
+class ColumnarGraphSentimentResponse(BaseModel):
+    """
+    Forme columnar de GraphSentimentResponse (?format=columnar).
+    
+    Attributes:
+        format (Literal): Toujours "columnar"
+        nodes (ColumnarNodes): Analyse des nodes, une liste par champ
+        edges (ColumnarEdges): Analyse des edges, une liste par champ
+        metrics (GraphSentimentMetrics): Métriques globales
+        metadata (Optional[dict]): Métadonnées supplémentaires
+    """
+    format: Literal["columnar"] = Field(..., description="Format de la réponse")
+    nodes: ColumnarNodes
+    edges: ColumnarEdges
+    metrics: GraphSentimentMetrics
+    metadata: Optional[dict] = Field(None, description="Métadonnées supplémentaires")
@@ -0,0 +1,403 @@
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from contextlib import contextmanager
+import logging
+import os
+import re
+import numpy as np
+from app.core.config import settings
+from app.core.startup_profile import timed_import
+
+try:
+    import fcntl
+except ImportError:  # not on Windows: writes stay atomic but concurrent builds are not serialized
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+SentimentResult = Dict[str, Union[str, float]]
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    """Row-wise softmax, stable for large logits."""
+    shifted = logits - logits.max(axis=-1, keepdims=True)
+    exp = np.exp(shifted)
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+class InferenceBackend:
+    """
+    Base class for sentiment inference backends.
+
+    A backend turns a list of cleaned texts into HuggingFace-style results
+    ({"label": "POSITIVE", "score": 0.99}), the contract SentimentAnalyzer
+    normalizes. Subclasses provide the tokenizer, the label mapping and
+    _forward(), which maps a tokenized batch to logits.
+    """
+
+    name = "base"
+
+    def __init__(self):
+        self.tokenizer = None
+        self.id2label: Dict[int, str] = {}
+        self.max_length = settings.max_sequence_length
+        self._affixes: Optional[Tuple[List[int], List[int]]] = None
+
+    @property
+    def pad_token_id(self) -> int:
+        return self.tokenizer.pad_token_id or 0
+
+    def tokenize(self, texts: List[str]) -> List[List[int]]:
+        """
+        Tokenize texts without padding.
+
+        Args:
+            texts (List[str]): Preprocessed texts.
+
+        Returns:
+            List[List[int]]: Token ids per text, truncated to max_length.
+        """
+        return self.tokenizer(
+            texts,
+            padding=False,
+            truncation=True,
+            max_length=self.max_length
+        )["input_ids"]
+
+    def tokenize_untruncated(self, texts: List[str]) -> List[List[int]]:
+        """
+        Tokenize texts whole, without special tokens, for sliding windows.
+
+        Args:
+            texts (List[str]): Preprocessed texts.
+
+        Returns:
+            List[List[int]]: Content token ids per text, of any length.
+        """
+        return self.tokenizer(
+            texts,
+            add_special_tokens=False,
+            padding=False,
+            truncation=False,
+            verbose=False
+        )["input_ids"]
+
+    def _special_token_affixes(self) -> Tuple[List[int], List[int]]:
+        """Special tokens the tokenizer puts before and after a single sequence."""
+        if self._affixes is None:
+            probe = "a"
+            content = self.tokenizer(probe, add_special_tokens=False)["input_ids"]
+            full = self.tokenizer(probe, add_special_tokens=True)["input_ids"]
+            start = next(
+                index for index in range(len(full) - len(content) + 1)
+                if full[index:index + len(content)] == content
+            )
+            self._affixes = (list(full[:start]), list(full[start + len(content):]))
+        return self._affixes
+
+    @property
+    def num_special_tokens(self) -> int:
+        """Special tokens added around a single sequence ([CLS] and [SEP] for BERT)."""
+        prefix, suffix = self._special_token_affixes()
+        return len(prefix) + len(suffix)
+
+    def with_special_tokens(self, token_ids: List[int]) -> List[int]:
+        """Wrap content token ids with the model's special tokens."""
+        prefix, suffix = self._special_token_affixes()
+        return prefix + list(token_ids) + suffix
+
+    def _pad(self, token_ids: List[List[int]]) -> Dict[str, np.ndarray]:
+        """Pad a batch to its longest sequence and build the attention mask."""
+        width = max(len(ids) for ids in token_ids)
+        input_ids = np.full((len(token_ids), width), self.pad_token_id, dtype=np.int64)
+        attention_mask = np.zeros((len(token_ids), width), dtype=np.int64)
+        for row, ids in enumerate(token_ids):
+            input_ids[row, :len(ids)] = ids
+            attention_mask[row, :len(ids)] = 1
+        return {"input_ids": input_ids, "attention_mask": attention_mask}
+
+    def _forward(self, encoded: Dict[str, np.ndarray]) -> np.ndarray:
+        """Return the logits of a tokenized batch, shape (batch, labels)."""
+        raise NotImplementedError
+
+    def predict_ids(self, token_ids: List[List[int]]) -> List[SentimentResult]:
+        """
+        Score a batch of tokenized texts, padded to the batch's longest one.
+
+        Args:
+            token_ids (List[List[int]]): Token ids per text, from tokenize().
+
+        Returns:
+            List[SentimentResult]: Top label and its probability, in input order.
+        """
+        if not token_ids:
+            return []
+        probabilities = _softmax(self._forward(self._pad(token_ids)).astype(np.float64))
+        best = probabilities.argmax(axis=-1)
+        return [
+            {"label": self.id2label[int(label_id)], "score": float(probabilities[row, label_id])}
+            for row, label_id in enumerate(best)
+        ]
+
+    def predict(self, texts: List[str]) -> List[SentimentResult]:
+        """
+        Score a batch of cleaned texts.
+
+        Args:
+            texts (List[str]): Preprocessed texts.
+
+        Returns:
+            List[SentimentResult]: Top label and its probability, in input order.
+        """
+        if not texts:
+            return []
+        return self.predict_ids(self.tokenize(texts))
+
+
+class TorchBackend(InferenceBackend):
+    """
+    PyTorch eager inference with the transformers model.
+
+    In "quantized" mode the Linear layers are converted to dynamic int8 at
+    load time, which roughly halves memory and speeds up CPU matmuls.
+    """
+
+    name = "torch"
+
+    def __init__(self, model_name: Optional[str] = None, mode: Optional[str] = None):
+        super().__init__()
+        torch = timed_import("torch")
+        transformers = timed_import("transformers")
+
+        model_name = model_name or settings.model_name
+        self.mode = _check_mode(mode or settings.model_mode)
+        self._torch = torch
+        self.tokenizer = transformers.AutoTokenizer.from_pretrained(model_name, use_fast=True)
+        self.model = transformers.AutoModelForSequenceClassification.from_pretrained(model_name)
+        self.model.eval()
+        if self.mode == "quantized":
+            self.model = torch.quantization.quantize_dynamic(
+                self.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        self.id2label = {int(k): v for k, v in self.model.config.id2label.items()}
+
+    def size_bytes(self) -> int:
+        """Serialized size of the model weights."""
+        import io
+        buffer = io.BytesIO()
+        self._torch.save(self.model.state_dict(), buffer)
+        return buffer.getbuffer().nbytes
+
+    def _forward(self, encoded: Dict[str, np.ndarray]) -> np.ndarray:
+        torch = self._torch
+        with torch.inference_mode():
+            outputs = self.model(
+                input_ids=torch.from_numpy(encoded["input_ids"]),
+                attention_mask=torch.from_numpy(encoded["attention_mask"])
+            )
+        return outputs.logits.float().numpy()
+
+
+class OnnxBackend(InferenceBackend):
+    """
+    ONNX Runtime CPU inference.
+
+    The transformers model is exported to ONNX once, together with its
+    tokenizer and config, under settings.onnx_model_dir. Later loads only
+    need onnxruntime and the tokenizer, not torch. In "quantized" mode the
+    export is converted once more to dynamic int8 weights.
+    """
+
+    name = "onnx"
+
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        export_dir: Optional[str] = None,
+        mode: Optional[str] = None
+    ):
+        super().__init__()
+        try:
+            ort = timed_import("onnxruntime")
+        except ImportError as e:
+            raise ImportError(
+                "The onnx backend requires onnxruntime: pip install onnxruntime"
+            ) from e
+        transformers = timed_import("transformers")
+
+        model_name = model_name or settings.model_name
+        self.mode = _check_mode(mode or settings.model_mode)
+        self.export_dir = export_dir or onnx_export_dir(model_name)
+        model_path = os.path.join(self.export_dir, "model.onnx")
+        if not os.path.exists(model_path):
+            export_to_onnx(model_name, self.export_dir)
+        if self.mode == "quantized":
+            model_path = quantize_onnx(model_path)
+        self.model_path = model_path
+
+        self.tokenizer = transformers.AutoTokenizer.from_pretrained(self.export_dir, use_fast=True)
+        config = transformers.AutoConfig.from_pretrained(self.export_dir)
+        self.id2label = {int(k): v for k, v in config.id2label.items()}
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if settings.onnx_intra_op_threads:
+            options.intra_op_num_threads = settings.onnx_intra_op_threads
+        self.session = ort.InferenceSession(
+            model_path,
+            sess_options=options,
+            providers=["CPUExecutionProvider"]
+        )
+        self._input_names = {i.name for i in self.session.get_inputs()}
+        logger.info(f"ONNX Runtime session ready ({model_path})")
+
+    def size_bytes(self) -> int:
+        """Size of the ONNX model file."""
+        return os.path.getsize(self.model_path)
+
+    def _forward(self, encoded: Dict[str, np.ndarray]) -> np.ndarray:
+        feeds = {
+            name: encoded[name].astype(np.int64)
+            for name in ("input_ids", "attention_mask")
+            if name in self._input_names
+        }
+        return self.session.run(["logits"], feeds)[0]
+
+
+MODEL_MODES = ("fp32", "quantized")
+
+
+def _check_mode(mode: str) -> str:
+    if mode not in MODEL_MODES:
+        raise ValueError(f"Unknown model mode: {mode} (expected one of {list(MODEL_MODES)})")
+    return mode
+
+
+def onnx_export_dir(model_name: str) -> str:
+    """Directory holding the ONNX export of a model."""
+    safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name).strip("_")
+    return os.path.join(settings.onnx_model_dir, safe_name)
+
+
+@contextmanager
+def _publish(path: str) -> Iterator[Optional[str]]:
+    """
+    Build a file under a temporary name in its directory, then move it to path.
+
+    Several processes may load the same model at once (uvicorn workers,
+    process executor workers). An exclusive lock on path + ".lock" lets only
+    one of them build the file, and os.replace() makes it appear complete:
+    readers see either no file or the whole file.
+
+    Args:
+        path (str): Final path of the file.
+
+    Yields:
+        Optional[str]: Temporary path to write, or None if another process
+            published path while this one waited for the lock.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(f"{path}.lock", "a") as lock:
+        if fcntl is not None:
+            # Released when the lock file is closed
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        if os.path.exists(path):
+            yield None
+            return
+        root, extension = os.path.splitext(path)
+        temporary_path = f"{root}.{os.getpid()}.tmp{extension}"
+        try:
+            yield temporary_path
+            os.replace(temporary_path, path)
+        finally:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+
+
+def export_to_onnx(model_name: str, export_dir: str) -> str:
+    """
+    Export a sequence classification model to ONNX with dynamic batch and length.
+
+    The tokenizer and config are written first and model.onnx last, in one
+    step, so an existing model.onnx means a complete export.
+
+    Args:
+        model_name (str): HuggingFace model name or local path.
+        export_dir (str): Output directory; receives model.onnx, tokenizer and config.
+
+    Returns:
+        str: Path of the exported model.onnx.
+    """
+    model_path = os.path.join(export_dir, "model.onnx")
+    with _publish(model_path) as temporary_path:
+        if temporary_path is None:
+            return model_path
+        import torch
+        from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+        logger.info(f"Exporting {model_name} to ONNX in {export_dir}...")
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        model = AutoModelForSequenceClassification.from_pretrained(model_name)
+        model.eval()
+
+        sample = tokenizer(["export sample"], return_tensors="pt")
+        with torch.inference_mode():
+            torch.onnx.export(
+                model,
+                (sample["input_ids"], sample["attention_mask"]),
+                temporary_path,
+                input_names=["input_ids", "attention_mask"],
+                output_names=["logits"],
+                dynamic_axes={
+                    "input_ids": {0: "batch", 1: "sequence"},
+                    "attention_mask": {0: "batch", 1: "sequence"},
+                    "logits": {0: "batch"}
+                },
+                opset_version=14
+            )
+        tokenizer.save_pretrained(export_dir)
+        model.config.save_pretrained(export_dir)
+    return model_path
+
+
+def quantize_onnx(model_path: str) -> str:
+    """
+    Convert an ONNX model to dynamic int8 weights, once.
+
+    Args:
+        model_path (str): fp32 model.onnx path.
+
+    Returns:
+        str: Path of the int8 model, next to the fp32 one.
+    """
+    quantized_path = model_path.replace(".onnx", ".int8.onnx")
+    if os.path.exists(quantized_path):
+        return quantized_path
+    with _publish(quantized_path) as temporary_path:
+        if temporary_path is not None:
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+            logger.info(f"Quantizing {model_path} to int8...")
+            quantize_dynamic(model_path, temporary_path, weight_type=QuantType.QInt8)
+    return quantized_path
+
+
+BACKENDS = {
+    TorchBackend.name: TorchBackend,
+    OnnxBackend.name: OnnxBackend
+}
+
+
+def load_backend(name: Optional[str] = None, mode: Optional[str] = None) -> InferenceBackend:
+    """
+    Build the inference backend selected in settings.
+
+    Args:
+        name (Optional[str]): Backend name. Defaults to settings.inference_backend.
+        mode (Optional[str]): "fp32" or "quantized". Defaults to settings.model_mode.
+
+    Returns:
+        InferenceBackend: Loaded backend.
+    """
+    name = name or settings.inference_backend
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown inference backend: {name} (expected one of {sorted(BACKENDS)})")
+    return BACKENDS[name](mode=mode)
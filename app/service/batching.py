@@ -0,0 +1,223 @@
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, Union
+from collections import Counter
+import asyncio
+import contextvars
+import logging
+from app.core.config import settings
+from app.core.metrics import batch_sizes, stage_latency
+from app.core.profiling import RequestProfile, active_profile
+from app.service.executor import QueueFullError, inference_executor
+
+logger = logging.getLogger(__name__)
+
+SentimentResult = Dict[str, Union[str, float]]
+# (text, caller's future, loop time at which it was queued)
+PendingItem = Tuple[str, "asyncio.Future[SentimentResult]", float]
+BatchRunner = Callable[[List[str]], Awaitable[List[SentimentResult]]]
+
+
+class BatchScheduler:
+    """Group concurrent analyze_text calls into batched pipeline calls."""
+
+    def __init__(
+        self,
+        runner: BatchRunner,
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None,
+        max_pending: Optional[int] = None
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            runner (BatchRunner): Coroutine function scoring a list of texts.
+            max_batch_size (Optional[int]): Largest batch to form. Defaults to
+                settings.batch_max_size.
+            max_wait_ms (Optional[float]): Longest time the first request of a batch
+                waits for others to join. Defaults to settings.batch_max_wait_ms.
+            max_pending (Optional[int]): Requests allowed to wait for a batch before
+                new ones are rejected. Defaults to settings.batch_max_pending.
+        """
+        self._runner = runner
+        self.max_batch_size = max(1, max_batch_size or settings.batch_max_size)
+        self.max_wait_ms = settings.batch_max_wait_ms if max_wait_ms is None else max_wait_ms
+        self.max_pending = max_pending or settings.batch_max_pending
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._batch_sizes: Counter = Counter()
+        # Profiles of profiled requests waiting in the queue, by caller's future
+        self._profiles: Dict["asyncio.Future[SentimentResult]", RequestProfile] = {}
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the batching worker task is alive."""
+        return self._worker is not None and not self._worker.done()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of requests waiting to be batched."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def start(self) -> None:
+        """Start the batching worker on the running event loop."""
+        if self.is_running:
+            return
+        self._queue = asyncio.Queue()
+        # Empty context: a worker started by a profiled request must not keep its profile
+        self._worker = contextvars.Context().run(asyncio.create_task, self._run())
+        logger.info(
+            f"Batch scheduler started (max_batch_size={self.max_batch_size}, "
+            f"max_wait_ms={self.max_wait_ms})"
+        )
+
+    async def stop(self) -> None:
+        """Stop the worker and fail any request still waiting in the queue."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        if self._queue is not None:
+            while not self._queue.empty():
+                _, future, _ = self._queue.get_nowait()
+                if not future.done():
+                    future.set_exception(RuntimeError("Batch scheduler stopped"))
+        self._profiles.clear()
+        logger.info("Batch scheduler stopped")
+
+    async def submit(self, text: str) -> SentimentResult:
+        """
+        Queue a text for the next batch and wait for its own result.
+
+        Args:
+            text (str): Input text.
+
+        Returns:
+            SentimentResult: Sentiment result with label and score.
+
+        Raises:
+            QueueFullError: If max_pending requests are already waiting.
+        """
+        if not self.is_running:
+            await self.start()
+        if self._queue.qsize() >= self.max_pending:
+            raise QueueFullError("Batch queue is full")
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        profile = active_profile()
+        if profile is not None:
+            self._profiles[future] = profile
+        await self._queue.put((text, future, loop.time()))
+        return await future
+
+    def stats(self) -> Dict:
+        """
+        Report the batch sizes formed so far.
+
+        Returns:
+            Dict: Batch count, request count, mean batch size and size histogram.
+        """
+        batches = sum(self._batch_sizes.values())
+        requests = sum(size * count for size, count in self._batch_sizes.items())
+        return {
+            "batches": batches,
+            "requests": requests,
+            "mean_batch_size": round(requests / batches, 2) if batches else 0.0,
+            "batch_size_histogram": dict(sorted(self._batch_sizes.items())),
+            "queue_depth": self.queue_depth
+        }
+
+    async def _collect_batch(self) -> List[PendingItem]:
+        """Wait for one request, then gather more until the size or wait limit."""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait_ms / 1000.0
+
+        while len(batch) < self.max_batch_size:
+            # Take whatever is already queued before waiting on the clock
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        """Worker loop: collect a batch, run it, dispatch results."""
+        while True:
+            batch = await self._collect_batch()
+            await self._run_batch(batch)
+
+    async def _run_batch(self, batch: List[PendingItem]) -> None:
+        """Run one batched pipeline call and resolve every caller's future."""
+        profiles = (
+            {future: self._profiles.pop(future, None) for _, future, _ in batch}
+            if self._profiles else {}
+        )
+        # Callers that went away (client disconnect, timeout) are not scored
+        batch = [item for item in batch if not item[1].cancelled()]
+        if not batch:
+            return
+        self._batch_sizes[len(batch)] += 1
+        batch_sizes.observe(len(batch), kind="micro_batch")
+        now = asyncio.get_running_loop().time()
+        for _, future, queued_at in batch:
+            stage_latency.observe(now - queued_at, stage="batch_queue")
+            profile = profiles.get(future)
+            if profile is not None:
+                profile.record("batch_queue", now - queued_at)
+                profile.details["micro_batch_size"] = len(batch)
+
+        texts = [text for text, _, _ in batch]
+        try:
+            results = await self._run_texts(texts, [p for p in profiles.values() if p is not None])
+        except asyncio.CancelledError:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(RuntimeError("Batch scheduler stopped"))
+            raise
+        except Exception as e:
+            logger.error(f"Error running batch of {len(batch)}: {str(e)}")
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future, _), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def _run_texts(self, texts: List[str], profiles: List[RequestProfile]) -> List[SentimentResult]:
+        """
+        Call the runner; with profiled requests in the batch, under a profile
+        of the batch whose stage times are then shared by each of them.
+        """
+        if not profiles:
+            return await self._runner(texts)
+        batch_profile = RequestProfile(
+            capture_cprofile=any(profile.capture_cprofile for profile in profiles)
+        )
+        with batch_profile.activate():
+            results = await self._runner(texts)
+        stages = batch_profile.stage_totals()
+        stats = batch_profile.cprofile_stats()
+        for profile in profiles:
+            profile.merge(stages)
+            if stats and profile.capture_cprofile:
+                profile.add_cprofile_stats(stats)
+        return results
+
+
+async def _run_on_executor(texts: List[str]) -> List[SentimentResult]:
+    return await inference_executor.run_analyzer("analyze_texts", texts)
+
+
+batch_scheduler = BatchScheduler(_run_on_executor)
@@ -0,0 +1,124 @@
+from typing import Dict, List, Optional
+import threading
+
+
+def plan_length_buckets(
+    lengths: List[int],
+    max_bucket_size: int,
+    max_bucket_tokens: Optional[int] = None
+) -> List[List[int]]:
+    """
+    Group text indices into buckets of similar tokenized length.
+
+    Indices are sorted by length and cut into consecutive buckets, so each
+    bucket is padded only up to its own longest text. A bucket closes when it
+    holds max_bucket_size texts or when its padded size would exceed
+    max_bucket_tokens, which keeps batches of long texts small.
+
+    Args:
+        lengths (List[int]): Token count per text.
+        max_bucket_size (int): Largest number of texts per bucket.
+        max_bucket_tokens (Optional[int]): Largest padded size (texts x longest
+            length) per bucket; None disables the limit.
+
+    Returns:
+        List[List[int]]: Buckets of indices into lengths, shortest texts first.
+    """
+    max_bucket_size = max(1, max_bucket_size)
+    buckets: List[List[int]] = []
+    bucket: List[int] = []
+    for index in sorted(range(len(lengths)), key=lengths.__getitem__):
+        # Sorted ascending, so the new text is the bucket's longest
+        padded_size = (len(bucket) + 1) * lengths[index]
+        if bucket and (
+            len(bucket) >= max_bucket_size
+            or (max_bucket_tokens is not None and padded_size > max_bucket_tokens)
+        ):
+            buckets.append(bucket)
+            bucket = []
+        bucket.append(index)
+    if bucket:
+        buckets.append(bucket)
+    return buckets
+
+
+def padded_tokens(lengths: List[int], buckets: List[List[int]]) -> int:
+    """
+    Count the padding tokens needed to run the given buckets.
+
+    Args:
+        lengths (List[int]): Token count per text.
+        buckets (List[List[int]]): Buckets of indices into lengths.
+
+    Returns:
+        int: Padding positions across all buckets.
+    """
+    total = 0
+    for bucket in buckets:
+        bucket_lengths = [lengths[index] for index in bucket]
+        total += max(bucket_lengths) * len(bucket_lengths) - sum(bucket_lengths)
+    return total
+
+
+def sequential_buckets(count: int, batch_size: int) -> List[List[int]]:
+    """Split indices 0..count-1 into consecutive batches, in input order."""
+    batch_size = max(1, batch_size)
+    return [list(range(start, min(start + batch_size, count))) for start in range(0, count, batch_size)]
+
+
+class PaddingStats:
+    """Track how much padding length bucketing saves over in-order batching."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.real_tokens = 0
+        self.padded_tokens = 0
+        self.padded_tokens_saved = 0
+        self.last_batch: Dict = {}
+
+    def record(self, lengths: List[int], buckets: List[List[int]], batch_size: int) -> Dict:
+        """
+        Record one batch.
+
+        Args:
+            lengths (List[int]): Token count per text of the batch.
+            buckets (List[List[int]]): Buckets actually run.
+            batch_size (int): Batch size in-order batching would have used.
+
+        Returns:
+            Dict: Padding figures for this batch.
+        """
+        bucketed = padded_tokens(lengths, buckets)
+        naive = padded_tokens(lengths, sequential_buckets(len(lengths), batch_size))
+        batch = {
+            "texts": len(lengths),
+            "buckets": len(buckets),
+            "real_tokens": sum(lengths),
+            "padded_tokens": bucketed,
+            "padded_tokens_saved": naive - bucketed
+        }
+        with self._lock:
+            self.batches += 1
+            self.real_tokens += batch["real_tokens"]
+            self.padded_tokens += bucketed
+            self.padded_tokens_saved += batch["padded_tokens_saved"]
+            self.last_batch = batch
+        return batch
+
+    def stats(self) -> Dict:
+        """
+        Report cumulative padding figures.
+
+        Returns:
+            Dict: Batches, real and padded tokens, tokens saved and the last batch.
+        """
+        computed = self.real_tokens + self.padded_tokens
+        return {
+            "batches": self.batches,
+            "real_tokens": self.real_tokens,
+            "padded_tokens": self.padded_tokens,
+            "padded_tokens_saved": self.padded_tokens_saved,
+            "padding_ratio": round(self.padded_tokens / computed, 4) if computed else 0.0,
+            "last_batch": self.last_batch
+        }
@@ -0,0 +1,150 @@
+from typing import Callable, Dict, Optional, Tuple, Union
+from collections import OrderedDict
+import hashlib
+import logging
+import threading
+import time
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+SentimentResult = Dict[str, Union[str, float]]
+
+
+def model_identity(
+    model_name: Optional[str] = None,
+    backend: Optional[str] = None,
+    mode: Optional[str] = None
+) -> str:
+    """
+    Identify the model configuration that produced a result.
+
+    fp32 and quantized models, or the torch and ONNX backends, score the same
+    text slightly differently: their results must not be shared.
+
+    Args:
+        model_name (Optional[str]): Model name. Defaults to settings.model_name.
+        backend (Optional[str]): Inference backend. Defaults to settings.inference_backend.
+        mode (Optional[str]): Model mode. Defaults to settings.model_mode.
+
+    Returns:
+        str: "model_name|backend|mode".
+    """
+    return "|".join((
+        model_name or settings.model_name,
+        backend or settings.inference_backend,
+        mode or settings.model_mode
+    ))
+
+
+class InferenceCache:
+    """Bounded in-memory cache of sentiment results with LRU and TTL eviction."""
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries (Optional[int]): Entries kept before the least recently used
+                one is evicted. Defaults to settings.cache_max_entries.
+            ttl_seconds (Optional[float]): Lifetime of an entry; 0 disables expiry.
+                Defaults to settings.cache_ttl_seconds.
+            clock (Callable[[], float]): Monotonic time source.
+        """
+        self.max_entries = max(1, max_entries or settings.cache_max_entries)
+        self.ttl_seconds = settings.cache_ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def make_key(cleaned_text: str, model: Optional[str] = None) -> str:
+        """
+        Build the content address of a cleaned text for a given model configuration.
+
+        Args:
+            cleaned_text (str): Text after preprocessing.
+            model (Optional[str]): Model identity, as from model_identity().
+                Defaults to the configured model, backend and mode.
+
+        Returns:
+            str: Hex digest identifying the (model, text) pair.
+        """
+        model = model or model_identity()
+        return hashlib.sha256(f"{model}\0{cleaned_text}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[SentimentResult]:
+        """
+        Look up a cached result.
+
+        Args:
+            key (str): Key built with make_key().
+
+        Returns:
+            Optional[SentimentResult]: A fresh copy of the result, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_at, label, score = entry
+            if self.ttl_seconds and self._clock() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return {"label": label, "score": score}
+
+    def set(self, key: str, result: SentimentResult) -> None:
+        """
+        Store a result, evicting the least recently used entries when full.
+
+        Args:
+            key (str): Key built with make_key().
+            result (SentimentResult): Result with label and score.
+        """
+        with self._lock:
+            self._entries[key] = (self._clock(), result["label"], result["score"])
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry; counters are kept."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict:
+        """
+        Report cache counters.
+
+        Returns:
+            Dict: Size, capacity, hits, misses, evictions, expirations and hit rate.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
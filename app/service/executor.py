@@ -0,0 +1,186 @@
+from typing import Any, Dict, Optional, Tuple
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import asyncio
+import logging
+import threading
+import time
+from app.core.config import settings
+from app.core.metrics import stage_latency
+from app.core.profiling import active_profile, run_profiled
+from app.service.model_registry import model_registry
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(RuntimeError):
+    """Raised when inference work is rejected because the queue is full."""
+
+    def __init__(self, message: str = "Inference queue is full", retry_after: Optional[int] = None):
+        super().__init__(message)
+        self.retry_after = settings.executor_retry_after_seconds if retry_after is None else retry_after
+
+
+def _init_process_worker() -> None:
+    """Load a model in each worker process of a process pool."""
+    model_registry.load()
+
+
+def _call_analyzer(
+    method: str,
+    args: Tuple,
+    submitted_at: float,
+    profiled: bool = False,
+    capture_cprofile: bool = False
+) -> Tuple[float, Any, Optional[Tuple]]:
+    """
+    Run an analyzer method in a pool worker.
+
+    Module-level so that process pools can pickle it; each process resolves
+    its own registry analyzer.
+
+    Returns:
+        Tuple[float, Any, Optional[Tuple]]: Seconds spent waiting in the queue,
+            the result, and for a profiled call its stage totals and cProfile
+            stats (see run_profiled).
+    """
+    waited = max(0.0, time.time() - submitted_at)
+    function = getattr(model_registry.get_analyzer(), method)
+    if not profiled:
+        return waited, function(*args), None
+    result, stages, stats = run_profiled(function, *args, capture_cprofile=capture_cprofile)
+    return waited, result, (stages, stats)
+
+
+class InferenceExecutor:
+    """Run blocking inference off the event loop on a bounded worker pool."""
+
+    def __init__(
+        self,
+        kind: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        max_queue: Optional[int] = None
+    ):
+        """
+        Initialize the executor; the pool itself is created by start().
+
+        Args:
+            kind (Optional[str]): "thread" or "process". Defaults to settings.executor_kind.
+            max_workers (Optional[int]): Pool size. Defaults to settings.executor_max_workers.
+            max_queue (Optional[int]): Calls allowed to wait for a free worker before
+                new ones are rejected. Defaults to settings.executor_max_queue.
+        """
+        self.kind = kind or settings.executor_kind
+        if self.kind not in ("thread", "process"):
+            raise ValueError(f"Unknown executor kind: {self.kind}")
+        self.max_workers = max(1, max_workers or settings.executor_max_workers)
+        self.max_queue = settings.executor_max_queue if max_queue is None else max_queue
+        self._pool: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    @property
+    def in_flight(self) -> int:
+        """Calls accepted and not finished yet (running or queued)."""
+        return self._pending
+
+    @property
+    def queue_depth(self) -> int:
+        """Calls waiting for a free worker."""
+        return max(0, self._pending - self.max_workers)
+
+    def start(self) -> None:
+        """Create the worker pool."""
+        if self._pool is not None:
+            return
+        if self.kind == "process":
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_process_worker
+            )
+        else:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="inference"
+            )
+        logger.info(
+            f"Inference executor started (kind={self.kind}, max_workers={self.max_workers}, "
+            f"max_queue={self.max_queue})"
+        )
+
+    def shutdown(self) -> None:
+        """Stop the worker pool, letting running calls finish."""
+        if self._pool is None:
+            return
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        self._pool = None
+        logger.info("Inference executor stopped")
+
+    async def run_analyzer(self, method: str, *args) -> Any:
+        """
+        Call a SentimentAnalyzer method on the pool.
+
+        Args:
+            method (str): Analyzer method name, e.g. "analyze_texts".
+            *args: Positional arguments for the method.
+
+        Returns:
+            Any: The method's return value.
+
+        Raises:
+            QueueFullError: If max_workers calls are running and max_queue are waiting.
+        """
+        if self._pool is None:
+            self.start()
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise QueueFullError()
+            self._pending += 1
+
+        profile = active_profile()
+        try:
+            waited, result, report = await asyncio.get_running_loop().run_in_executor(
+                self._pool, _call_analyzer, method, args, time.time(),
+                profile is not None, profile is not None and profile.capture_cprofile
+            )
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+        stage_latency.observe(waited, stage="executor_queue")
+        if report is not None:
+            stages, stats = report
+            profile.merge(stages)
+            if stats:
+                profile.add_cprofile_stats(stats)
+        with self._lock:
+            self.completed += 1
+            self._total_wait += waited
+            self._max_wait = max(self._max_wait, waited)
+        return result
+
+    def stats(self) -> Dict:
+        """
+        Report queue depth and queue wait times.
+
+        Returns:
+            Dict: Pool configuration, in-flight and queued calls, rejections and waits.
+        """
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "mean_wait_ms": round(1000 * self._total_wait / self.completed, 3) if self.completed else 0.0,
+            "max_wait_ms": round(1000 * self._max_wait, 3)
+        }
+
+
+inference_executor = InferenceExecutor()
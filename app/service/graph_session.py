@@ -0,0 +1,383 @@
+from typing import Callable, Dict, List, Optional, Set, Union
+from collections import OrderedDict
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from app.core.config import settings
+from app.service.pipeline_sentiment import SCORE_UNITS, build_edge_analysis, mean_score
+
+logger = logging.getLogger(__name__)
+
+SentimentResult = Dict[str, Union[str, float]]
+# {"nodes": [...], "removed_nodes": [...], "edges": [...], "removed_edges": [...]}
+GraphDelta = Dict[str, List]
+
+class SessionNotFoundError(KeyError):
+    """Raised when a graph session does not exist or has expired."""
+
+
+class SessionLimitError(ValueError):
+    """Raised when a delta would grow a session beyond its node or edge limit."""
+
+
+class RunningMetrics:
+    """
+    Score sum and label counts of a set of results, updated one result at a time.
+
+    The sum is kept in SCORE_UNITS: adding and removing results never drifts,
+    and the average is the one compute_graph_metrics() gives.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.score_units = 0
+        self.positive = 0
+        self.negative = 0
+
+    def add(self, sentiment: SentimentResult, sign: int = 1) -> None:
+        self.count += sign
+        self.score_units += sign * round(sentiment["score"] * SCORE_UNITS)
+        if sentiment["label"] == "positive":
+            self.positive += sign
+        elif sentiment["label"] == "negative":
+            self.negative += sign
+
+    def remove(self, sentiment: SentimentResult) -> None:
+        self.add(sentiment, sign=-1)
+
+    @property
+    def average(self) -> float:
+        return mean_score(self.score_units, self.count)
+
+
+class GraphSession:
+    """
+    Graph kept on the server and updated by deltas.
+
+    The session holds the same results analyze_graph() would return for its
+    current nodes and edges, but a delta only costs its own size: changed
+    texts are scored, only the edges touching changed nodes are recomputed,
+    and the graph metrics are running aggregates.
+
+    Applying a delta is two steps so that scoring can run on the inference
+    executor: plan() returns the texts to score, apply() takes their results.
+    Hold lock across both when deltas may arrive concurrently.
+    """
+
+    def __init__(self, session_id: str, max_nodes: Optional[int] = None, max_edges: Optional[int] = None):
+        """
+        Initialize an empty session.
+
+        Args:
+            session_id (str): Session identifier.
+            max_nodes (Optional[int]): Largest number of nodes. Defaults to
+                settings.graph_session_max_nodes.
+            max_edges (Optional[int]): Largest number of edges. Defaults to
+                settings.graph_session_max_edges.
+        """
+        self.session_id = session_id
+        self.max_nodes = max_nodes or settings.graph_session_max_nodes
+        self.max_edges = max_edges or settings.graph_session_max_edges
+        self.version = 0
+        self.lock = asyncio.Lock()
+        # Node id -> {"text", "analysis"}; edge id -> edge input, in insertion order
+        self._nodes: Dict[str, Dict] = {}
+        self._edges: Dict[str, Dict] = {}
+        # Edge results, only for edges whose two nodes exist
+        self._edge_results: Dict[str, Dict] = {}
+        # Node id -> ids of the edges touching it (dict as an ordered set)
+        self._incident: Dict[str, Dict[str, None]] = {}
+        self._node_metrics = RunningMetrics()
+        self._edge_metrics = RunningMetrics()
+
+    @property
+    def node_count(self) -> int:
+        return len(self._nodes)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self._edges)
+
+    def plan(self, delta: GraphDelta) -> List[str]:
+        """
+        Check a delta and list the texts it needs scored.
+
+        Args:
+            delta (GraphDelta): Nodes and edges added or changed, ids removed.
+
+        Returns:
+            List[str]: Distinct texts of new nodes and of nodes whose text changed.
+
+        Raises:
+            SessionLimitError: If the session would exceed max_nodes or max_edges.
+        """
+        removed = {node_id for node_id in delta.get("removed_nodes") or [] if node_id in self._nodes}
+        # Text of the nodes set earlier in this delta (a node may appear twice)
+        pending: Dict[str, str] = {}
+        node_count = self.node_count - len(removed)
+        texts = []
+        for node in delta.get("nodes") or []:
+            if node["id"] in pending:
+                current = pending[node["id"]]
+            elif node["id"] in removed or node["id"] not in self._nodes:
+                current = None
+            else:
+                current = self._nodes[node["id"]]["text"]
+            if current is None:
+                node_count += 1
+            if current != node["text"]:
+                texts.append(node["text"])
+            pending[node["id"]] = node["text"]
+        if node_count > self.max_nodes:
+            raise SessionLimitError(f"A graph session holds at most {self.max_nodes} nodes")
+
+        removed_edges = {edge_id for edge_id in delta.get("removed_edges") or [] if edge_id in self._edges}
+        # Removed nodes keep their edges, which come back with the node
+        new_edges = {
+            edge["id"] for edge in delta.get("edges") or []
+            if edge["id"] in removed_edges or edge["id"] not in self._edges
+        }
+        if self.edge_count - len(removed_edges) + len(new_edges) > self.max_edges:
+            raise SessionLimitError(f"A graph session holds at most {self.max_edges} edges")
+        return list(dict.fromkeys(texts))
+
+    def apply(self, delta: GraphDelta, sentiments: Dict[str, SentimentResult]) -> Dict:
+        """
+        Apply a delta: removals first, then added or changed nodes and edges.
+
+        Args:
+            delta (GraphDelta): Same delta as given to plan().
+            sentiments (Dict[str, SentimentResult]): Result of each text from plan().
+
+        Returns:
+            Dict: Changed node and edge results, ids of node and edge results
+                that no longer exist, and the updated metrics.
+        """
+        changed_nodes: List[str] = []
+        # Edges to recompute, in the order they were found (dict as an ordered set)
+        stale_edges: Dict[str, None] = {}
+        removed_edges: Set[str] = set()
+
+        for edge_id in delta.get("removed_edges") or []:
+            edge = self._edges.pop(edge_id, None)
+            if edge is not None:
+                self._unlink(edge_id, edge)
+                if self._drop_edge_result(edge_id):
+                    removed_edges.add(edge_id)
+
+        removed_nodes = []
+        for node_id in delta.get("removed_nodes") or []:
+            node = self._nodes.pop(node_id, None)
+            if node is None:
+                continue
+            self._node_metrics.remove(node["analysis"]["sentiment"])
+            removed_nodes.append(node_id)
+            for edge_id in self._incident.get(node_id, ()):
+                if self._drop_edge_result(edge_id):
+                    removed_edges.add(edge_id)
+
+        for node in delta.get("nodes") or []:
+            current = self._nodes.get(node["id"])
+            if current is not None and current["text"] == node["text"]:
+                # Same text: keep the score, update the metadata only
+                current["analysis"]["metadata"] = node.get("metadata", {})
+            else:
+                analysis = {
+                    "node_id": node["id"],
+                    "sentiment": dict(sentiments[node["text"]]),
+                    "metadata": node.get("metadata", {})
+                }
+                if current is not None:
+                    self._node_metrics.remove(current["analysis"]["sentiment"])
+                self._node_metrics.add(analysis["sentiment"])
+                self._nodes[node["id"]] = {"text": node["text"], "analysis": analysis}
+                stale_edges.update(self._incident.get(node["id"], {}))
+            changed_nodes.append(node["id"])
+
+        for edge in delta.get("edges") or []:
+            previous = self._edges.get(edge["id"])
+            if previous is not None:
+                self._unlink(edge["id"], previous)
+            self._edges[edge["id"]] = edge
+            for node_id in (edge["source"], edge["target"]):
+                self._incident.setdefault(node_id, {})[edge["id"]] = None
+            stale_edges[edge["id"]] = None
+
+        changed_edges = []
+        for edge_id in stale_edges:
+            if self._rescore_edge(edge_id):
+                changed_edges.append(edge_id)
+                removed_edges.discard(edge_id)
+            elif self._drop_edge_result(edge_id):
+                removed_edges.add(edge_id)
+
+        self.version += 1
+        return {
+            "nodes": [self._nodes[node_id]["analysis"] for node_id in dict.fromkeys(changed_nodes)],
+            "edges": [self._edge_results[edge_id] for edge_id in changed_edges],
+            "removed_nodes": removed_nodes,
+            "removed_edges": sorted(removed_edges),
+            "metrics": self.metrics()
+        }
+
+    def _unlink(self, edge_id: str, edge: Dict) -> None:
+        for node_id in (edge["source"], edge["target"]):
+            incident = self._incident.get(node_id)
+            if incident is not None:
+                incident.pop(edge_id, None)
+                if not incident:
+                    del self._incident[node_id]
+
+    def _drop_edge_result(self, edge_id: str) -> bool:
+        result = self._edge_results.pop(edge_id, None)
+        if result is None:
+            return False
+        self._edge_metrics.remove(result["sentiment"])
+        return True
+
+    def _rescore_edge(self, edge_id: str) -> bool:
+        """Recompute an edge from its nodes; False if the edge or one of its nodes is gone."""
+        edge = self._edges.get(edge_id)
+        if edge is None:
+            return False
+        source, target = self._nodes.get(edge["source"]), self._nodes.get(edge["target"])
+        if source is None or target is None:
+            return False
+        self._drop_edge_result(edge_id)
+        result = build_edge_analysis(edge, [source["analysis"], target["analysis"]])
+        self._edge_results[edge_id] = result
+        self._edge_metrics.add(result["sentiment"])
+        return True
+
+    def metrics(self) -> Dict:
+        """
+        Graph metrics from the running aggregates.
+
+        Returns:
+            Dict: Same shape as compute_graph_metrics().
+        """
+        return {
+            "average_node_sentiment": self._node_metrics.average,
+            "average_edge_sentiment": self._edge_metrics.average,
+            "sentiment_distribution": {
+                "positive_nodes": self._node_metrics.positive,
+                "negative_nodes": self._node_metrics.negative,
+                "positive_edges": self._edge_metrics.positive,
+                "negative_edges": self._edge_metrics.negative
+            }
+        }
+
+    def snapshot(self) -> Dict:
+        """
+        Full analysis of the current graph.
+
+        Returns:
+            Dict: Node and edge results in insertion order, and metrics, as
+                analyze_graph() returns them.
+        """
+        return {
+            "nodes": [node["analysis"] for node in self._nodes.values()],
+            "edges": [self._edge_results[edge_id] for edge_id in self._edges if edge_id in self._edge_results],
+            "metrics": self.metrics()
+        }
+
+
+class GraphSessionStore:
+    """
+    Graph sessions of this process, evicted when idle or over capacity.
+
+    Sessions live in the memory of one API process: with several workers,
+    requests of a session must reach the worker that created it.
+    """
+
+    def __init__(
+        self,
+        max_sessions: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize an empty store.
+
+        Args:
+            max_sessions (Optional[int]): Sessions kept before the least recently
+                used one is evicted. Defaults to settings.graph_session_max_sessions.
+            ttl_seconds (Optional[float]): Idle time after which a session expires;
+                0 disables expiry. Defaults to settings.graph_session_ttl_seconds.
+            clock (Callable[[], float]): Monotonic time source.
+        """
+        self.max_sessions = max(1, max_sessions or settings.graph_session_max_sessions)
+        self.ttl_seconds = settings.graph_session_ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._clock = clock
+        # Session id -> (last use, session), least recently used first
+        self._sessions: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+
+    def create(self) -> GraphSession:
+        """Create an empty session, evicting the least recently used one if full."""
+        session = GraphSession(uuid.uuid4().hex)
+        with self._lock:
+            self._expire()
+            while len(self._sessions) >= self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evictions += 1
+            self._sessions[session.session_id] = (self._clock(), session)
+        return session
+
+    def get(self, session_id: str) -> GraphSession:
+        """
+        Look up a session and mark it as used.
+
+        Raises:
+            SessionNotFoundError: If the session does not exist or has expired.
+        """
+        with self._lock:
+            self._expire()
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                raise SessionNotFoundError(session_id)
+            self._sessions[session_id] = (self._clock(), entry[1])
+            self._sessions.move_to_end(session_id)
+            return entry[1]
+
+    def delete(self, session_id: str) -> bool:
+        """Remove a session; False if it did not exist."""
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def _expire(self) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        deadline = self._clock() - self.ttl_seconds
+        # Oldest first: stop at the first session used after the deadline
+        while self._sessions:
+            session_id, (last_used, _) = next(iter(self._sessions.items()))
+            if last_used > deadline:
+                break
+            del self._sessions[session_id]
+            self.expirations += 1
+
+    def stats(self) -> Dict:
+        """
+        Report the sessions held.
+
+        Returns:
+            Dict: Session count, total nodes and edges, evictions and expirations.
+        """
+        with self._lock:
+            sessions = [session for _, session in self._sessions.values()]
+        return {
+            "sessions": len(sessions),
+            "max_sessions": self.max_sessions,
+            "nodes": sum(session.node_count for session in sessions),
+            "edges": sum(session.edge_count for session in sessions),
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
+
+
+graph_sessions = GraphSessionStore()
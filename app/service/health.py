@@ -0,0 +1,150 @@
+from typing import Any, Awaitable, Callable, Dict, Optional
+from datetime import datetime
+import asyncio
+import logging
+import time
+from app.core.config import settings
+from app.service.executor import QueueFullError, inference_executor
+
+logger = logging.getLogger(__name__)
+
+SelfTest = Callable[[], Awaitable[Any]]
+
+SELF_TEST_TEXT = "Test health check"
+
+
+class HealthMonitor:
+    """
+    Run the inference self-test on a background interval.
+
+    Probes read the latest outcome from memory instead of running inference
+    themselves, so probing costs nothing however often it happens.
+    """
+
+    def __init__(
+        self,
+        self_test: SelfTest,
+        interval_seconds: Optional[float] = None,
+        timeout_seconds: Optional[float] = None
+    ):
+        """
+        Initialize the monitor; the background task is created by start().
+
+        Args:
+            self_test (SelfTest): Coroutine function running one inference check.
+            interval_seconds (Optional[float]): Time between two checks. Defaults
+                to settings.health_check_interval_seconds.
+            timeout_seconds (Optional[float]): Time after which a check counts as
+                failed. Defaults to settings.health_check_timeout_seconds.
+        """
+        self._self_test = self_test
+        self.interval_seconds = (
+            settings.health_check_interval_seconds if interval_seconds is None else interval_seconds
+        )
+        self.timeout_seconds = (
+            settings.health_check_timeout_seconds if timeout_seconds is None else timeout_seconds
+        )
+        self._task: Optional[asyncio.Task] = None
+        self.last_result: Any = None
+        self.last_error: Optional[str] = None
+        self.last_checked_at: Optional[datetime] = None
+        self.last_duration_ms: Optional[float] = None
+        self.checks = 0
+        self.consecutive_failures = 0
+        self.skipped = 0
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the background task is alive."""
+        return self._task is not None and not self._task.done()
+
+    @property
+    def healthy(self) -> Optional[bool]:
+        """Outcome of the latest check, or None before the first one."""
+        if self.last_checked_at is None:
+            return None
+        return self.last_error is None
+
+    async def start(self) -> None:
+        """Start the periodic self-test on the running event loop."""
+        if self.is_running:
+            return
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Health monitor started (interval={self.interval_seconds}s)")
+
+    async def stop(self) -> None:
+        """Stop the periodic self-test."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("Health monitor stopped")
+
+    async def _run(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(self.interval_seconds)
+
+    async def check(self) -> bool:
+        """
+        Run the self-test once and record its outcome.
+
+        A self-test rejected because the inference queue is full is skipped:
+        the service is busy, not broken, so the previous outcome is kept.
+
+        Returns:
+            bool: Whether the self-test succeeded (or, when skipped, whether the
+                previous one did not fail).
+        """
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(self._self_test(), timeout=self.timeout_seconds)
+        except asyncio.CancelledError:
+            raise
+        except QueueFullError:
+            self.skipped += 1
+            logger.warning("Health self-test skipped: inference queue is full")
+            return self.healthy is not False
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            self.last_error = error
+            self.consecutive_failures += 1
+            logger.error(f"Health self-test failed: {error}")
+        else:
+            self.last_result = result
+            self.last_error = None
+            self.consecutive_failures = 0
+        self.last_duration_ms = round(1000 * (time.perf_counter() - start), 3)
+        self.last_checked_at = datetime.now()
+        self.checks += 1
+        return self.last_error is None
+
+    def status(self) -> Dict:
+        """
+        Report the latest self-test.
+
+        Returns:
+            Dict: Outcome, result, error, timestamp, duration, failure and skip counts.
+        """
+        return {
+            "healthy": self.healthy,
+            "result": self.last_result,
+            "error": self.last_error,
+            "checked_at": self.last_checked_at.isoformat() if self.last_checked_at else None,
+            "duration_ms": self.last_duration_ms,
+            "checks": self.checks,
+            "consecutive_failures": self.consecutive_failures,
+            "skipped": self.skipped,
+            "interval_seconds": self.interval_seconds
+        }
+
+
+async def _run_self_test() -> Any:
+    return await inference_executor.run_analyzer("self_test", SELF_TEST_TEXT)
+
+
+health_monitor = HealthMonitor(_run_self_test)
@@ -0,0 +1,119 @@
+from typing import TYPE_CHECKING, Callable, Dict, Optional
+from datetime import datetime
+import gc
+import logging
+import threading
+import time
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from app.service.pipeline_sentiment import SentimentAnalyzer
+
+logger = logging.getLogger(__name__)
+
+
+class ModelNotReadyError(RuntimeError):
+    """Raised when the analyzer is requested before the model has been loaded."""
+
+
+class ModelRegistry:
+    """Own the process-wide SentimentAnalyzer and its lifecycle state."""
+
+    def __init__(self, factory: Optional[Callable[[], "SentimentAnalyzer"]] = None):
+        """
+        Initialize an empty registry.
+
+        Args:
+            factory (Optional[Callable[[], SentimentAnalyzer]]): Builds the analyzer
+                on load. Defaults to SentimentAnalyzer, imported on first load.
+        """
+        self._factory = factory
+        self._analyzer: Optional["SentimentAnalyzer"] = None
+        self._lock = threading.Lock()
+        self.load_time_seconds: Optional[float] = None
+        self.loaded_at: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether the analyzer is loaded and can serve requests."""
+        return self._analyzer is not None
+
+    def load(self) -> "SentimentAnalyzer":
+        """
+        Load the analyzer once for this process.
+
+        Calling load() again while the model is loaded returns the same instance.
+
+        Returns:
+            SentimentAnalyzer: The shared analyzer.
+        """
+        with self._lock:
+            if self._analyzer is not None:
+                return self._analyzer
+
+            logger.info(f"Loading model {settings.model_name}...")
+            start = time.perf_counter()
+            try:
+                factory = self._factory
+                if factory is None:
+                    from app.service.pipeline_sentiment import SentimentAnalyzer
+                    factory = SentimentAnalyzer
+                analyzer = factory()
+            except Exception as e:
+                self.last_error = str(e)
+                logger.error(f"Error loading model into registry: {str(e)}")
+                raise
+
+            self.load_time_seconds = round(time.perf_counter() - start, 4)
+            self.loaded_at = datetime.now()
+            self.last_error = None
+            self._analyzer = analyzer
+            logger.info(f"Model loaded in {self.load_time_seconds}s")
+            return analyzer
+
+    def get_analyzer(self) -> "SentimentAnalyzer":
+        """
+        Return the shared analyzer.
+
+        Raises:
+            ModelNotReadyError: If load() has not completed successfully.
+        """
+        analyzer = self._analyzer
+        if analyzer is None:
+            raise ModelNotReadyError("Model is not loaded")
+        return analyzer
+
+    def release(self) -> None:
+        """Drop the analyzer so the model memory can be reclaimed."""
+        with self._lock:
+            analyzer = self._analyzer
+            if analyzer is None:
+                return
+            self._analyzer = None
+            self.loaded_at = None
+            self.load_time_seconds = None
+        close = getattr(analyzer, "close", None)
+        if close is not None:
+            close()
+        del analyzer
+        gc.collect()
+        logger.info("Model released")
+
+    def status(self) -> Dict:
+        """
+        Describe the registry state.
+
+        Returns:
+            Dict: Readiness, model name, load time and last load error.
+        """
+        return {
+            "ready": self.is_ready,
+            "model": settings.model_name,
+            "load_time_seconds": self.load_time_seconds,
+            "loaded_at": self.loaded_at.isoformat() if self.loaded_at else None,
+            "last_error": self.last_error
+        }
+
+
+model_registry = ModelRegistry()
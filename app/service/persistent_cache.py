@@ -0,0 +1,362 @@
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Union
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from app.core.config import settings
+from app.service.cache import model_identity
+
+if TYPE_CHECKING:
+    from app.service.pipeline_sentiment import SentimentAnalyzer
+
+logger = logging.getLogger(__name__)
+
+SentimentResult = Dict[str, Union[str, float]]
+
+# SQLite limits the number of bound parameters per statement
+_SQL_CHUNK_SIZE = 500
+
+
+class PersistentSentimentCache:
+    """SQLite-backed sentiment store shared by every worker process on the host."""
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: Optional[int] = None,
+        compaction_check_interval: int = 1000
+    ):
+        """
+        Open (or create) the store.
+
+        Args:
+            path (str): Database file path.
+            max_bytes (Optional[int]): File size above which compaction drops the
+                oldest entries. Defaults to settings.persistent_cache_max_mb.
+            compaction_check_interval (int): Writes between two file size checks.
+                Above max_bytes, compaction runs on a background thread.
+        """
+        self.path = path
+        self.max_bytes = max_bytes or int(settings.persistent_cache_max_mb * 1024 * 1024)
+        self.compaction_check_interval = compaction_check_interval
+        self._local = threading.local()
+        self._writes_since_check = 0
+        self._compaction_lock = threading.Lock()
+        self._compaction_thread: Optional[threading.Thread] = None
+        self.hits = 0
+        self.misses = 0
+        # Last measured entry count and file size, reported by stats(refresh=False)
+        self._entries: Optional[int] = None
+        self._size_bytes: Optional[int] = None
+        self._measured_at: Optional[float] = None
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS sentiments ("
+                " key TEXT PRIMARY KEY,"
+                " model TEXT NOT NULL,"
+                " label TEXT NOT NULL,"
+                " score REAL NOT NULL,"
+                " created_at REAL NOT NULL"
+                ") WITHOUT ROWID"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS sentiments_created_at ON sentiments (created_at)"
+            )
+        self._measure()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5.0)
+            # WAL lets every worker read while one of them writes
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def get_many(self, keys: List[str]) -> Dict[str, SentimentResult]:
+        """
+        Look up several keys at once.
+
+        Args:
+            keys (List[str]): Keys built with InferenceCache.make_key().
+
+        Returns:
+            Dict[str, SentimentResult]: Results for the keys found.
+        """
+        found: Dict[str, SentimentResult] = {}
+        if not keys:
+            return found
+        try:
+            connection = self._connection()
+            for start in range(0, len(keys), _SQL_CHUNK_SIZE):
+                chunk = keys[start:start + _SQL_CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                rows = connection.execute(
+                    f"SELECT key, label, score FROM sentiments WHERE key IN ({placeholders})",
+                    chunk
+                )
+                for key, label, score in rows:
+                    found[key] = {"label": label, "score": score}
+        except sqlite3.Error as e:
+            # The store is an optimization: fall back to inference
+            logger.error(f"Error reading persistent cache: {str(e)}")
+            return {}
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def set_many(self, results: Dict[str, SentimentResult], model: Optional[str] = None) -> None:
+        """
+        Store several results.
+
+        Args:
+            results (Dict[str, SentimentResult]): Results by key.
+            model (Optional[str]): Identity of the model that produced them, as
+                from model_identity(). Defaults to the configured model, backend and mode.
+        """
+        if not results:
+            return
+        model = model or model_identity()
+        now = time.time()
+        try:
+            with self._connection() as connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO sentiments (key, model, label, score, created_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (key, model, result["label"], result["score"], now)
+                        for key, result in results.items()
+                    ]
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Error writing persistent cache: {str(e)}")
+            return
+
+        self._writes_since_check += len(results)
+        if self._writes_since_check >= self.compaction_check_interval:
+            self._writes_since_check = 0
+            # Only the size check runs on the inference worker: compaction rewrites the file
+            self._size_bytes = self.size_bytes()
+            if self._size_bytes > self.max_bytes:
+                self.compact_in_background()
+
+    def compact_in_background(self) -> Optional[threading.Thread]:
+        """
+        Run compact() on a daemon thread, unless a compaction is already running.
+
+        Returns:
+            Optional[threading.Thread]: The compaction thread, None if one was running.
+        """
+        with self._compaction_lock:
+            if self._compaction_thread is not None and self._compaction_thread.is_alive():
+                return None
+            self._compaction_thread = threading.Thread(
+                target=self._compact_and_close, name="persistent-cache-compaction", daemon=True
+            )
+            self._compaction_thread.start()
+            return self._compaction_thread
+
+    def _compact_and_close(self) -> None:
+        try:
+            self.compact()
+        finally:
+            # The connection belongs to the compaction thread
+            self.close()
+
+    def size_bytes(self) -> int:
+        """Size of the database file and its write-ahead log."""
+        return sum(
+            os.path.getsize(path)
+            for path in (self.path, f"{self.path}-wal")
+            if os.path.exists(path)
+        )
+
+    def count(self) -> int:
+        """Number of stored results."""
+        return self._connection().execute("SELECT COUNT(*) FROM sentiments").fetchone()[0]
+
+    def compact(self, keep_ratio: float = 0.75) -> int:
+        """
+        Drop the oldest entries when the file is larger than max_bytes.
+
+        Args:
+            keep_ratio (float): Fraction of entries kept when compacting.
+
+        Returns:
+            int: Number of entries removed.
+        """
+        if self.size_bytes() <= self.max_bytes:
+            return 0
+        try:
+            connection = self._connection()
+            total = self.count()
+            to_remove = total - int(total * keep_ratio)
+            with connection:
+                connection.execute(
+                    "DELETE FROM sentiments WHERE key IN ("
+                    " SELECT key FROM sentiments ORDER BY created_at LIMIT ?"
+                    ")",
+                    (to_remove,)
+                )
+            connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            connection.execute("VACUUM")
+        except sqlite3.Error as e:
+            # Another worker may hold the lock; it will compact instead
+            logger.warning(f"Persistent cache compaction skipped: {str(e)}")
+            return 0
+        self._measure()
+        logger.info(f"Persistent cache compacted: {to_remove} entries removed")
+        return to_remove
+
+    def close(self) -> None:
+        """Close this thread's connection."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def _measure(self) -> None:
+        """Record the entry count and file size reported by stats(refresh=False)."""
+        try:
+            self._entries = self.count()
+        except sqlite3.Error as e:
+            logger.warning(f"Persistent cache count failed: {str(e)}")
+        self._size_bytes = self.size_bytes()
+        self._measured_at = time.time()
+
+    def stats(self, refresh: bool = True) -> Dict:
+        """
+        Report store counters.
+
+        Args:
+            refresh (bool): Count the entries and stat the file now. Without it,
+                the values measured at startup, after the last compaction and at
+                the last write size check are reported, without touching the
+                database (for health probes served on the event loop).
+
+        Returns:
+            Dict: Path, entry count, file size, time of the entry count, hits and misses.
+        """
+        if refresh:
+            self._measure()
+        return {
+            "path": self.path,
+            "entries": self._entries,
+            "size_bytes": self._size_bytes,
+            "max_bytes": self.max_bytes,
+            "measured_at": self._measured_at,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+def iter_jsonl_texts(path: str, fields: Iterable[str] = ("text",)) -> Iterator[str]:
+    """
+    Yield the non-empty string values of the given fields from a JSONL file.
+
+    Args:
+        path (str): JSONL file, one JSON object per line.
+        fields (Iterable[str]): Fields to read from each object.
+
+    Yields:
+        str: Text values, in file order.
+    """
+    fields = list(fields)
+    with open(path, encoding="utf-8") as handle:
+        for line_number, line in enumerate(handle, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping invalid JSON on line {line_number} of {path}")
+                continue
+            for field in fields:
+                value = record.get(field)
+                if isinstance(value, str) and value.strip():
+                    yield value
+
+
+def prefill_from_jsonl(
+    analyzer: "SentimentAnalyzer",
+    path: str,
+    fields: Iterable[str] = ("text",),
+    batch_size: Optional[int] = None
+) -> int:
+    """
+    Score every text of a JSONL file so the analyzer's persistent store holds it.
+
+    Args:
+        analyzer (SentimentAnalyzer): Analyzer with a persistent cache configured.
+        path (str): JSONL file, one JSON object per line.
+        fields (Iterable[str]): Fields holding the texts to score.
+        batch_size (Optional[int]): Texts per analyzer call. Defaults to
+            settings.inference_batch_size.
+
+    Returns:
+        int: Number of texts processed.
+    """
+    if analyzer.persistent_cache is None:
+        raise ValueError("The analyzer has no persistent cache configured")
+
+    batch_size = max(1, batch_size or settings.inference_batch_size)
+    processed = 0
+    batch: List[str] = []
+    for text in iter_jsonl_texts(path, fields):
+        batch.append(text)
+        if len(batch) >= batch_size:
+            analyzer.analyze_texts(batch)
+            processed += len(batch)
+            batch = []
+    if batch:
+        analyzer.analyze_texts(batch)
+        processed += len(batch)
+    logger.info(f"Prefilled persistent cache with {processed} texts from {path}")
+    return processed
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point: prefill or compact the persistent cache."""
+    parser = argparse.ArgumentParser(description="Manage the persistent sentiment cache")
+    parser.add_argument("--db", default=settings.persistent_cache_path, help="Database file path")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    prefill = subparsers.add_parser("prefill", help="Score the texts of a JSONL file")
+    prefill.add_argument("input", help="JSONL file")
+    prefill.add_argument(
+        "--field", action="append", dest="fields",
+        help="Field holding a text to score (repeatable, default: text)"
+    )
+    prefill.add_argument("--batch-size", type=int, default=None)
+
+    subparsers.add_parser("compact", help="Apply the size-based compaction policy")
+    subparsers.add_parser("stats", help="Print store statistics")
+
+    args = parser.parse_args(argv)
+    if not args.db:
+        parser.error("--db is required when PERSISTENT_CACHE_PATH is not set")
+
+    if args.command == "prefill":
+        from app.service.pipeline_sentiment import SentimentAnalyzer
+        settings.persistent_cache_path = args.db
+        analyzer = SentimentAnalyzer()
+        prefill_from_jsonl(analyzer, args.input, args.fields or ["text"], args.batch_size)
+        print(json.dumps(analyzer.persistent_cache.stats()))
+    elif args.command == "compact":
+        cache = PersistentSentimentCache(args.db)
+        print(json.dumps({"removed": cache.compact(), **cache.stats()}))
+    else:
+        print(json.dumps(PersistentSentimentCache(args.db).stats()))
+
+
+if __name__ == "__main__":
+    main()
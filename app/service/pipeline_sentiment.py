@@ -1,35 +1,304 @@
-from typing import Dict, List, Union
-from transformers import pipeline
-from functools import lru_cache
+from typing import Dict, List, Optional, Union
 import numpy as np
 import logging
 from app.core.config import settings
-from app.utils.text_cleaner import preprocess_text
+from app.core.metrics import batch_sizes, cache_lookups, stage_latency
+from app.service.backends import InferenceBackend, load_backend
+from app.service.bucketing import PaddingStats, plan_length_buckets
+from app.service.cache import InferenceCache, model_identity
+from app.service.persistent_cache import PersistentSentimentCache
+from app.service.tokenization import TokenizationStage
+from app.service.windowing import aggregate_windows, plan_windows
+from app.utils.text_cleaner import get_text_cleaner, preprocess_batch
 
 logger = logging.getLogger(__name__)
 
+
+# Scores are rounded to 4 decimals, so score sums are kept in integer
+# ten-thousandths: they are exact, whatever the summation order.
+SCORE_UNITS = 10000
+
+
+def mean_score(score_units: int, count: int) -> float:
+    """
+    Average of count scores from their sum in SCORE_UNITS, rounded to 4 decimals.
+
+    Args:
+        score_units (int): Sum of the scores, in ten-thousandths.
+        count (int): Number of scores.
+
+    Returns:
+        float: The average score, 0.0 without scores.
+    """
+    return round(score_units / SCORE_UNITS / count, 4) if count else 0.0
+
+
+def compute_graph_metrics(node_analyses: List[Dict], edge_analyses: List[Dict]) -> Dict:
+    """
+    Compute global graph metrics in a single pass over node and edge results.
+
+    Args:
+        node_analyses (List[Dict]): Node results with a 'sentiment' entry.
+        edge_analyses (List[Dict]): Edge results with a 'sentiment' entry.
+
+    Returns:
+        Dict: Average node/edge scores and the sentiment distribution.
+    """
+    def summarize(analyses: List[Dict]):
+        total, positive, negative = 0, 0, 0
+        for analysis in analyses:
+            sentiment = analysis["sentiment"]
+            total += round(sentiment["score"] * SCORE_UNITS)
+            if sentiment["label"] == "positive":
+                positive += 1
+            elif sentiment["label"] == "negative":
+                negative += 1
+        return mean_score(total, len(analyses)), positive, negative
+
+    node_average, positive_nodes, negative_nodes = summarize(node_analyses)
+    edge_average, positive_edges, negative_edges = summarize(edge_analyses)
+    return {
+        "average_node_sentiment": node_average,
+        "average_edge_sentiment": edge_average,
+        "sentiment_distribution": {
+            "positive_nodes": positive_nodes,
+            "negative_nodes": negative_nodes,
+            "positive_edges": positive_edges,
+            "negative_edges": negative_edges
+        }
+    }
+
+
+def mean_units(units: Union[int, np.ndarray], count: int) -> Union[int, np.ndarray]:
+    """
+    Mean of count scores in SCORE_UNITS, from their sum in SCORE_UNITS.
+
+    Integer arithmetic only: the mean of two scores is exact or an exact half
+    unit, and halves are rounded up. Works on a scalar sum or an array of sums.
+
+    Args:
+        units (Union[int, np.ndarray]): Sum of the scores, in ten-thousandths.
+        count (int): Number of scores (at least 1).
+
+    Returns:
+        Union[int, np.ndarray]: The rounded mean, in ten-thousandths.
+    """
+    return (2 * units + count) // (2 * count)
+
+
+def build_edge_analysis(edge_data: Dict, node_analyses: List[Dict]) -> Dict:
+    """
+    Aggregate already computed node results into an edge result.
+
+    The edge score is the mean of the node scores, computed in SCORE_UNITS
+    (see mean_units()); the edge is positive when that mean is above 0.5.
+
+    Args:
+        edge_data (Dict): Edge information (id, metadata, etc.)
+        node_analyses (List[Dict]): Results of the connected nodes.
+
+    Returns:
+        Dict: Sentiment result for the edge with aggregated scores.
+    """
+    units = sum(round(analysis["sentiment"]["score"] * SCORE_UNITS) for analysis in node_analyses)
+    count = len(node_analyses)
+
+    # Assign label based on threshold (exact: mean > 0.5)
+    label = "positive" if 2 * units > count * SCORE_UNITS else "negative"
+
+    return {
+        "edge_id": edge_data.get("id"),
+        "sentiment": {
+            "label": label,
+            "score": mean_units(units, count) / SCORE_UNITS
+        },
+        "connected_nodes": [analysis["node_id"] for analysis in node_analyses],
+        "metadata": edge_data.get("metadata", {})
+    }
+
+
+class GraphArrays:
+    """
+    Compact form of a scored graph: node arrays and edges as node index arrays.
+
+    Node scores and labels are arrays in node order, and each edge whose two
+    nodes exist is a pair of node indices. Edge scores and labels and the
+    graph metrics are computed with whole-array operations; result dicts are
+    only built by node_analyses() and edge_analyses(), for the response.
+    Results are the same as build_edge_analysis() and compute_graph_metrics().
+    """
+
+    def __init__(self, nodes: List[Dict], edges: List[Dict], sentiments: Dict[str, Dict]):
+        """
+        Index a graph and compute its edge scores.
+
+        Args:
+            nodes (List[Dict]): Graph nodes (id, text, metadata).
+            edges (List[Dict]): Graph edges (id, source, target, metadata).
+            sentiments (Dict[str, Dict]): Result of each distinct node text.
+        """
+        self.nodes = nodes
+        self.edges = edges
+        self.sentiments = list(sentiments.values())
+        rows = {text: row for row, text in enumerate(sentiments)}
+        # Row of each node's sentiment in self.sentiments
+        self.node_rows = np.fromiter(
+            (rows[node.get("text", "")] for node in nodes), dtype=np.intp, count=len(nodes)
+        )
+        labels = [sentiment["label"] for sentiment in self.sentiments]
+        self.node_scores = np.array(
+            [sentiment["score"] for sentiment in self.sentiments], dtype=np.float64
+        )[self.node_rows]
+        self.node_units = np.rint(self.node_scores * SCORE_UNITS).astype(np.int64)
+        self.node_positive = np.array([label == "positive" for label in labels], dtype=bool)[self.node_rows]
+        self.node_negative = np.array([label == "negative" for label in labels], dtype=bool)[self.node_rows]
+
+        # Node index of each edge end, -1 for a missing node; the last node wins for a duplicate id
+        index = {node.get("id"): position for position, node in enumerate(nodes)}
+        sources = np.fromiter(
+            (index.get(edge.get("source"), -1) for edge in edges), dtype=np.intp, count=len(edges)
+        )
+        targets = np.fromiter(
+            (index.get(edge.get("target"), -1) for edge in edges), dtype=np.intp, count=len(edges)
+        )
+        # Edges whose two nodes exist, by position in edges
+        self.edge_index = np.flatnonzero((sources >= 0) & (targets >= 0))
+        self.edge_sources = sources[self.edge_index]
+        self.edge_targets = targets[self.edge_index]
+
+        # Mean of the two node scores in SCORE_UNITS, as build_edge_analysis() computes it
+        sums = self.node_units[self.edge_sources] + self.node_units[self.edge_targets]
+        self.edge_positive = sums > SCORE_UNITS
+        self.edge_units = mean_units(sums, 2)
+        self.edge_scores = self.edge_units / SCORE_UNITS
+
+    def node_analyses(self) -> List[Dict]:
+        """Node results, in node order."""
+        return [
+            {
+                "node_id": node.get("id"),
+                "sentiment": dict(self.sentiments[row]),
+                "metadata": node.get("metadata", {})
+            }
+            for node, row in zip(self.nodes, self.node_rows.tolist())
+        ]
+
+    def edge_analyses(self) -> List[Dict]:
+        """Results of the edges whose two nodes exist, in edge order."""
+        node_ids = [node.get("id") for node in self.nodes]
+        return [
+            {
+                "edge_id": edge.get("id"),
+                "sentiment": {"label": "positive" if positive else "negative", "score": score},
+                "connected_nodes": [node_ids[source], node_ids[target]],
+                "metadata": edge.get("metadata", {})
+            }
+            for edge, source, target, score, positive in zip(
+                [self.edges[position] for position in self.edge_index.tolist()],
+                self.edge_sources.tolist(),
+                self.edge_targets.tolist(),
+                self.edge_scores.tolist(),
+                self.edge_positive.tolist()
+            )
+        ]
+
+    def metrics(self) -> Dict:
+        """
+        Compute global graph metrics from the arrays.
+
+        Returns:
+            Dict: Same as compute_graph_metrics() on the node and edge results.
+        """
+        node_units, edge_units = self.node_units, self.edge_units
+        positive_edges = int(np.count_nonzero(self.edge_positive))
+        return {
+            "average_node_sentiment": mean_score(int(node_units.sum()), len(node_units)),
+            "average_edge_sentiment": mean_score(int(edge_units.sum()), len(edge_units)),
+            "sentiment_distribution": {
+                "positive_nodes": int(np.count_nonzero(self.node_positive)),
+                "negative_nodes": int(np.count_nonzero(self.node_negative)),
+                "positive_edges": positive_edges,
+                "negative_edges": len(edge_units) - positive_edges
+            }
+        }
+
+
 class SentimentAnalyzer:
     """Perform sentiment analysis on text, nodes, edges, and entire graphs."""
 
     def __init__(self):
         """Initialize the sentiment analyzer with the configured model."""
-        self.model = self._load_model()
+        self.backend = self._load_model()
+        self.tokenization = TokenizationStage(self.backend.tokenize)
+        # Whole-text token ids for long-text mode; same tokenizer, so same lock, and
+        # not cached so long documents do not evict the short texts
+        self.window_tokenization = TokenizationStage(
+            self.backend.tokenize_untruncated,
+            max_cached_tokens=0,
+            tokenizer_lock=self.tokenization.tokenizer_lock
+        )
+        self.padding_stats = PaddingStats()
+        # Cached results are only shared by analyzers with the same model, backend and mode
+        self.model_identity = model_identity(
+            backend=getattr(self.backend, "name", None), mode=getattr(self.backend, "mode", None)
+        )
+        self.cache = InferenceCache() if settings.cache_enabled else None
+        self.persistent_cache = (
+            PersistentSentimentCache(settings.persistent_cache_path)
+            if settings.persistent_cache_path else None
+        )
         logger.info("SentimentAnalyzer successfully initialized")
 
-    @lru_cache()
-    def _load_model(self):
+    def close(self) -> None:
+        """Release the analyzer's threads and connections."""
+        self.tokenization.close()
+        self.window_tokenization.close()
+        if self.persistent_cache is not None:
+            self.persistent_cache.close()
+
+    def warmup(self) -> None:
+        """
+        Load the text cleaner and run one forward pass.
+
+        Without it, the first request pays for loading spaCy and NLTK and for
+        the backend's first-call overhead. Caches are bypassed so no entry is
+        stored for the warmup text.
+        """
+        get_text_cleaner()
+        self.backend.predict_ids(self.tokenization.encode_uncached(["warmup"]))
+
+    def self_test(self, text: str) -> Dict[str, Union[str, float]]:
+        """
+        Preprocess and score one text, bypassing the result and token caches.
+
+        Used by the periodic health check so that it exercises the model
+        itself rather than returning a cached result. It runs alongside
+        requests, so it tokenizes under the shared tokenizer lock.
+
+        Args:
+            text (str): Input text.
+
+        Returns:
+            Dict[str, Union[str, float]]: Sentiment result with label and score.
+        """
+        cleaned = list(preprocess_batch([text]))
+        result = self.backend.predict_ids(self.tokenization.encode_uncached(cleaned))[0]
+        return {"label": result["label"].lower(), "score": round(result["score"], 4)}
+
+    def _load_model(self) -> InferenceBackend:
         """
-        Load and cache the sentiment analysis model.
+        Load the sentiment analysis model on the configured backend.
+
+        The model is loaded once per process by the model registry
+        (see app.service.model_registry), which owns the analyzer instance.
 
         Returns:
-            HuggingFace pipeline object for sentiment analysis.
+            InferenceBackend: Backend selected by settings.inference_backend.
         """
         try:
-            return pipeline(
-                "sentiment-analysis", 
-                model=settings.model_name, 
-                token=settings.api_key  # ⚠️ Not a standard HuggingFace param, check config
-            )
+            backend = load_backend()
+            logger.info(f"Model {settings.model_name} loaded on the {backend.name} backend")
+            return backend
         except Exception as e:
             logger.error(f"Error loading model: {str(e)}")
             raise
@@ -45,16 +314,218 @@ class SentimentAnalyzer:
             Dict[str, Union[str, float]]: Sentiment result with label and score.
         """
         try:
-            cleaned_text = preprocess_text(text)  # Clean input before inference
-            result = self.model(cleaned_text)[0]  # HuggingFace returns a list, take first item
-            return {
-                "label": result["label"].lower(),   # Normalize label to lowercase
-                "score": round(result["score"], 4)  # Round score to 4 decimals
-            }
+            return self.analyze_texts([text])[0]
         except Exception as e:
             logger.error(f"Error analyzing text: {str(e)}")
             raise
 
+    def analyze_texts(self, texts: List[str]) -> List[Dict[str, Union[str, float]]]:
+        """
+        Analyze sentiment of several texts with batched pipeline calls.
+
+        Inputs are cleaned up front. Results found in the in-memory cache, then in
+        the persistent store, are reused; each distinct remaining text is scored once.
+
+        Args:
+            texts (List[str]): Input texts.
+
+        Returns:
+            List[Dict[str, Union[str, float]]]: One result per input, in input order.
+        """
+        if not texts:
+            return []
+        try:
+            cleaned_texts = list(preprocess_batch(texts))  # Clean inputs before inference
+            results: List[Dict] = [None] * len(cleaned_texts)
+            use_cache = self.cache is not None or self.persistent_cache is not None
+
+            # Group cache misses by cleaned text so duplicates are scored once
+            pending: Dict[str, List[int]] = {}
+            keys: Dict[str, str] = {}
+            for index, cleaned_text in enumerate(cleaned_texts):
+                if cleaned_text in pending:
+                    pending[cleaned_text].append(index)
+                    continue
+                if use_cache:
+                    keys[cleaned_text] = InferenceCache.make_key(cleaned_text, self.model_identity)
+                if self.cache is not None:
+                    cached = self.cache.get(keys[cleaned_text])
+                    cache_lookups.inc(level="memory", result="miss" if cached is None else "hit")
+                    if cached is not None:
+                        results[index] = cached
+                        continue
+                pending[cleaned_text] = [index]
+
+            # Second level: results shared by every worker on the host
+            if self.persistent_cache is not None and pending:
+                stored = self.persistent_cache.get_many([keys[text] for text in pending])
+                cache_lookups.inc(len(stored), level="persistent", result="hit")
+                cache_lookups.inc(len(pending) - len(stored), level="persistent", result="miss")
+                for cleaned_text in [text for text in pending if keys[text] in stored]:
+                    result = stored[keys[cleaned_text]]
+                    if self.cache is not None:
+                        self.cache.set(keys[cleaned_text], result)
+                    for index in pending.pop(cleaned_text):
+                        results[index] = dict(result)
+
+            to_score = list(pending)
+            scored = self._predict(to_score)
+            for cleaned_text, result in zip(to_score, scored):
+                if self.cache is not None:
+                    self.cache.set(keys[cleaned_text], result)
+                for index in pending[cleaned_text]:
+                    results[index] = dict(result)
+            if self.persistent_cache is not None:
+                self.persistent_cache.set_many({
+                    keys[cleaned_text]: result for cleaned_text, result in zip(to_score, scored)
+                }, model=self.model_identity)
+            return results
+        except Exception as e:
+            logger.error(f"Error analyzing texts: {str(e)}")
+            raise
+
+    def analyze_long_text(self, text: str, aggregation: Optional[str] = None) -> Dict[str, Union[str, float, int]]:
+        """
+        Analyze sentiment of a text longer than the model's token limit.
+
+        Args:
+            text (str): Input text, of any length.
+            aggregation (Optional[str]): Window aggregation strategy. Defaults to
+                settings.long_text_aggregation.
+
+        Returns:
+            Dict[str, Union[str, float, int]]: Label, score, number of chunks and
+                aggregation strategy.
+        """
+        return self.analyze_long_texts([text], aggregation)[0]
+
+    def analyze_long_texts(
+        self,
+        texts: List[str],
+        aggregation: Optional[str] = None
+    ) -> List[Dict[str, Union[str, float, int]]]:
+        """
+        Analyze long texts with overlapping token windows.
+
+        Each cleaned text is tokenized whole and cut into windows of at most
+        settings.long_text_window_tokens tokens (the model limit by default),
+        overlapping by settings.long_text_window_overlap tokens. The windows of
+        all texts are scored in one bucketed pass, then each text's window
+        scores are aggregated. Texts that fit in one window get the same result
+        as analyze_texts().
+
+        Args:
+            texts (List[str]): Input texts, of any length.
+            aggregation (Optional[str]): "mean", "max_confidence" or
+                "length_weighted". Defaults to settings.long_text_aggregation.
+
+        Returns:
+            List[Dict[str, Union[str, float, int]]]: One result per input, in input
+                order, with the number of chunks (windows) used.
+        """
+        if not texts:
+            return []
+        aggregation = aggregation or settings.long_text_aggregation
+        try:
+            cleaned_texts = list(preprocess_batch(texts))
+            content_ids = self.window_tokenization.encode(cleaned_texts)
+
+            max_window = self.backend.max_length - self.backend.num_special_tokens
+            window_size = min(settings.long_text_window_tokens or max_window, max_window)
+            windows: List[List[int]] = []
+            window_lengths: List[int] = []
+            spans: List[List[int]] = []
+            for ids in content_ids:
+                owned = []
+                for start, end in plan_windows(len(ids), window_size, settings.long_text_window_overlap):
+                    owned.append(len(windows))
+                    windows.append(self.backend.with_special_tokens(ids[start:end].tolist()))
+                    window_lengths.append(end - start)
+                spans.append(owned)
+
+            scored = self._forward_window(windows)
+            results = []
+            for owned in spans:
+                result = aggregate_windows(
+                    [scored[index] for index in owned],
+                    [window_lengths[index] for index in owned],
+                    aggregation
+                )
+                results.append({**result, "chunks": len(owned), "aggregation": aggregation})
+            return results
+        except Exception as e:
+            logger.error(f"Error analyzing long texts: {str(e)}")
+            raise
+
+    def _predict(self, cleaned_texts: List[str]) -> List[Dict[str, Union[str, float]]]:
+        """
+        Run the inference backend on already cleaned texts.
+
+        Texts are processed in windows of settings.tokenization_window texts; the
+        next window is tokenized on the tokenization stage's thread while the
+        current one runs through the model.
+
+        Args:
+            cleaned_texts (List[str]): Preprocessed texts.
+
+        Returns:
+            List[Dict[str, Union[str, float]]]: Normalized results, in input order.
+        """
+        if not cleaned_texts:
+            return []
+        window = max(1, settings.tokenization_window)
+        starts = list(range(0, len(cleaned_texts), window))
+
+        results: List[Dict] = []
+        pending = None
+        for position, start in enumerate(starts):
+            texts = cleaned_texts[start:start + window]
+            token_ids = pending.result() if pending is not None else self.tokenization.encode(texts)
+            # Overlap tokenization of the next window with this window's forward pass
+            pending = None
+            if position + 1 < len(starts):
+                next_start = starts[position + 1]
+                pending = self.tokenization.encode_async(cleaned_texts[next_start:next_start + window])
+            results.extend(self._forward_window(token_ids))
+        return results
+
+    def _forward_window(self, token_ids: List) -> List[Dict[str, Union[str, float]]]:
+        """
+        Score tokenized texts in length buckets.
+
+        Texts are grouped into buckets of similar length (at most
+        settings.inference_batch_size texts and settings.bucket_max_tokens padded
+        tokens each) so short titles are not padded to the longest description,
+        and the results are put back in input order.
+
+        Args:
+            token_ids (List): Token ids per text.
+
+        Returns:
+            List[Dict[str, Union[str, float]]]: Normalized results, in input order.
+        """
+        lengths = [len(ids) for ids in token_ids]
+        batch_size = max(1, settings.inference_batch_size)
+        buckets = plan_length_buckets(lengths, batch_size, settings.bucket_max_tokens)
+
+        results: List[Dict] = [None] * len(token_ids)
+        for bucket in buckets:
+            batch_sizes.observe(len(bucket), kind="forward")
+            with stage_latency.time(stage="forward"):
+                predictions = self.backend.predict_ids([token_ids[index] for index in bucket])
+            for index, result in zip(bucket, predictions):
+                results[index] = {
+                    "label": result["label"].lower(),   # Normalize label to lowercase
+                    "score": round(result["score"], 4)  # Round score to 4 decimals
+                }
+
+        padding = self.padding_stats.record(lengths, buckets, batch_size)
+        logger.debug(
+            f"Scored {len(token_ids)} texts in {len(buckets)} buckets, "
+            f"{padding['padded_tokens_saved']} padded tokens saved"
+        )
+        return results
+
     def analyze_node(self, node_data: Dict) -> Dict:
         """
         Analyze sentiment of a graph node.
@@ -77,6 +548,30 @@ class SentimentAnalyzer:
             logger.error(f"Error analyzing node: {str(e)}")
             raise
 
+    def analyze_nodes(self, nodes: List[Dict]) -> List[Dict]:
+        """
+        Analyze sentiment of several graph nodes in batched pipeline calls.
+
+        Args:
+            nodes (List[Dict]): Node data, each containing at least 'id' and 'text'.
+
+        Returns:
+            List[Dict]: Sentiment results including node metadata, in input order.
+        """
+        try:
+            sentiments = self.analyze_texts([node.get("text", "") for node in nodes])
+            return [
+                {
+                    "node_id": node.get("id"),
+                    "sentiment": sentiment,
+                    "metadata": node.get("metadata", {})
+                }
+                for node, sentiment in zip(nodes, sentiments)
+            ]
+        except Exception as e:
+            logger.error(f"Error analyzing nodes: {str(e)}")
+            raise
+
     def analyze_edge(self, edge_data: Dict, connected_nodes: List[Dict]) -> Dict:
         """
         Analyze sentiment of an edge based on its connected nodes.
@@ -89,27 +584,8 @@ class SentimentAnalyzer:
             Dict: Sentiment result for the edge with aggregated scores.
         """
         try:
-            # Collect sentiment scores from connected nodes
-            node_sentiments = [
-                self.analyze_node(node)["sentiment"]["score"] 
-                for node in connected_nodes
-            ]
-            
-            # Compute average sentiment across connected nodes
-            avg_sentiment = np.mean(node_sentiments)
-            
-            # Assign label based on threshold
-            label = "positive" if avg_sentiment > 0.5 else "negative"
-            
-            return {
-                "edge_id": edge_data.get("id"),
-                "sentiment": {
-                    "label": label,
-                    "score": round(avg_sentiment, 4)
-                },
-                "connected_nodes": [node.get("id") for node in connected_nodes],
-                "metadata": edge_data.get("metadata", {})
-            }
+            # Score connected nodes in one batched call
+            return build_edge_analysis(edge_data, self.analyze_nodes(connected_nodes))
         except Exception as e:
             logger.error(f"Error analyzing edge: {str(e)}")
             raise
@@ -118,6 +594,10 @@ class SentimentAnalyzer:
         """
         Perform sentiment analysis on an entire graph.
 
+        Each distinct node text is scored once in a batched pass; edges and
+        metrics reuse those node scores without calling the model again,
+        computed on the array form of the graph (see GraphArrays).
+
         Args:
             nodes (List[Dict]): List of graph nodes.
             edges (List[Dict]): List of graph edges.
@@ -126,31 +606,17 @@ class SentimentAnalyzer:
             Dict: Complete analysis including node/edge results and metrics.
         """
         try:
-            # Analyze all nodes individually
-            node_analyses = [self.analyze_node(node) for node in nodes]
-            
-            # Build dictionary for fast node lookup by id
-            nodes_dict = {node["id"]: node for node in nodes}
-            
-            # Analyze all edges
-            edge_analyses = []
-            for edge in edges:
-                source_node = nodes_dict.get(edge.get("source"))
-                target_node = nodes_dict.get(edge.get("target"))
-                if source_node and target_node:
-                    edge_analysis = self.analyze_edge(
-                        edge, 
-                        [source_node, target_node]
-                    )
-                    edge_analyses.append(edge_analysis)
-            
-            # Compute global metrics
-            node_sentiments = [analysis["sentiment"]["score"] for analysis in node_analyses]
-            edge_sentiments = [analysis["sentiment"]["score"] for analysis in edge_analyses]
-            
+            # Score each distinct text once
+            unique_texts = list(dict.fromkeys(node.get("text", "") for node in nodes))
+            sentiments = dict(zip(unique_texts, self.analyze_texts(unique_texts)))
+
+            # Edge scores and metrics as array operations, dicts only for the result
+            graph = GraphArrays(nodes, edges, sentiments)
             return {
-                "nodes": node_analyses,
-                "edges": edge_analyses,
-                "metrics": {
-                    "average_node_sentiment": round(np.mean(node_sentiments), 4),
-                    "average_edge_sentiment": round(np.mean(edg
+                "nodes": graph.node_analyses(),
+                "edges": graph.edge_analyses(),
+                "metrics": graph.metrics()
+            }
+        except Exception as e:
+            logger.error(f"Error analyzing graph: {str(e)}")
+            raise
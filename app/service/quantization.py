@@ -0,0 +1,168 @@
+from typing import Callable, Dict, List, Optional, Tuple
+import argparse
+import json
+import logging
+import time
+import numpy as np
+from app.core.config import settings
+from app.service.backends import InferenceBackend, load_backend
+
+logger = logging.getLogger(__name__)
+
+# (text, expected label) pairs used when no sample file is given
+DEFAULT_SAMPLES: List[Tuple[str, str]] = [
+    ("The new architecture is clean and easy to extend", "positive"),
+    ("Great job on the release, everything works", "positive"),
+    ("I love how fast the game loads now", "positive"),
+    ("The team delivered an excellent prototype", "positive"),
+    ("This feature makes planning so much easier", "positive"),
+    ("Wonderful feedback from the playtest session", "positive"),
+    ("The documentation is clear and helpful", "positive"),
+    ("Deployment went smoothly without any issue", "positive"),
+    ("The login page keeps crashing", "negative"),
+    ("This bug has blocked us for a week", "negative"),
+    ("The build is broken again and nobody knows why", "negative"),
+    ("Terrible performance on large graphs", "negative"),
+    ("The API returns confusing errors", "negative"),
+    ("Players hate the new controls", "negative"),
+    ("The migration failed and we lost data", "negative"),
+    ("Setup is slow and painful", "negative"),
+]
+
+
+def load_samples(path: str, text_field: str = "text", label_field: str = "label") -> List[Tuple[str, Optional[str]]]:
+    """
+    Read labeled samples from a JSONL file.
+
+    Args:
+        path (str): JSONL file, one object per line.
+        text_field (str): Field holding the text.
+        label_field (str): Field holding the expected label (optional per line).
+
+    Returns:
+        List[Tuple[str, Optional[str]]]: (text, lowercase label or None) pairs.
+    """
+    samples = []
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            label = record.get(label_field)
+            samples.append((record[text_field], label.lower() if label else None))
+    return samples
+
+
+def _time_predictions(backend: InferenceBackend, texts: List[str]) -> Tuple[List[Dict], np.ndarray]:
+    """Score texts one at a time, as served requests would be, timing each call."""
+    results, latencies = [], []
+    for text in texts:
+        start = time.perf_counter()
+        results.append(backend.predict([text])[0])
+        latencies.append(time.perf_counter() - start)
+    return results, np.array(latencies) * 1000.0
+
+
+def _latency_summary(latencies_ms: np.ndarray) -> Dict[str, float]:
+    return {
+        "p50_ms": round(float(np.percentile(latencies_ms, 50)), 3),
+        "p99_ms": round(float(np.percentile(latencies_ms, 99)), 3),
+        "mean_ms": round(float(latencies_ms.mean()), 3)
+    }
+
+
+def evaluate_quantization(
+    samples: List[Tuple[str, Optional[str]]],
+    backend_name: Optional[str] = None,
+    backend_factory: Callable[..., InferenceBackend] = load_backend,
+    warmup: int = 3
+) -> Dict:
+    """
+    Compare the fp32 and int8 models on a labeled sample set.
+
+    Args:
+        samples (List[Tuple[str, Optional[str]]]): (text, expected label) pairs;
+            the expected label may be None.
+        backend_name (Optional[str]): Backend to evaluate. Defaults to
+            settings.inference_backend.
+        backend_factory (Callable[..., InferenceBackend]): Builds a backend from
+            (name, mode).
+        warmup (int): Untimed calls before measuring each model.
+
+    Returns:
+        Dict: Label agreement, score drift, accuracy, latency and model size per mode.
+    """
+    if not samples:
+        raise ValueError("At least one sample is required")
+    backend_name = backend_name or settings.inference_backend
+    texts = [text for text, _ in samples]
+    expected = [label for _, label in samples]
+
+    report: Dict = {"backend": backend_name, "samples": len(samples), "modes": {}}
+    predictions = {}
+    for mode in ("fp32", "quantized"):
+        backend = backend_factory(backend_name, mode)
+        for text in texts[:warmup]:
+            backend.predict([text])
+        results, latencies_ms = _time_predictions(backend, texts)
+        predictions[mode] = results
+
+        labeled = [(r, label) for r, label in zip(results, expected) if label is not None]
+        report["modes"][mode] = {
+            **_latency_summary(latencies_ms),
+            "accuracy": (
+                round(sum(r["label"].lower() == label for r, label in labeled) / len(labeled), 4)
+                if labeled else None
+            ),
+            "size_mb": (
+                round(backend.size_bytes() / (1024 * 1024), 2)
+                if hasattr(backend, "size_bytes") else None
+            )
+        }
+
+    fp32, int8 = predictions["fp32"], predictions["quantized"]
+    # Drift compares P(positive) so that label flips count fully
+    def positive_probability(result: Dict) -> float:
+        return result["score"] if result["label"].lower() == "positive" else 1.0 - result["score"]
+
+    drift = np.array([abs(positive_probability(a) - positive_probability(b)) for a, b in zip(fp32, int8)])
+    report["label_agreement"] = round(
+        sum(a["label"] == b["label"] for a, b in zip(fp32, int8)) / len(samples), 4
+    )
+    report["mean_score_drift"] = round(float(drift.mean()), 6)
+    report["max_score_drift"] = round(float(drift.max()), 6)
+    fp32_p50 = report["modes"]["fp32"]["p50_ms"]
+    report["p50_speedup"] = (
+        round(fp32_p50 / report["modes"]["quantized"]["p50_ms"], 3)
+        if report["modes"]["quantized"]["p50_ms"] else None
+    )
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point: print the fp32 vs int8 evaluation report."""
+    parser = argparse.ArgumentParser(
+        description="Compare fp32 and dynamically quantized int8 sentiment models"
+    )
+    parser.add_argument("--samples", help="Labeled JSONL sample file (default: built-in set)")
+    parser.add_argument("--text-field", default="text")
+    parser.add_argument("--label-field", default="label")
+    parser.add_argument("--backend", default=None, help="torch or onnx (default: settings)")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    samples = (
+        load_samples(args.samples, args.text_field, args.label_field)
+        if args.samples else DEFAULT_SAMPLES
+    )
+    report = evaluate_quantization(samples, backend_name=args.backend)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
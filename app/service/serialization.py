@@ -0,0 +1,130 @@
+from typing import Any, Dict, List, Optional
+import json
+
+try:
+    import orjson
+except ImportError:  # optional: the standard json module is used instead
+    orjson = None
+
+RESPONSE_FORMATS = ("graph", "columnar")
+
+
+def _sentiment(sentiment: Dict) -> Dict:
+    return {"label": sentiment["label"], "score": sentiment["score"]}
+
+
+def graph_response(
+    nodes: List[Dict],
+    edges: List[Dict],
+    metrics: Dict,
+    metadata: Optional[Dict] = None
+) -> Dict:
+    """
+    Shape analyzer results as a GraphSentimentResponse, without validating them.
+
+    Results produced by SentimentAnalyzer already satisfy the response
+    schema; building plain dicts skips pydantic validation of every node,
+    edge and score. Only the schema's fields are kept, in its field order,
+    so the JSON is the same as that of the validated model.
+
+    Args:
+        nodes (List[Dict]): Node results (node_id, sentiment, metadata).
+        edges (List[Dict]): Edge results (edge_id, sentiment, connected_nodes, metadata).
+        metrics (Dict): Graph metrics, as from compute_graph_metrics().
+        metadata (Optional[Dict]): Response metadata.
+
+    Returns:
+        Dict: JSON-ready response.
+    """
+    distribution = metrics["sentiment_distribution"]
+    return {
+        "nodes": [
+            {
+                "node_id": node["node_id"],
+                "sentiment": _sentiment(node["sentiment"]),
+                "metadata": node.get("metadata")
+            }
+            for node in nodes
+        ],
+        "edges": [
+            {
+                "edge_id": edge["edge_id"],
+                "sentiment": _sentiment(edge["sentiment"]),
+                "connected_nodes": list(edge["connected_nodes"]),
+                "metadata": edge.get("metadata")
+            }
+            for edge in edges
+        ],
+        "metrics": {
+            "average_node_sentiment": metrics["average_node_sentiment"],
+            "average_edge_sentiment": metrics["average_edge_sentiment"],
+            "sentiment_distribution": {
+                "positive_nodes": distribution["positive_nodes"],
+                "negative_nodes": distribution["negative_nodes"],
+                "positive_edges": distribution["positive_edges"],
+                "negative_edges": distribution["negative_edges"]
+            }
+        },
+        "metadata": metadata
+    }
+
+
+def columnar_graph_response(response: Dict) -> Dict:
+    """
+    Convert a graph response to its compact columnar form.
+
+    Nodes and edges become one list per field instead of one object per
+    item, so field names are not repeated for every item.
+
+    Args:
+        response (Dict): Response from graph_response().
+
+    Returns:
+        Dict: {"format": "columnar", "nodes": {field: [...]}, "edges": {field: [...]},
+            "metrics", "metadata"}; row i of every list belongs to the same item.
+    """
+    nodes, edges = response["nodes"], response["edges"]
+    return {
+        "format": "columnar",
+        "nodes": {
+            "node_id": [node["node_id"] for node in nodes],
+            "label": [node["sentiment"]["label"] for node in nodes],
+            "score": [node["sentiment"]["score"] for node in nodes],
+            "metadata": [node["metadata"] for node in nodes]
+        },
+        "edges": {
+            "edge_id": [edge["edge_id"] for edge in edges],
+            "label": [edge["sentiment"]["label"] for edge in edges],
+            "score": [edge["sentiment"]["score"] for edge in edges],
+            "connected_nodes": [edge["connected_nodes"] for edge in edges],
+            "metadata": [edge["metadata"] for edge in edges]
+        },
+        "metrics": response["metrics"],
+        "metadata": response["metadata"]
+    }
+
+
+def _default(value: Any) -> Any:
+    """Encode NumPy scalars and other values exposing item() or isoformat()."""
+    if hasattr(value, "item"):
+        return value.item()
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_json(content: Any) -> bytes:
+    """
+    Encode a JSON-ready value to UTF-8 bytes, with orjson when installed.
+
+    Args:
+        content (Any): Dicts, lists, strings, numbers, booleans and None.
+
+    Returns:
+        bytes: Compact JSON.
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
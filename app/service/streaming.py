@@ -0,0 +1,256 @@
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Union
+from collections import deque
+import asyncio
+import json
+import logging
+import time
+from app.core.config import settings
+from app.models.request import NodeInput
+from app.service.executor import QueueFullError, inference_executor
+
+logger = logging.getLogger(__name__)
+
+SentimentResult = Dict[str, Union[str, float]]
+BatchRunner = Callable[[List[str]], Awaitable[List[SentimentResult]]]
+
+# Same limit as the texts accepted by the JSON endpoints
+MAX_TEXT_LENGTH = NodeInput.__fields__["text"].type_.max_length
+
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes],
+    max_line_bytes: Optional[int] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Split a byte stream into NDJSON lines.
+
+    Only the current partial line is buffered. A line longer than
+    max_line_bytes is dropped up to its newline and reported as an error
+    item instead of growing the buffer.
+
+    Args:
+        chunks (AsyncIterator[bytes]): Raw body chunks, e.g. Request.stream().
+        max_line_bytes (Optional[int]): Longest accepted line. Defaults to
+            settings.stream_max_line_bytes.
+
+    Yields:
+        Dict[str, Any]: {"line": n, "raw": bytes} for each non-blank line, or
+            {"line": n, "error": message} for an oversized one; n is 1-based.
+    """
+    max_line_bytes = max_line_bytes or settings.stream_max_line_bytes
+    buffer = b""
+    line_number = 0
+    discarding = False
+    async for chunk in chunks:
+        buffer += chunk
+        while True:
+            newline = buffer.find(b"\n")
+            if newline < 0:
+                if len(buffer) > max_line_bytes:
+                    if not discarding:
+                        line_number += 1
+                        discarding = True
+                        yield {"line": line_number, "error": f"Line exceeds {max_line_bytes} bytes"}
+                    buffer = b""
+                break
+            line, buffer = buffer[:newline], buffer[newline + 1:]
+            if discarding:
+                discarding = False
+                continue
+            line_number += 1
+            if len(line) > max_line_bytes:
+                yield {"line": line_number, "error": f"Line exceeds {max_line_bytes} bytes"}
+            elif line.strip():
+                yield {"line": line_number, "raw": line}
+    if buffer.strip() and not discarding:
+        yield {"line": line_number + 1, "raw": buffer}
+
+
+async def parse_records(
+    lines: AsyncIterator[Dict[str, Any]],
+    text_field: str = "text",
+    id_field: str = "id"
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Decode NDJSON lines into records to score.
+
+    Args:
+        lines (AsyncIterator[Dict[str, Any]]): Items from iter_lines().
+        text_field (str): Field holding the text to score.
+        id_field (str): Field echoed back as the record id (optional per line).
+
+    Yields:
+        Dict[str, Any]: {"line", "id", "text"} records, or {"line", "error"}
+            items for lines that cannot be scored.
+    """
+    async for item in lines:
+        if "error" in item:
+            yield item
+            continue
+        try:
+            record = json.loads(item["raw"])
+        except ValueError:
+            yield {"line": item["line"], "error": "Invalid JSON"}
+            continue
+        if not isinstance(record, dict):
+            yield {"line": item["line"], "error": "Expected a JSON object"}
+            continue
+        text = record.get(text_field)
+        if not isinstance(text, str) or not text.strip():
+            error = f"Missing or empty '{text_field}' field"
+        elif len(text) > MAX_TEXT_LENGTH:
+            error = f"'{text_field}' is longer than {MAX_TEXT_LENGTH} characters"
+        else:
+            error = None
+        if error:
+            yield {"line": item["line"], "id": record.get(id_field), "error": error}
+        else:
+            yield {"line": item["line"], "id": record.get(id_field), "text": text}
+
+
+async def batch_records(
+    records: AsyncIterator[Dict[str, Any]],
+    batch_size: int
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Group records into lists of at most batch_size items, in input order."""
+    batch: List[Dict[str, Any]] = []
+    async for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _batch_errors(batch: List[Dict[str, Any]], error: str) -> List[Dict[str, Any]]:
+    """Error item for each valid record of a batch; error items pass through unchanged."""
+    return [
+        {"line": record["line"], "id": record.get("id"), "error": error}
+        if "text" in record else record
+        for record in batch
+    ]
+
+
+async def _score_batch(
+    batch: List[Dict[str, Any]],
+    runner: BatchRunner,
+    max_queue_wait: float
+) -> List[Dict[str, Any]]:
+    """Score the valid records of a batch; error items pass through unchanged."""
+    scorable = [record for record in batch if "text" in record]
+    sentiments: List[SentimentResult] = []
+    if scorable:
+        texts = [record["text"] for record in scorable]
+        deadline = time.monotonic() + max_queue_wait
+        while True:
+            try:
+                sentiments = await runner(texts)
+                break
+            except QueueFullError as e:
+                # Bulk rescoring can wait for capacity rather than fail its lines, up to a limit
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning(f"Streaming batch rejected: queue still full after {max_queue_wait}s")
+                    return _batch_errors(batch, "Inference queue is full")
+                await asyncio.sleep(min(e.retry_after, remaining))
+            except Exception as e:
+                logger.error(f"Streaming batch failed: {str(e)}")
+                return _batch_errors(batch, "Inference failed")
+
+    scored = iter(sentiments)
+    return [
+        {"line": record["line"], "id": record["id"], "sentiment": next(scored)}
+        if "text" in record else record
+        for record in batch
+    ]
+
+
+async def score_batches(
+    batches: AsyncIterator[List[Dict[str, Any]]],
+    runner: BatchRunner,
+    max_in_flight: int,
+    max_queue_wait: Optional[float] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Score batches concurrently, at most max_in_flight at a time.
+
+    Results are yielded in input order as soon as the oldest running batch
+    finishes. The next batch is only read once a slot is free, so no more
+    than max_in_flight batches are held whatever the input size.
+
+    Args:
+        batches (AsyncIterator[List[Dict[str, Any]]]): Items from batch_records().
+        runner (BatchRunner): Coroutine function scoring a list of texts.
+        max_in_flight (int): Batches scored concurrently.
+        max_queue_wait (Optional[float]): Seconds a batch retries while the inference
+            queue is full before its lines are reported as errors. Defaults to
+            settings.stream_max_queue_wait_seconds.
+
+    Yields:
+        Dict[str, Any]: One result or error item per input line.
+    """
+    max_in_flight = max(1, max_in_flight)
+    if max_queue_wait is None:
+        max_queue_wait = settings.stream_max_queue_wait_seconds
+    pending: Deque["asyncio.Task[List[Dict[str, Any]]]"] = deque()
+    try:
+        async for batch in batches:
+            pending.append(asyncio.ensure_future(_score_batch(batch, runner, max_queue_wait)))
+            if len(pending) >= max_in_flight:
+                for result in await pending.popleft():
+                    yield result
+        while pending:
+            for result in await pending.popleft():
+                yield result
+    finally:
+        # Client gone or upstream error: do not leave batches running
+        for task in pending:
+            task.cancel()
+
+
+async def _run_on_executor(texts: List[str]) -> List[SentimentResult]:
+    return await inference_executor.run_analyzer("analyze_texts", texts)
+
+
+async def stream_sentiments(
+    chunks: AsyncIterator[bytes],
+    text_field: str = "text",
+    id_field: str = "id",
+    runner: BatchRunner = _run_on_executor,
+    batch_size: Optional[int] = None,
+    max_in_flight: Optional[int] = None,
+    max_queue_wait: Optional[float] = None
+) -> AsyncIterator[bytes]:
+    """
+    Score an NDJSON byte stream and produce NDJSON result lines.
+
+    Line splitting, decoding, batching and inference are chained generators:
+    each stage pulls from the previous one only when it needs more input.
+
+    Args:
+        chunks (AsyncIterator[bytes]): Raw NDJSON body chunks.
+        text_field (str): Field holding the text to score.
+        id_field (str): Field echoed back as the record id.
+        runner (BatchRunner): Coroutine function scoring a list of texts.
+            Defaults to SentimentAnalyzer.analyze_texts on the inference executor.
+        batch_size (Optional[int]): Records per inference call. Defaults to
+            settings.stream_batch_size.
+        max_in_flight (Optional[int]): Batches scored concurrently. Defaults to
+            settings.stream_max_in_flight_batches.
+        max_queue_wait (Optional[float]): Seconds a batch waits for a full inference
+            queue. Defaults to settings.stream_max_queue_wait_seconds.
+
+    Yields:
+        bytes: One JSON line per non-blank input line, in input order.
+    """
+    records = parse_records(iter_lines(chunks), text_field=text_field, id_field=id_field)
+    batches = batch_records(records, max(1, batch_size or settings.stream_batch_size))
+    results = score_batches(
+        batches,
+        runner,
+        settings.stream_max_in_flight_batches if max_in_flight is None else max_in_flight,
+        max_queue_wait
+    )
+    async for result in results:
+        yield (json.dumps(result, ensure_ascii=False) + "\n").encode("utf-8")
@@ -0,0 +1,161 @@
+from typing import Callable, Dict, List, Optional
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+import logging
+import threading
+import numpy as np
+from app.core.config import settings
+from app.core.metrics import stage_latency
+from app.core.profiling import in_profile_context
+
+logger = logging.getLogger(__name__)
+
+
+class TokenizationStage:
+    """
+    Explicit tokenization stage in front of the model forward pass.
+
+    Token ids are cached per cleaned text, bounded by the total number of
+    cached tokens, and misses are encoded in one batch call of the fast
+    tokenizer. encode_async() runs on a dedicated thread so a batch can be
+    tokenized while the previous one is in the forward pass. Fast tokenizers
+    are not safe for concurrent calls, so every call goes through one lock.
+    """
+
+    def __init__(
+        self,
+        tokenize: Callable[[List[str]], List[List[int]]],
+        max_cached_tokens: Optional[int] = None,
+        tokenizer_lock: Optional[threading.Lock] = None
+    ):
+        """
+        Initialize the stage.
+
+        Args:
+            tokenize (Callable[[List[str]], List[List[int]]]): Batch encoder,
+                typically InferenceBackend.tokenize.
+            max_cached_tokens (Optional[int]): Token ids kept in the cache before the
+                least recently used texts are evicted; 0 disables caching. Defaults
+                to settings.token_cache_max_tokens.
+            tokenizer_lock (Optional[threading.Lock]): Lock shared with other stages
+                calling the same tokenizer. Defaults to a lock of this stage.
+        """
+        self._tokenize = tokenize
+        self.max_cached_tokens = (
+            settings.token_cache_max_tokens if max_cached_tokens is None else max_cached_tokens
+        )
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._cached_tokens = 0
+        self._cache_lock = threading.Lock()
+        self.tokenizer_lock = tokenizer_lock or threading.Lock()
+        # Created on first use (stages that never tokenize ahead need no thread)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def encode(self, texts: List[str]) -> List[np.ndarray]:
+        """
+        Return token ids for each text, from the cache when possible.
+
+        Args:
+            texts (List[str]): Cleaned texts.
+
+        Returns:
+            List[np.ndarray]: int32 token ids per text, in input order.
+        """
+        encoded: List[Optional[np.ndarray]] = [None] * len(texts)
+        missing: Dict[str, List[int]] = {}
+        with self._cache_lock:
+            for index, text in enumerate(texts):
+                ids = self._cache.get(text)
+                if ids is not None:
+                    self._cache.move_to_end(text)
+                    self.hits += 1
+                    encoded[index] = ids
+                else:
+                    self.misses += 1
+                    missing.setdefault(text, []).append(index)
+
+        if missing:
+            to_encode = list(missing)
+            with self.tokenizer_lock, stage_latency.time(stage="tokenize"):
+                token_ids = self._tokenize(to_encode)
+            new_entries = [(text, np.asarray(ids, dtype=np.int32)) for text, ids in zip(to_encode, token_ids)]
+            for text, ids in new_entries:
+                for index in missing[text]:
+                    encoded[index] = ids
+            self._store(new_entries)
+        return encoded
+
+    def encode_uncached(self, texts: List[str]) -> List[List[int]]:
+        """
+        Tokenize without reading or filling the cache, under the tokenizer lock.
+
+        Args:
+            texts (List[str]): Cleaned texts.
+
+        Returns:
+            List[List[int]]: Token ids per text, as returned by the batch encoder.
+        """
+        with self.tokenizer_lock:
+            return self._tokenize(texts)
+
+    def encode_async(self, texts: List[str]) -> "Future[List[np.ndarray]]":
+        """
+        Tokenize on the stage's own thread.
+
+        Args:
+            texts (List[str]): Cleaned texts.
+
+        Returns:
+            Future[List[np.ndarray]]: Resolves to the result of encode().
+        """
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tokenizer")
+            return self._pool.submit(in_profile_context(self.encode), texts)
+
+    def _store(self, entries: List) -> None:
+        """Cache new token ids, evicting least recently used texts over the budget."""
+        if self.max_cached_tokens <= 0:
+            return
+        with self._cache_lock:
+            for text, ids in entries:
+                if len(ids) > self.max_cached_tokens:
+                    continue
+                previous = self._cache.pop(text, None)
+                if previous is not None:
+                    self._cached_tokens -= len(previous)
+                self._cache[text] = ids
+                self._cached_tokens += len(ids)
+            while self._cached_tokens > self.max_cached_tokens:
+                _, evicted = self._cache.popitem(last=False)
+                self._cached_tokens -= len(evicted)
+                self.evictions += 1
+
+    def close(self) -> None:
+        """Stop the tokenizer thread."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    def stats(self) -> Dict:
+        """
+        Report token cache counters.
+
+        Returns:
+            Dict: Cached texts and tokens, budget, hits, misses, evictions and hit rate.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "cached_texts": len(self._cache),
+            "cached_tokens": self._cached_tokens,
+            "max_cached_tokens": self.max_cached_tokens,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
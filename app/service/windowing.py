@@ -0,0 +1,76 @@
+from typing import Dict, List, Tuple, Union
+
+SentimentResult = Dict[str, Union[str, float]]
+
+AGGREGATION_STRATEGIES = ("mean", "max_confidence", "length_weighted")
+
+
+def plan_windows(length: int, window_size: int, overlap: int) -> List[Tuple[int, int]]:
+    """
+    Cut a token sequence into overlapping windows.
+
+    Consecutive windows share overlap tokens so that a sentence cut at a
+    window boundary is still seen whole by one of them. The last window may
+    be shorter than window_size.
+
+    Args:
+        length (int): Number of tokens.
+        window_size (int): Tokens per window, special tokens excluded.
+        overlap (int): Tokens shared by consecutive windows; capped at
+            window_size - 1.
+
+    Returns:
+        List[Tuple[int, int]]: (start, end) token offsets; one (0, length)
+            window when the sequence fits.
+    """
+    window_size = max(1, window_size)
+    step = window_size - min(max(0, overlap), window_size - 1)
+    windows = []
+    start = 0
+    while True:
+        end = min(start + window_size, length)
+        windows.append((start, end))
+        if end >= length:
+            return windows
+        start += step
+
+
+def positive_probability(result: SentimentResult) -> float:
+    """P(positive) of a top-label result, so that opposite labels can be averaged."""
+    return result["score"] if result["label"] == "positive" else 1.0 - result["score"]
+
+
+def aggregate_windows(
+    results: List[SentimentResult],
+    lengths: List[int],
+    strategy: str
+) -> SentimentResult:
+    """
+    Combine the scores of a text's windows into one result.
+
+    Args:
+        results (List[SentimentResult]): Normalized result per window.
+        lengths (List[int]): Tokens per window, special tokens excluded.
+        strategy (str): "mean" averages P(positive) over windows,
+            "length_weighted" weights that average by window length, and
+            "max_confidence" keeps the window the model is most sure about.
+
+    Returns:
+        SentimentResult: Aggregated label and score.
+    """
+    if strategy not in AGGREGATION_STRATEGIES:
+        raise ValueError(
+            f"Unknown aggregation strategy: {strategy} (expected one of {list(AGGREGATION_STRATEGIES)})"
+        )
+    if strategy == "max_confidence":
+        best = max(results, key=lambda result: result["score"])
+        return {"label": best["label"], "score": best["score"]}
+
+    weights = lengths if strategy == "length_weighted" and sum(lengths) else [1] * len(results)
+    probability = sum(
+        weight * positive_probability(result) for weight, result in zip(weights, results)
+    ) / sum(weights)
+    # Same threshold as edge scores (see pipeline_sentiment.build_edge_analysis)
+    if probability > 0.5:
+        return {"label": "positive", "score": round(probability, 4)}
+    return {"label": "negative", "score": round(1.0 - probability, 4)}
@@ -0,0 +1,205 @@
+"""
+Outillage des benchmarks de app/tests/test_performance.py.
+
+Les benchmarks (tests qui utilisent la fixture benchmark, marqués "benchmark")
+ne tournent que sur demande : sans BENCHMARK=1 ils sont ignorés. Chaque
+benchmark est préchauffé puis répété ; la médiane du temps par appel est
+comparée à la référence enregistrée dans benchmarks.json. Un benchmark échoue
+s'il est plus lent que sa référence au-delà de la tolérance ; un benchmark
+sans référence est seulement rapporté. Les références dépendent de la machine :
+elles ne sont comparées que sur la machine qui les a enregistrées (même nom
+d'hôte), ailleurs les temps sont seulement rapportés en fin de session.
+
+    BENCHMARK=1 python -m pytest -m benchmark app/tests
+
+Variables d'environnement :
+    BENCHMARK=1              exécute les benchmarks
+    BENCHMARK_RECORD=1       (ré)enregistre les références au lieu de comparer (implique BENCHMARK=1)
+    BENCHMARK_TOLERANCE=0.5  ralentissement relatif toléré (0.5 : +50 %)
+    BENCHMARK_BASELINE=path  fichier de références à utiliser
+"""
+from typing import Callable, Dict, List, Optional
+import gc
+import json
+import os
+import platform
+import statistics
+import time
+import zlib
+import numpy as np
+from app.service.backends import InferenceBackend
+
+BASELINE_PATH = os.environ.get(
+    "BENCHMARK_BASELINE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks.json")
+)
+RECORD = os.environ.get("BENCHMARK_RECORD", "") not in ("", "0", "false")
+ENABLED = RECORD or os.environ.get("BENCHMARK", "") not in ("", "0", "false")
+TOLERANCE = float(os.environ.get("BENCHMARK_TOLERANCE", "0.5"))
+# Machine des mesures : les références d'une autre machine ne sont pas comparées
+HOST = platform.node()
+
+
+def measure(func: Callable[[], object], number: int = 1, repeat: int = 7, warmup: int = 2) -> Dict:
+    """
+    Mesure le temps par appel d'une fonction.
+
+    Args:
+        func (Callable): Fonction sans argument à mesurer
+        number (int): Appels par répétition
+        repeat (int): Répétitions mesurées
+        warmup (int): Répétitions préalables non mesurées (caches, imports paresseux)
+        
+    Chaque répétition part d'un tas collecté : le coût du ramasse-miettes reste
+    mesuré, mais ne dépend plus des objets laissés par les tests précédents.
+
+    Returns:
+        Dict: Médiane, minimum et écart-type du temps par appel, en secondes
+    """
+    for _ in range(warmup):
+        for _ in range(number):
+            func()
+    timings: List[float] = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return {
+        "median_s": statistics.median(timings),
+        "min_s": min(timings),
+        "stdev_s": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "number": number,
+        "repeat": repeat
+    }
+
+
+class BaselineStore:
+    """Références des benchmarks et machine qui les a mesurées, lues et écrites dans un fichier JSON."""
+
+    def __init__(self, path: str = BASELINE_PATH, tolerance: float = TOLERANCE, host: str = HOST):
+        self.path = path
+        self.tolerance = tolerance
+        self.current_host = host
+        self.host: Optional[str] = None
+        self.baselines: Dict[str, Dict] = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            self.host = data.get("host")
+            self.baselines = data.get("benchmarks", {})
+        self._dirty = False
+
+    @property
+    def comparable(self) -> bool:
+        """Vrai si les références ont été enregistrées sur la machine courante."""
+        return self.host == self.current_host
+
+    def record(self, name: str, result: Dict) -> None:
+        """Enregistre le résultat comme nouvelle référence (celles d'une autre machine sont écartées)."""
+        if not self.comparable:
+            self.host = self.current_host
+            self.baselines = {}
+        self.baselines[name] = {"median_s": result["median_s"], "min_s": result["min_s"]}
+        self._dirty = True
+
+    def regression(self, name: str, result: Dict) -> Optional[str]:
+        """
+        Compare un résultat à sa référence.
+
+        Returns:
+            Optional[str]: Message de régression, None si le résultat est dans la tolérance,
+                si le benchmark n'a pas encore de référence ou si elle vient d'une autre machine
+        """
+        baseline = self.baselines.get(name)
+        if baseline is None or not self.comparable:
+            return None
+        limit = baseline["median_s"] * (1.0 + self.tolerance)
+        if result["median_s"] <= limit:
+            return None
+        return (
+            f"{name}: {result['median_s'] * 1000:.3f} ms par appel, référence "
+            f"{baseline['median_s'] * 1000:.3f} ms (+{self.tolerance:.0%} toléré)"
+        )
+
+    def save(self) -> None:
+        """Écrit les références si elles ont changé."""
+        if not self._dirty:
+            return
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"host": self.host, "benchmarks": dict(sorted(self.baselines.items()))}, f, indent=2)
+            f.write("\n")
+        self._dirty = False
+
+
+class HashingTokenizer:
+    """Tokenizer déterministe sans vocabulaire à télécharger : un id par mot (crc32)."""
+
+    pad_token_id = 0
+    cls_token_id = 1
+    sep_token_id = 2
+
+    def __init__(self, vocab_size: int):
+        self.vocab_size = vocab_size
+
+    def __call__(self, texts, padding=False, truncation=True, max_length=None, add_special_tokens=True, **kwargs):
+        # Comme les tokenizers HuggingFace : une chaîne seule donne une seule liste d'ids
+        single = isinstance(texts, str)
+        input_ids = []
+        for text in [texts] if single else texts:
+            ids = [3 + zlib.crc32(word.encode("utf-8")) % (self.vocab_size - 3) for word in text.split()]
+            if add_special_tokens:
+                limit = max_length - 2 if truncation and max_length else None
+                ids = [self.cls_token_id] + ids[:limit] + [self.sep_token_id]
+            elif truncation and max_length:
+                ids = ids[:max_length]
+            input_ids.append(ids)
+        return {"input_ids": input_ids[0] if single else input_ids}
+
+
+class TinyBackend(InferenceBackend):
+    """
+    Petit modèle local pour les benchmarks : plongements aléatoires fixes,
+    moyenne masquée et couche linéaire. Le coût par token est faible mais le
+    chemin (tokenisation, padding, softmax) est celui des vrais backends.
+    """
+
+    name = "tiny"
+
+    def __init__(self, vocab_size: int = 8192, dim: int = 64):
+        super().__init__()
+        rng = np.random.default_rng(0)
+        self.tokenizer = HashingTokenizer(vocab_size)
+        self.id2label = {0: "NEGATIVE", 1: "POSITIVE"}
+        self._embeddings = rng.standard_normal((vocab_size, dim)).astype(np.float32)
+        self._classifier = rng.standard_normal((dim, 2)).astype(np.float32)
+
+    def _forward(self, encoded: Dict[str, np.ndarray]) -> np.ndarray:
+        mask = encoded["attention_mask"][..., None].astype(np.float32)
+        pooled = (self._embeddings[encoded["input_ids"]] * mask).sum(axis=1) / mask.sum(axis=1)
+        return pooled @ self._classifier
+
+
+def synthetic_texts(count: int, seed: int = 0) -> List[str]:
+    """Textes distincts de 4 à 40 mots, pour ne pas mesurer les caches."""
+    rng = np.random.default_rng(seed)
+    words = ["create", "game", "fix", "login", "bug", "ship", "release", "great", "slow", "broken",
+             "team", "review", "deploy", "happy", "angry", "task", "feature", "test", "docs", "api"]
+    return [
+        " ".join(rng.choice(words, size=int(rng.integers(4, 40)))) + f" item{index}"
+        for index in range(count)
+    ]
+
+
+def synthetic_graph(node_count: int, edges_per_node: int = 2, seed: int = 0):
+    """Graphe aléatoire : node_count nodes et environ edges_per_node edges par node."""
+    rng = np.random.default_rng(seed)
+    nodes = [{"id": f"n{index}", "text": text} for index, text in enumerate(synthetic_texts(node_count, seed))]
+    sources = rng.integers(0, node_count, size=node_count * edges_per_node)
+    targets = rng.integers(0, node_count, size=node_count * edges_per_node)
+    edges = [
+        {"id": f"e{index}", "source": f"n{source}", "target": f"n{target}"}
+        for index, (source, target) in enumerate(zip(sources, targets))
+    ]
+    return nodes, edges
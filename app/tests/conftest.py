@@ -0,0 +1,66 @@
+import pytest
+from app.tests.benchmark import ENABLED, RECORD, BaselineStore, measure
+from app.utils.text_cleaner import TextCleaner
+
+# Résultats des benchmarks de la session, rapportés en fin de session
+benchmark_results = pytest.StashKey[list]()
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: benchmark comparé à sa référence (BENCHMARK=1 pour l'exécuter)")
+    config.stash[benchmark_results] = []
+
+
+def pytest_collection_modifyitems(config, items):
+    """Marque les tests qui utilisent la fixture benchmark ; ignorés sans BENCHMARK=1."""
+    skip = pytest.mark.skip(reason="benchmark : définir BENCHMARK=1 pour l'exécuter")
+    for item in items:
+        if "benchmark" in getattr(item, "fixturenames", ()):
+            item.add_marker(pytest.mark.benchmark)
+            if not ENABLED:
+                item.add_marker(skip)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    results = config.stash.get(benchmark_results, [])
+    if not results:
+        return
+    terminalreporter.section("benchmarks")
+    for name, result, note in results:
+        terminalreporter.write_line(
+            f"{name}: {result['median_s'] * 1000:.3f} ms par appel "
+            f"(min {result['min_s'] * 1000:.3f} ms){note}"
+        )
+
+
+@pytest.fixture
+def text_cleaner():
+    return TextCleaner()
+
+
+@pytest.fixture(scope="session")
+def baseline_store():
+    store = BaselineStore()
+    yield store
+    if RECORD:
+        store.save()
+
+
+@pytest.fixture
+def benchmark(baseline_store, pytestconfig):
+    """Mesure une fonction et la compare à sa référence (voir app/tests/benchmark.py)."""
+    def run(name, func, **kwargs):
+        result = measure(func, **kwargs)
+        if RECORD:
+            baseline_store.record(name, result)
+            note = " : référence enregistrée"
+        elif not baseline_store.comparable:
+            note = f" : références mesurées sur {baseline_store.host}, non comparées"
+        else:
+            note = ""
+        pytestconfig.stash[benchmark_results].append((name, result, note))
+        if not RECORD:
+            regression = baseline_store.regression(name, result)
+            assert regression is None, regression
+        return result
+    return run
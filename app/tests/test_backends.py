@@ -0,0 +1,158 @@
+import os
+import sys
+import threading
+import time
+import types
+import numpy as np
+import pytest
+from app.core.config import settings
+from app.service.backends import InferenceBackend, load_backend, quantize_onnx
+
+
+class FixedLogitsBackend(InferenceBackend):
+    """Backend stub returning preset logits, to check the result contract."""
+
+    def __init__(self, logits):
+        super().__init__()
+        self.logits = np.array(logits, dtype=np.float32)
+        self.id2label = {0: "NEGATIVE", 1: "POSITIVE"}
+
+    @property
+    def pad_token_id(self):
+        return 0
+
+    def tokenize(self, texts):
+        return [[1] * len(text.split()) for text in texts]
+
+    def _forward(self, encoded):
+        return self.logits[:len(encoded["input_ids"])]
+
+
+def test_predict_returns_top_label_and_probability():
+    backend = FixedLogitsBackend([[0.0, 2.0], [3.0, -1.0]])
+    results = backend.predict(["good", "bad"])
+    assert [r["label"] for r in results] == ["POSITIVE", "NEGATIVE"]
+    assert results[0]["score"] == pytest.approx(1 / (1 + np.exp(-2.0)))
+    assert results[1]["score"] == pytest.approx(1 / (1 + np.exp(-4.0)))
+
+
+def test_predict_empty_batch():
+    assert FixedLogitsBackend([[0.0, 1.0]]).predict([]) == []
+
+
+def test_pad_builds_attention_mask():
+    encoded = FixedLogitsBackend([[0.0, 1.0]])._pad([[5, 6, 7], [8]])
+    assert encoded["input_ids"].tolist() == [[5, 6, 7], [8, 0, 0]]
+    assert encoded["attention_mask"].tolist() == [[1, 1, 1], [1, 0, 0]]
+
+
+def test_windows_are_wrapped_like_truncated_inputs(tmp_path):
+    from transformers import BertTokenizerFast
+
+    vocab_file = tmp_path / "vocab.txt"
+    vocab_file.write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", "good"]), encoding="utf-8")
+    backend = InferenceBackend()
+    backend.tokenizer = BertTokenizerFast(vocab_file=str(vocab_file))
+    backend.max_length = 6
+
+    text = "good " * 20
+    content = backend.tokenize_untruncated([text])[0]
+    assert len(content) == 20
+    assert backend.num_special_tokens == 2
+    assert backend.with_special_tokens(content[:4]) == backend.tokenize([text])[0]
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        load_backend("tensorflow")
+
+
+@pytest.fixture
+def fake_quantization(monkeypatch):
+    """onnxruntime.quantization stand-in: copies the model slowly, records each call."""
+    calls = []
+
+    def quantize_dynamic(model_input, model_output, weight_type=None):
+        calls.append(model_output)
+        with open(model_output, "wb") as f:
+            f.write(b"int8")
+            f.flush()
+            time.sleep(0.05)
+            if "fail" in model_input:
+                raise RuntimeError("quantization failed")
+            f.write(b" model")
+
+    module = types.SimpleNamespace(QuantType=types.SimpleNamespace(QInt8="QInt8"), quantize_dynamic=quantize_dynamic)
+    monkeypatch.setitem(sys.modules, "onnxruntime.quantization", module)
+    return calls
+
+
+def test_concurrent_quantizations_publish_one_complete_file(tmp_path, fake_quantization):
+    model_path = str(tmp_path / "model.onnx")
+    seen = []
+
+    def load():
+        path = quantize_onnx(model_path)
+        with open(path, "rb") as f:
+            seen.append(f.read())
+
+    threads = [threading.Thread(target=load) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(fake_quantization) == 1
+    assert fake_quantization[0] != str(tmp_path / "model.int8.onnx")
+    assert seen == [b"int8 model"] * 4
+    assert sorted(os.listdir(tmp_path)) == ["model.int8.onnx", "model.int8.onnx.lock"]
+
+
+def test_failed_quantization_leaves_no_model(tmp_path, fake_quantization):
+    model_path = str(tmp_path / "fail.onnx")
+    with pytest.raises(RuntimeError):
+        quantize_onnx(model_path)
+    assert os.listdir(tmp_path) == ["fail.int8.onnx.lock"]
+
+
+@pytest.fixture
+def tiny_model_dir(tmp_path):
+    """Randomly initialized DistilBERT saved locally, so no download is needed."""
+    pytest.importorskip("torch")
+    from transformers import (
+        BertTokenizerFast,
+        DistilBertConfig,
+        DistilBertForSequenceClassification
+    )
+
+    words = ["create", "game", "architecture", "fix", "login", "bug", "great", "awful"]
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + words
+    vocab_file = tmp_path / "vocab.txt"
+    vocab_file.write_text("\n".join(vocab), encoding="utf-8")
+
+    model_dir = tmp_path / "tiny-distilbert"
+    BertTokenizerFast(vocab_file=str(vocab_file)).save_pretrained(str(model_dir))
+    config = DistilBertConfig(
+        vocab_size=len(vocab), dim=32, hidden_dim=64, n_layers=2, n_heads=2,
+        max_position_embeddings=64,
+        id2label={0: "NEGATIVE", 1: "POSITIVE"},
+        label2id={"NEGATIVE": 0, "POSITIVE": 1}
+    )
+    DistilBertForSequenceClassification(config).save_pretrained(str(model_dir))
+    return str(model_dir)
+
+
+def test_onnx_matches_torch(tiny_model_dir, tmp_path, monkeypatch):
+    pytest.importorskip("onnxruntime")
+    from app.service.backends import OnnxBackend, TorchBackend
+
+    monkeypatch.setattr(settings, "max_sequence_length", 64)
+    monkeypatch.setattr(settings, "onnx_model_dir", str(tmp_path / "onnx"))
+    texts = ["create game architecture", "fix login bug", "great", "awful awful bug game"]
+
+    torch_results = TorchBackend(tiny_model_dir).predict(texts)
+    onnx_results = OnnxBackend(tiny_model_dir).predict(texts)
+
+    assert [r["label"] for r in onnx_results] == [r["label"] for r in torch_results]
+    for onnx_result, torch_result in zip(onnx_results, torch_results):
+        assert onnx_result["score"] == pytest.approx(torch_result["score"], abs=1e-4)
@@ -0,0 +1,113 @@
+import csv
+import glob
+import json
+import os
+import pytest
+from app.batch import BatchJob, CheckpointError, main
+
+
+class FakeAnalyzer:
+    """Module-level so that worker processes can unpickle it."""
+
+    def analyze_texts(self, texts):
+        return [{"label": "positive", "score": round(len(text) / 100, 4)} for text in texts]
+
+
+class CrashingAnalyzer(FakeAnalyzer):
+    def analyze_texts(self, texts):
+        if "crash" in texts:
+            raise RuntimeError("worker died")
+        return super().analyze_texts(texts)
+
+
+def expected_line(row, record_id, text):
+    return {"row": row, "id": record_id, "sentiment": {"label": "positive", "score": round(len(text) / 100, 4)}}
+
+
+def read_jsonl(path):
+    with open(path, encoding="utf-8") as handle:
+        return [json.loads(line) for line in handle]
+
+
+@pytest.fixture
+def jsonl_input(tmp_path):
+    path = tmp_path / "input.jsonl"
+    lines = [json.dumps({"id": f"r{i}", "text": "x" * (i + 1)}) for i in range(23)]
+    lines.insert(5, "not json")
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def test_ordered_output_matches_input(jsonl_input, tmp_path):
+    output = str(tmp_path / "scores.jsonl")
+    report = BatchJob(jsonl_input, output, workers=0, chunk_size=4, analyzer_factory=FakeAnalyzer).run()
+
+    results = read_jsonl(output)
+    assert [r["row"] for r in results] == list(range(1, 25))
+    assert results[5] == {"row": 6, "id": None, "error": "Invalid JSON"}
+    assert results[0] == expected_line(1, "r0", "x")
+    assert report["rows"] == 24
+    assert not os.path.exists(output + ".checkpoint.json")
+
+
+def test_csv_input(tmp_path):
+    path = tmp_path / "input.csv"
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["key", "body"])
+        writer.writerows([["a", "Fix login bug"], ["b", ""], ["c", "Ship it"]])
+    output = str(tmp_path / "scores.jsonl")
+
+    BatchJob(str(path), output, text_field="body", id_field="key", workers=0,
+             analyzer_factory=FakeAnalyzer).run()
+
+    results = read_jsonl(output)
+    assert results[0] == expected_line(1, "a", "Fix login bug")
+    assert results[1]["error"] == "Missing or empty 'body' field"
+    assert results[2]["id"] == "c"
+
+
+def test_partitioned_output_across_processes(jsonl_input, tmp_path):
+    output_dir = str(tmp_path / "parts")
+    report = BatchJob(jsonl_input, output_dir, workers=2, chunk_size=5, partitioned=True,
+                      analyzer_factory=FakeAnalyzer).run()
+
+    parts = sorted(glob.glob(os.path.join(output_dir, "part-*.jsonl")))
+    assert len(parts) == 5
+    rows = [r["row"] for part in parts for r in read_jsonl(part)]
+    assert rows == list(range(1, 25))
+    assert sum(worker["rows"] for worker in report["per_worker"]) == 24
+    assert all(worker["rows_per_second"] > 0 for worker in report["per_worker"])
+    assert all(worker["pid"] != os.getpid() for worker in report["per_worker"])
+
+
+def test_interrupted_job_resumes_from_checkpoint(tmp_path):
+    path = tmp_path / "input.jsonl"
+    texts = [f"text {i}" for i in range(10)]
+    texts[7] = "crash"
+    path.write_text("".join(json.dumps({"id": i, "text": t}) + "\n" for i, t in enumerate(texts)))
+    output = str(tmp_path / "scores.jsonl")
+
+    with pytest.raises(RuntimeError):
+        BatchJob(str(path), output, workers=0, chunk_size=3, analyzer_factory=CrashingAnalyzer).run()
+    # Chunks 0 and 1 were saved before the crash in chunk 2
+    assert len(read_jsonl(output)) == 6
+    assert json.load(open(output + ".checkpoint.json"))["next_chunk"] == 2
+
+    with pytest.raises(CheckpointError):
+        BatchJob(str(path), output, workers=0, chunk_size=3, analyzer_factory=FakeAnalyzer).run()
+    with pytest.raises(CheckpointError):
+        BatchJob(str(path), output, workers=0, chunk_size=4, analyzer_factory=FakeAnalyzer).run(resume=True)
+
+    report = BatchJob(str(path), output, workers=0, chunk_size=3,
+                      analyzer_factory=FakeAnalyzer).run(resume=True)
+    assert report["skipped_chunks"] == 2
+    assert report["rows"] == 4
+    results = read_jsonl(output)
+    assert results == [expected_line(i + 1, i, text) for i, text in enumerate(texts)]
+
+
+def test_cli_rejects_unknown_extension(tmp_path, capsys):
+    with pytest.raises(SystemExit):
+        main([str(tmp_path / "input.txt"), str(tmp_path / "out.jsonl"), "--workers", "0"])
+    assert "pass --format" in capsys.readouterr().err
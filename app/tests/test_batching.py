@@ -0,0 +1,96 @@
+import asyncio
+import pytest
+from app.service.batching import BatchScheduler
+from app.service.executor import QueueFullError
+
+
+class FakeAnalyzer:
+    def __init__(self):
+        self.calls = []
+
+    async def analyze_texts(self, texts):
+        self.calls.append(list(texts))
+        return [{"label": "positive", "score": round(len(text) / 100, 4)} for text in texts]
+
+
+@pytest.fixture
+def analyzer():
+    return FakeAnalyzer()
+
+
+def run_concurrently(scheduler, texts):
+    async def scenario():
+        try:
+            return await asyncio.gather(*(scheduler.submit(text) for text in texts))
+        finally:
+            await scheduler.stop()
+    return asyncio.run(scenario())
+
+
+def test_concurrent_requests_share_batches(analyzer):
+    scheduler = BatchScheduler(analyzer.analyze_texts, max_batch_size=4, max_wait_ms=50)
+    texts = ["x" * i for i in range(1, 11)]
+
+    results = run_concurrently(scheduler, texts)
+
+    # Every caller gets the result of its own text
+    assert [r["score"] for r in results] == [round(len(t) / 100, 4) for t in texts]
+    assert [len(call) for call in analyzer.calls] == [4, 4, 2]
+    stats = scheduler.stats()
+    assert stats["batches"] == 3
+    assert stats["requests"] == 10
+    assert stats["batch_size_histogram"] == {2: 1, 4: 2}
+
+
+def test_wait_limit_flushes_partial_batch(analyzer):
+    scheduler = BatchScheduler(analyzer.analyze_texts, max_batch_size=64, max_wait_ms=1)
+
+    results = run_concurrently(scheduler, ["only one"])
+
+    assert len(results) == 1
+    assert analyzer.calls == [["only one"]]
+
+
+def test_batch_error_reaches_every_caller():
+    async def broken_runner(texts):
+        raise RuntimeError("inference failed")
+
+    scheduler = BatchScheduler(broken_runner, max_batch_size=8, max_wait_ms=10)
+
+    async def scenario():
+        try:
+            return await asyncio.gather(
+                *(scheduler.submit(text) for text in ["a", "b"]),
+                return_exceptions=True
+            )
+        finally:
+            await scheduler.stop()
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_submit_rejected_when_queue_is_full():
+    release = asyncio.Event()
+
+    async def slow_runner(texts):
+        await release.wait()
+        return [{"label": "positive", "score": 0.9} for _ in texts]
+
+    scheduler = BatchScheduler(slow_runner, max_batch_size=1, max_wait_ms=0, max_pending=2)
+
+    async def scenario():
+        try:
+            # One request is being scored, two fill the queue, the fourth is rejected
+            accepted = [asyncio.create_task(scheduler.submit("0"))]
+            await asyncio.sleep(0.01)
+            accepted += [asyncio.create_task(scheduler.submit(str(i))) for i in (1, 2)]
+            await asyncio.sleep(0.01)
+            with pytest.raises(QueueFullError):
+                await asyncio.wait_for(scheduler.submit("overflow"), timeout=1)
+            release.set()
+            return await asyncio.gather(*accepted)
+        finally:
+            await scheduler.stop()
+
+    assert len(asyncio.run(scenario())) == 3
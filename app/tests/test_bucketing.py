@@ -0,0 +1,41 @@
+from app.service.bucketing import (
+    PaddingStats,
+    padded_tokens,
+    plan_length_buckets,
+    sequential_buckets
+)
+
+
+def test_buckets_group_similar_lengths():
+    lengths = [3, 200, 4, 180, 5, 3]
+    buckets = plan_length_buckets(lengths, max_bucket_size=3)
+    assert buckets == [[0, 5, 2], [4, 3, 1]]
+    # Every index appears exactly once
+    assert sorted(i for bucket in buckets for i in bucket) == list(range(len(lengths)))
+
+
+def test_token_budget_splits_long_texts():
+    lengths = [2, 2, 100, 100, 100]
+    buckets = plan_length_buckets(lengths, max_bucket_size=8, max_bucket_tokens=200)
+    assert buckets == [[0, 1], [2, 3], [4]]
+
+
+def test_single_text_longer_than_budget_still_runs():
+    assert plan_length_buckets([500], max_bucket_size=4, max_bucket_tokens=100) == [[0]]
+
+
+def test_padded_tokens():
+    lengths = [3, 200, 4, 180]
+    assert padded_tokens(lengths, sequential_buckets(4, 4)) == 4 * 200 - 387
+    assert padded_tokens(lengths, [[0, 2], [3, 1]]) == 1 + 20
+
+
+def test_padding_stats_reports_savings():
+    stats = PaddingStats()
+    lengths = [3, 200, 4, 180]
+    batch = stats.record(lengths, plan_length_buckets(lengths, 2), batch_size=2)
+    # In order: [3, 200] and [4, 180] -> 197 + 176 padding; bucketed: [3, 4] and [180, 200] -> 1 + 20
+    assert batch["padded_tokens"] == 21
+    assert batch["padded_tokens_saved"] == 373 - 21
+    assert stats.stats()["padded_tokens_saved"] == 352
+    assert stats.stats()["batches"] == 1
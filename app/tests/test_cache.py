@@ -0,0 +1,73 @@
+import pytest
+from app.core.config import settings
+from app.service.cache import InferenceCache, model_identity
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_make_key_depends_on_model_and_text():
+    key = InferenceCache.make_key("create game architecture", "model-a")
+    assert key == InferenceCache.make_key("create game architecture", "model-a")
+    assert key != InferenceCache.make_key("create game architecture", "model-b")
+    assert key != InferenceCache.make_key("fix login bug", "model-a")
+
+
+def test_default_key_depends_on_backend_and_mode(monkeypatch):
+    fp32 = InferenceCache.make_key("create game")
+    assert fp32 == InferenceCache.make_key("create game", model_identity())
+    monkeypatch.setattr(settings, "model_mode", "quantized")
+    quantized = InferenceCache.make_key("create game")
+    monkeypatch.setattr(settings, "inference_backend", "onnx")
+    assert len({fp32, quantized, InferenceCache.make_key("create game")}) == 3
+
+
+def test_hit_and_miss_counters(clock):
+    cache = InferenceCache(max_entries=10, ttl_seconds=60, clock=clock)
+    assert cache.get("k") is None
+    cache.set("k", {"label": "positive", "score": 0.9})
+    assert cache.get("k") == {"label": "positive", "score": 0.9}
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_returned_results_are_copies(clock):
+    cache = InferenceCache(max_entries=10, ttl_seconds=60, clock=clock)
+    cache.set("k", {"label": "positive", "score": 0.9})
+    cache.get("k")["score"] = 0.1
+    assert cache.get("k")["score"] == 0.9
+
+
+def test_lru_eviction(clock):
+    cache = InferenceCache(max_entries=2, ttl_seconds=0, clock=clock)
+    cache.set("a", {"label": "positive", "score": 0.9})
+    cache.set("b", {"label": "negative", "score": 0.8})
+    cache.get("a")  # "b" becomes least recently used
+    cache.set("c", {"label": "positive", "score": 0.7})
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats()["evictions"] == 1
+    assert len(cache) == 2
+
+
+def test_ttl_expiration(clock):
+    cache = InferenceCache(max_entries=10, ttl_seconds=5, clock=clock)
+    cache.set("k", {"label": "positive", "score": 0.9})
+    clock.now = 4.0
+    assert cache.get("k") is not None
+    clock.now = 10.0
+    assert cache.get("k") is None
+    assert cache.stats()["expirations"] == 1
+    assert len(cache) == 0
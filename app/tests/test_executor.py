@@ -0,0 +1,67 @@
+import asyncio
+import threading
+import pytest
+from app.service.executor import InferenceExecutor, QueueFullError
+from app.service.model_registry import model_registry
+
+
+class FakeAnalyzer:
+    def __init__(self):
+        self.release = threading.Event()
+        self.release.set()
+
+    def analyze_texts(self, texts):
+        self.release.wait(timeout=5)
+        return [{"label": "positive", "score": 0.9} for _ in texts]
+
+
+@pytest.fixture
+def analyzer(monkeypatch):
+    monkeypatch.setattr(model_registry, "_factory", FakeAnalyzer)
+    yield model_registry.load()
+    model_registry.release()
+
+
+@pytest.fixture
+def executor():
+    executor = InferenceExecutor(kind="thread", max_workers=1, max_queue=1)
+    executor.start()
+    yield executor
+    executor.shutdown()
+
+
+def test_run_analyzer_off_the_event_loop(analyzer, executor):
+    async def scenario():
+        return await executor.run_analyzer("analyze_texts", ["a", "b"])
+
+    assert asyncio.run(scenario()) == [{"label": "positive", "score": 0.9}] * 2
+    stats = executor.stats()
+    assert stats["completed"] == 1
+    assert stats["in_flight"] == 0
+
+
+def test_rejects_when_workers_and_queue_are_full(analyzer, executor):
+    analyzer.release.clear()
+
+    async def scenario():
+        running = asyncio.create_task(executor.run_analyzer("analyze_texts", ["running"]))
+        queued = asyncio.create_task(executor.run_analyzer("analyze_texts", ["queued"]))
+        await asyncio.sleep(0.05)
+        assert executor.queue_depth == 1
+        with pytest.raises(QueueFullError) as error:
+            await executor.run_analyzer("analyze_texts", ["rejected"])
+        analyzer.release.set()
+        await asyncio.gather(running, queued)
+        return error.value
+
+    error = asyncio.run(scenario())
+    assert error.retry_after >= 0
+    stats = executor.stats()
+    assert stats["rejected"] == 1
+    assert stats["completed"] == 2
+    assert stats["max_wait_ms"] > 0
+
+
+def test_unknown_kind():
+    with pytest.raises(ValueError):
+        InferenceExecutor(kind="gpu")
@@ -0,0 +1,223 @@
+import random
+import pytest
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.main import app
+from app.service import pipeline_sentiment
+from app.service.graph_session import (
+    GraphSession,
+    GraphSessionStore,
+    SessionLimitError,
+    SessionNotFoundError,
+    graph_sessions
+)
+from app.service.model_registry import model_registry
+from app.service.pipeline_sentiment import SentimentAnalyzer
+from app.tests.benchmark import TinyBackend
+
+HEADERS = {"X-API-Key": settings.api_key}
+
+
+@pytest.fixture
+def analyzer(monkeypatch):
+    monkeypatch.setattr(pipeline_sentiment, "load_backend", TinyBackend)
+    monkeypatch.setattr(
+        pipeline_sentiment, "preprocess_batch", lambda texts: [t.lower().strip() for t in texts]
+    )
+    monkeypatch.setattr(settings, "persistent_cache_path", None)
+    analyzer = SentimentAnalyzer()
+    yield analyzer
+    analyzer.close()
+
+
+def apply(session, analyzer, delta):
+    """Apply a delta as the routes do; returns the result and the texts scored."""
+    texts = session.plan(delta)
+    result = session.apply(delta, dict(zip(texts, analyzer.analyze_texts(texts))))
+    return result, texts
+
+
+def random_delta(rng, nodes, edges, step):
+    """Random changes to the reference graph (dicts keyed by id), applied in place."""
+    delta = {"nodes": [], "removed_nodes": [], "edges": [], "removed_edges": []}
+    for node_id in rng.sample(sorted(nodes), min(len(nodes), rng.randint(0, 3))):
+        del nodes[node_id]
+        delta["removed_nodes"].append(node_id)
+    for edge_id in rng.sample(sorted(edges), min(len(edges), rng.randint(0, 3))):
+        del edges[edge_id]
+        delta["removed_edges"].append(edge_id)
+    for _ in range(rng.randint(1, 6)):
+        node_id = f"n{rng.randint(0, 40)}"
+        node = {"id": node_id, "text": f"text {rng.randint(0, 25)} good bad", "metadata": {"step": step}}
+        nodes[node_id] = node
+        delta["nodes"].append(node)
+    for _ in range(rng.randint(0, 6)):
+        edge_id = f"e{rng.randint(0, 60)}"
+        edge = {"id": edge_id, "source": f"n{rng.randint(0, 40)}", "target": f"n{rng.randint(0, 40)}",
+                "metadata": {"step": step}}
+        edges[edge_id] = edge
+        delta["edges"].append(edge)
+    return delta
+
+
+def test_random_deltas_match_a_full_analysis(analyzer):
+    rng = random.Random(7)
+    session = GraphSession("s")
+    nodes, edges = {}, {}
+    for step in range(60):
+        apply(session, analyzer, random_delta(rng, nodes, edges, step))
+        snapshot = session.snapshot()
+        expected = analyzer.analyze_graph(list(nodes.values()), list(edges.values()))
+
+        by_id = lambda results, key: {result[key]: result for result in results}
+        assert by_id(snapshot["nodes"], "node_id") == by_id(expected["nodes"], "node_id")
+        assert by_id(snapshot["edges"], "edge_id") == by_id(expected["edges"], "edge_id")
+        assert snapshot["metrics"] == expected["metrics"]
+    assert session.version == 60
+
+
+def test_only_new_and_changed_texts_are_scored(analyzer):
+    session = GraphSession("s")
+    _, scored = apply(session, analyzer, {
+        "nodes": [{"id": "a", "text": "good"}, {"id": "b", "text": "bad"}, {"id": "c", "text": "good"}],
+        "edges": [{"id": "ab", "source": "a", "target": "b"}, {"id": "bc", "source": "b", "target": "c"}]
+    })
+    assert scored == ["good", "bad"]
+
+    result, scored = apply(session, analyzer, {
+        "nodes": [{"id": "a", "text": "good", "metadata": {"pinned": True}}, {"id": "b", "text": "worse"}]
+    })
+    assert scored == ["worse"]
+    assert [node["node_id"] for node in result["nodes"]] == ["a", "b"]
+    assert result["nodes"][0]["metadata"] == {"pinned": True}
+    # Both edges touch b
+    assert [edge["edge_id"] for edge in result["edges"]] == ["ab", "bc"]
+
+    result, scored = apply(session, analyzer, {"removed_nodes": ["c"]})
+    assert scored == []
+    assert result["removed_nodes"] == ["c"]
+    assert result["removed_edges"] == ["bc"]
+    assert result["metrics"]["sentiment_distribution"]["positive_edges"] + \
+        result["metrics"]["sentiment_distribution"]["negative_edges"] == 1
+
+    # The dangling edge comes back with its node
+    result, scored = apply(session, analyzer, {"nodes": [{"id": "c", "text": "good"}]})
+    assert scored == ["good"]
+    assert [edge["edge_id"] for edge in result["edges"]] == ["bc"]
+
+
+def test_node_limit():
+    session = GraphSession("s", max_nodes=2)
+    with pytest.raises(SessionLimitError):
+        session.plan({"nodes": [{"id": i, "text": "t"} for i in "abc"]})
+    # Replacing a node in the same delta as a removal stays within the limit
+    session.apply({"nodes": [{"id": "a", "text": "t"}, {"id": "b", "text": "t"}]},
+                  {"t": {"label": "positive", "score": 0.9}})
+    assert session.plan({"removed_nodes": ["a"], "nodes": [{"id": "c", "text": "u"}]}) == ["u"]
+
+
+def test_edge_limit():
+    session = GraphSession("s", max_edges=2)
+    edge = lambda edge_id: {"id": edge_id, "source": "a", "target": "b"}
+    with pytest.raises(SessionLimitError):
+        session.plan({"edges": [edge("ab"), edge("bc"), edge("cd")]})
+    # An edge sent twice counts once
+    assert session.plan({"edges": [edge("ab"), edge("ab"), edge("bc")]}) == []
+    session.apply({"edges": [edge("ab"), edge("bc")]}, {})
+    with pytest.raises(SessionLimitError):
+        session.plan({"edges": [edge("cd")]})
+    # Edges of removed nodes stay in the session
+    with pytest.raises(SessionLimitError):
+        session.plan({"removed_nodes": ["a"], "edges": [edge("cd")]})
+    assert session.plan({"removed_edges": ["ab"], "edges": [edge("ab"), edge("bc")]}) == []
+    assert session.plan({"removed_edges": ["ab"], "edges": [edge("cd")]}) == []
+
+
+def test_edge_limits_on_routes(analyzer, monkeypatch):
+    monkeypatch.setattr(model_registry, "_factory", lambda: analyzer)
+    monkeypatch.setattr(settings, "warmup_on_startup", False)
+    monkeypatch.setattr(settings, "graph_session_max_edges", 2)
+    monkeypatch.setattr(settings, "graph_delta_max_edges", 2)
+    nodes = [{"id": "a", "text": "Create game"}, {"id": "b", "text": "Fix bug"}]
+    edges = [{"id": f"e{i}", "source": "a", "target": "b"} for i in range(3)]
+    with TestClient(app) as client:
+        too_large = client.post("/api/v1/inference/graph/sessions", json={"nodes": nodes, "edges": edges},
+                                headers=HEADERS)
+        created = client.post("/api/v1/inference/graph/sessions", json={"nodes": nodes, "edges": edges[:2]},
+                              headers=HEADERS)
+        url = f"/api/v1/inference/graph/sessions/{created.json()['metadata']['session_id']}"
+        large_delta = client.patch(url, json={"edges": edges}, headers=HEADERS)
+        over_limit = client.patch(url, json={"edges": edges[2:]}, headers=HEADERS)
+        replaced = client.patch(url, json={"removed_edges": ["e0"], "edges": edges[2:]}, headers=HEADERS)
+        client.delete(url, headers=HEADERS)
+
+    assert too_large.status_code == 422
+    assert "At most 2 edges per graph" in too_large.text
+    assert created.status_code == 201
+    assert large_delta.status_code == 422
+    assert "At most 2 edges per delta" in large_delta.text
+    assert over_limit.status_code == 400
+    assert "at most 2 edges" in over_limit.json()["detail"]
+    assert replaced.status_code == 200
+    assert graph_sessions.stats()["sessions"] == 0
+
+
+def test_store_evicts_least_recently_used_and_expires_idle_sessions():
+    now = [0.0]
+    store = GraphSessionStore(max_sessions=2, ttl_seconds=10.0, clock=lambda: now[0])
+    first, second = store.create(), store.create()
+    store.get(first.session_id)
+    third = store.create()
+    with pytest.raises(SessionNotFoundError):
+        store.get(second.session_id)
+    assert store.evictions == 1
+
+    now[0] = 5.0
+    store.get(third.session_id)
+    now[0] = 12.0
+    with pytest.raises(SessionNotFoundError):
+        store.get(first.session_id)
+    assert store.get(third.session_id) is third
+    assert store.stats()["sessions"] == 1
+    assert store.expirations == 1
+    assert store.delete(third.session_id) is True
+    assert store.delete(third.session_id) is False
+
+
+def test_session_routes(analyzer, monkeypatch):
+    monkeypatch.setattr(model_registry, "_factory", lambda: analyzer)
+    monkeypatch.setattr(settings, "warmup_on_startup", False)
+    body = {
+        "nodes": [{"id": "a", "text": "Create game"}, {"id": "b", "text": "Fix bug"}],
+        "edges": [{"id": "ab", "source": "a", "target": "b"}]
+    }
+    with TestClient(app) as client:
+        created = client.post("/api/v1/inference/graph/sessions", json=body, headers=HEADERS)
+        session_id = created.json()["metadata"]["session_id"]
+        url = f"/api/v1/inference/graph/sessions/{session_id}"
+        updated = client.patch(url, json={"nodes": [{"id": "c", "text": "Ship it"}],
+                                          "edges": [{"id": "bc", "source": "b", "target": "c"}],
+                                          "removed_edges": ["ab"]}, headers=HEADERS)
+        empty = client.patch(url, json={}, headers=HEADERS)
+        current = client.get(url, headers=HEADERS)
+        unauthorized = client.get(url, headers={"X-API-Key": "wrong"})
+        deleted = client.delete(url, headers=HEADERS)
+        missing = client.get(url, headers=HEADERS)
+
+    assert created.status_code == 201
+    assert created.json()["metadata"]["version"] == 1
+    assert [edge["edge_id"] for edge in created.json()["edges"]] == ["ab"]
+    assert updated.status_code == 200
+    assert [node["node_id"] for node in updated.json()["nodes"]] == ["c"]
+    assert [edge["edge_id"] for edge in updated.json()["edges"]] == ["bc"]
+    assert updated.json()["metadata"]["removed_edges"] == ["ab"]
+    assert empty.status_code == 422
+    full = analyzer.analyze_graph(
+        body["nodes"] + [{"id": "c", "text": "Ship it"}], [{"id": "bc", "source": "b", "target": "c"}]
+    )
+    assert current.json()["metrics"] == full["metrics"]
+    assert current.json()["metadata"]["version"] == 2
+    assert unauthorized.status_code in (401, 403)
+    assert deleted.status_code == 204
+    assert missing.status_code == 404
+    assert graph_sessions.stats()["sessions"] == 0
@@ -0,0 +1,115 @@
+import asyncio
+from fastapi.testclient import TestClient
+from app.main import app
+from app.service.executor import QueueFullError
+from app.service.health import HealthMonitor
+from app.service.model_registry import model_registry
+
+
+def make_self_test(outcomes):
+    """Self-test returning (or raising) the given outcomes in turn."""
+    calls = []
+
+    async def self_test():
+        outcome = outcomes[min(len(calls), len(outcomes) - 1)]
+        calls.append(outcome)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    return self_test, calls
+
+
+def test_status_before_first_check():
+    monitor = HealthMonitor(make_self_test([{}])[0], interval_seconds=60)
+    status = monitor.status()
+    assert status["healthy"] is None
+    assert status["checked_at"] is None
+    assert status["checks"] == 0
+
+
+def test_check_records_latest_result():
+    result = {"label": "positive", "score": 0.99}
+    monitor = HealthMonitor(make_self_test([result])[0], interval_seconds=60)
+
+    assert asyncio.run(monitor.check())
+    status = monitor.status()
+    assert status["healthy"] is True
+    assert status["result"] == result
+    assert status["checked_at"] is not None
+    assert status["duration_ms"] >= 0
+
+
+def test_failures_are_counted_and_recovered():
+    ok = {"label": "positive", "score": 0.9}
+    self_test, _ = make_self_test([RuntimeError("model crashed"), RuntimeError("model crashed"), ok])
+    monitor = HealthMonitor(self_test, interval_seconds=60)
+
+    async def scenario():
+        for _ in range(2):
+            assert not await monitor.check()
+        assert monitor.status()["consecutive_failures"] == 2
+        assert monitor.status()["error"] == "model crashed"
+        assert await monitor.check()
+
+    asyncio.run(scenario())
+    assert monitor.healthy is True
+    assert monitor.consecutive_failures == 0
+
+
+def test_full_queue_skips_the_check_and_keeps_the_previous_outcome():
+    ok = {"label": "positive", "score": 0.9}
+    self_test, _ = make_self_test([QueueFullError(), ok, QueueFullError(), RuntimeError("model crashed"), QueueFullError()])
+    monitor = HealthMonitor(self_test, interval_seconds=60)
+
+    async def scenario():
+        # Busy before the first check: still starting, not unhealthy
+        assert await monitor.check()
+        assert monitor.healthy is None
+        assert await monitor.check()
+        assert await monitor.check()
+        assert monitor.healthy is True
+        assert not await monitor.check()
+        assert not await monitor.check()
+
+    asyncio.run(scenario())
+    status = monitor.status()
+    assert status["skipped"] == 3
+    assert status["checks"] == 2
+    assert status["error"] == "model crashed"
+    assert status["consecutive_failures"] == 1
+
+
+def test_slow_self_test_times_out():
+    async def hanging_self_test():
+        await asyncio.sleep(10)
+
+    monitor = HealthMonitor(hanging_self_test, interval_seconds=60, timeout_seconds=0.01)
+    assert not asyncio.run(monitor.check())
+    assert monitor.healthy is False
+
+
+def test_background_task_runs_periodically():
+    self_test, calls = make_self_test([{"label": "positive", "score": 0.9}])
+    monitor = HealthMonitor(self_test, interval_seconds=0.01)
+
+    async def scenario():
+        await monitor.start()
+        await asyncio.sleep(0.1)
+        await monitor.stop()
+
+    asyncio.run(scenario())
+    assert len(calls) >= 2
+    assert not monitor.is_running
+
+
+def test_probes_do_not_need_the_model():
+    # Sans événement de démarrage, le modèle n'est pas chargé
+    model_registry.release()
+    client = TestClient(app)
+
+    assert client.get("/api/v1/inference/live").json() == {"status": "alive"}
+    response = client.get("/api/v1/inference/ready")
+    assert response.status_code == 503
+    assert response.json()["checks"]["model_loaded"] is False
+    assert "queue_depth" in response.json()
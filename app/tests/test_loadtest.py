@@ -0,0 +1,146 @@
+import asyncio
+import json
+import httpx
+import pytest
+from app.core.config import settings
+from app.loadtest import (
+    compare_reports,
+    latency_histogram,
+    load_requests,
+    main,
+    percentile,
+    replay,
+    run_load_test
+)
+from app.service.model_registry import model_registry
+
+
+class FakeAnalyzer:
+    def warmup(self):
+        pass
+
+    def self_test(self, text):
+        return {"label": "positive", "score": 0.9}
+
+    def analyze_texts(self, texts):
+        return [{"label": "positive", "score": 0.9} for _ in texts]
+
+
+def write_log(path, records):
+    path.write_text("\n".join(json.dumps(record) for record in records) + "\n")
+    return str(path)
+
+
+def mock_client(handler):
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://test")
+
+
+def test_load_requests_defaults_and_errors(tmp_path):
+    log = write_log(tmp_path / "log.jsonl", [
+        {"path": "/api/v1/inference/predict", "json": {"text": "Create game"}},
+        {"method": "get", "path": "/api/v1/inference/live", "headers": {"X-API-Key": "other"}}
+    ])
+    requests = load_requests(log)
+    assert requests[0]["method"] == "POST"
+    assert requests[0]["headers"]["X-API-Key"] == settings.api_key
+    assert requests[1]["method"] == "GET"
+    assert requests[1]["headers"]["X-API-Key"] == "other"
+
+    (tmp_path / "bad.jsonl").write_text('{"json": {}}\n')
+    with pytest.raises(ValueError, match="bad.jsonl:1"):
+        load_requests(str(tmp_path / "bad.jsonl"))
+
+
+def test_percentile_and_histogram():
+    values = [0.001 * i for i in range(1, 101)]
+    assert percentile(values, 50) == pytest.approx(0.0505)
+    assert percentile(values, 99) == pytest.approx(0.09901)
+    assert percentile([], 95) == 0.0
+
+    histogram = latency_histogram([0.0004, 0.002, 0.002, 30.0], buckets=(0.001, 0.01))
+    assert histogram == [
+        {"le_ms": 1.0, "count": 1},
+        {"le_ms": 10.0, "count": 2},
+        {"le_ms": "+Inf", "count": 1}
+    ]
+
+
+def test_replay_cycles_the_log_and_counts_statuses():
+    seen = []
+
+    def handler(request):
+        seen.append(request.url.path)
+        return httpx.Response(503 if request.url.path == "/busy" else 200)
+
+    requests = [
+        {"method": "POST", "path": "/ok", "json": {}, "headers": {}},
+        {"method": "POST", "path": "/busy", "json": {}, "headers": {}}
+    ]
+
+    async def scenario():
+        async with mock_client(handler) as client:
+            return await replay(client, requests, concurrency=3, total=10)
+
+    report = asyncio.run(scenario())
+    assert len(seen) == 10
+    assert report["status_counts"] == {"200": 5, "503": 5}
+    assert report["error_rate"] == 0.5
+    assert sum(bucket["count"] for bucket in report["histogram"]) == 10
+    assert report["latency_ms"]["p50"] <= report["latency_ms"]["p99"] <= report["latency_ms"]["max"]
+
+
+def test_replay_paces_requests_at_the_given_rate():
+    async def scenario():
+        async with mock_client(lambda request: httpx.Response(200)) as client:
+            return await replay(client, [{"method": "GET", "path": "/", "json": None, "headers": {}}],
+                                concurrency=4, total=11, rate=100.0)
+
+    # Request 10 is not sent before 100 ms
+    assert asyncio.run(scenario())["duration_s"] >= 0.1
+
+
+def test_compare_reports_flags_regressions():
+    previous = {"runs": [{"concurrency": 8, "rps": 200.0, "error_rate": 0.0,
+                          "latency_ms": {"p50": 10.0, "p95": 20.0, "p99": 40.0}}]}
+    current = {"runs": [
+        {"concurrency": 8, "rps": 150.0, "error_rate": 0.0,
+         "latency_ms": {"p50": 8.0, "p95": 30.0, "p99": 40.0}},
+        {"concurrency": 32, "rps": 300.0, "error_rate": 0.0,
+         "latency_ms": {"p50": 8.0, "p95": 30.0, "p99": 40.0}}
+    ]}
+    (level,) = compare_reports(current, previous)
+    values = level["values"]
+    assert level["concurrency"] == 8
+    assert values["rps"] == {"previous": 200.0, "current": 150.0, "change_pct": -25.0, "regression": True}
+    assert values["latency_ms.p50"]["regression"] is False
+    assert values["latency_ms.p95"]["regression"] is True
+    assert values["latency_ms.p99"]["regression"] is False
+
+
+def test_in_process_run_against_the_app(monkeypatch):
+    monkeypatch.setattr(model_registry, "_factory", FakeAnalyzer)
+    requests = [
+        {"method": "POST", "path": "/api/v1/inference/predict", "json": {"text": f"text {i}"},
+         "headers": {"X-API-Key": settings.api_key}}
+        for i in range(20)
+    ]
+    report = asyncio.run(run_load_test(requests, [1, 4]))
+    assert report["target"] == "in-process"
+    assert [run["concurrency"] for run in report["runs"]] == [1, 4]
+    assert all(run["status_counts"] == {"200": 20} for run in report["runs"])
+
+
+def test_cli_writes_report_and_comparison(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(model_registry, "_factory", FakeAnalyzer)
+    log = write_log(tmp_path / "log.jsonl", [
+        {"path": "/api/v1/inference/predict", "json": {"text": "Create game"}}
+    ])
+    first, second = tmp_path / "first.json", tmp_path / "second.json"
+    main([log, "--concurrency", "2", "--requests-per-run", "10", "--output", str(first)])
+    main([log, "--concurrency", "2", "--requests-per-run", "10", "--output", str(second),
+          "--compare", str(first)])
+
+    report = json.loads(second.read_text())
+    assert report["runs"][0]["requests"] == 10
+    assert report["comparison"][0]["concurrency"] == 2
+    assert "latency_ms.p95" in capsys.readouterr().out
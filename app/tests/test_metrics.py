@@ -0,0 +1,60 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.core.metrics import Counter, Gauge, Histogram, MetricsRegistry, stage_latency
+from app.main import app
+from app.utils.text_cleaner import _timed_stage
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("stage_seconds", "Stage time", labelnames=("stage",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        histogram.observe(value, stage="forward")
+
+    lines = histogram.render().splitlines()
+    assert lines[:2] == ["# HELP stage_seconds Stage time", "# TYPE stage_seconds histogram"]
+    assert 'stage_seconds_bucket{stage="forward",le="0.1"} 1' in lines
+    assert 'stage_seconds_bucket{stage="forward",le="1"} 3' in lines
+    assert 'stage_seconds_bucket{stage="forward",le="+Inf"} 4' in lines
+    assert 'stage_seconds_sum{stage="forward"} 4.25' in lines
+    assert 'stage_seconds_count{stage="forward"} 4' in lines
+
+
+def test_labels_are_checked_and_escaped():
+    counter = Counter("lookups_total", "Lookups", labelnames=("result",))
+    with pytest.raises(ValueError):
+        counter.inc(level="memory")
+    counter.inc(2, result='say "hi"\n')
+    assert 'lookups_total{result="say \\"hi\\"\\n"} 2' in counter.render()
+
+
+def test_unlabelled_metrics_start_at_zero():
+    assert Gauge("in_flight", "In flight").render().endswith("\nin_flight 0")
+    assert Counter("events_total", "Events").render().endswith("\nevents_total 0")
+
+
+def test_callback_gauge_reads_value_on_render():
+    depth = {"value": 3}
+    registry = MetricsRegistry()
+    registry.register(Gauge("queue_depth", "Queue depth", callback=lambda: depth["value"]))
+    assert "queue_depth 3" in registry.render()
+    depth["value"] = 7
+    assert "queue_depth 7" in registry.render()
+
+
+def test_timed_stage_excludes_consumer_time():
+    before = stage_latency.count(stage="clean")
+    assert list(_timed_stage(iter(["a", "b"]), "clean")) == ["a", "b"]
+    assert stage_latency.count(stage="clean") == before + 1
+
+
+def test_metrics_endpoint():
+    client = TestClient(app)
+    client.get("/api/v1/inference/live")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert "process_resident_memory_bytes " in body
+    assert "sentiment_batch_queue_depth 0" in body
+    assert 'route="/api/v1/inference/live",status="200"' in body
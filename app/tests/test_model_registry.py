@@ -0,0 +1,51 @@
+import pytest
+from app.service.model_registry import ModelRegistry, ModelNotReadyError
+
+
+class FakeAnalyzer:
+    instances = 0
+
+    def __init__(self):
+        FakeAnalyzer.instances += 1
+
+
+@pytest.fixture
+def registry():
+    FakeAnalyzer.instances = 0
+    return ModelRegistry(factory=FakeAnalyzer)
+
+
+def test_get_analyzer_before_load(registry):
+    assert not registry.is_ready
+    with pytest.raises(ModelNotReadyError):
+        registry.get_analyzer()
+
+
+def test_load_once(registry):
+    first = registry.load()
+    second = registry.load()
+    assert first is second
+    assert registry.get_analyzer() is first
+    assert FakeAnalyzer.instances == 1
+    assert registry.is_ready
+    assert registry.load_time_seconds is not None
+
+
+def test_release(registry):
+    registry.load()
+    registry.release()
+    assert not registry.is_ready
+    assert registry.status()["load_time_seconds"] is None
+    with pytest.raises(ModelNotReadyError):
+        registry.get_analyzer()
+
+
+def test_load_failure_is_reported(registry):
+    def broken_factory():
+        raise RuntimeError("boom")
+
+    failing = ModelRegistry(factory=broken_factory)
+    with pytest.raises(RuntimeError):
+        failing.load()
+    assert not failing.is_ready
+    assert failing.status()["last_error"] == "boom"
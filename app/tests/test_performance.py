@@ -1,60 +1,44 @@
-import time
+import asyncio
+import re
+import httpx
 import pytest
-from app.utils.text_cleaner import TextCleaner
-
-class PerformanceMetrics:
-    @staticmethod
-    def measure_time(func, *args, **kwargs):
-        """Mesure le temps d'exécution d'une fonction."""
-        start_time = time.time()
-        result = func(*args, **kwargs)
-        end_time = time.time()
-        return result, end_time - start_time
-
-def test_processing_speed(text_cleaner):
-    """Test la vitesse de traitement d'un texte long."""
-    # Création d'un texte long pour le test
+from app.core.config import settings
+from app.main import app
+from app.service import pipeline_sentiment
+from app.service.model_registry import model_registry
+from app.service.pipeline_sentiment import SentimentAnalyzer
+from app.utils.text_cleaner import regex_clean_text
+from app.tests.benchmark import TinyBackend, synthetic_graph, synthetic_texts
+
+# Textes de test_batch_processing, réutilisés par le micro-benchmark du nettoyage
+BATCH_TEXTS = [
+    "Hello! This is a test #hashtag @mention http://example.com",
+    "RT @user: The quick brown fox #jumps over the lazy dog!",
+    "This is a test with émojis 😊 and special chars @#$%",
+    "the quick brown fox jumps over the lazy dog",
+    "running jumping swimming"
+]
+
+def test_benchmark_clean_long_text(text_cleaner, benchmark):
+    """Benchmark : nettoyage complet d'un texte long."""
     long_text = "This is a test " * 1000
-    
-    # Mesure du temps de traitement
-    _, processing_time = PerformanceMetrics.measure_time(
-        text_cleaner.preprocess_text, 
-        long_text
-    )
-    
-    # Vérification que le traitement est rapide
-    assert processing_time < 5.0, f"Le traitement a pris {processing_time:.2f} secondes, ce qui est trop long"
-
-def test_batch_processing(text_cleaner):
-    """Test le traitement par lots de plusieurs textes."""
-    # Création d'un ensemble de textes de test
-    test_texts = [
-        "Hello! This is a test #hashtag @mention http://example.com",
-        "RT @user: The quick brown fox #jumps over the lazy dog!",
-        "This is a test with émojis 😊 and special chars @#$%",
-        "the quick brown fox jumps over the lazy dog",
-        "running jumping swimming"
-    ] * 20  # Répéter 20 fois pour un test significatif
-    
-    # Mesure du temps de traitement par lots
-    start_time = time.time()
-    results = []
-    for text in test_texts:
-        result = text_cleaner.preprocess_text(text)
-        results.append(result)
-    total_time = time.time() - start_time
-    
-    # Vérifications
-    assert len(results) == len(test_texts), "Tous les textes n'ont pas été traités"
-    assert total_time < 10.0, f"Le traitement par lots a pris {total_time:.2f} secondes, ce qui est trop long"
+    benchmark("cleaner.preprocess_text_long", lambda: text_cleaner.preprocess_text(long_text), repeat=5)
+
+def test_benchmark_clean_batch(text_cleaner, benchmark):
+    """Benchmark : nettoyage par lots (nlp.pipe) de textes courts."""
+    test_texts = BATCH_TEXTS * 20
+    results = list(text_cleaner.preprocess_batch(test_texts))
     
     # Vérification de la qualité du traitement
+    assert len(results) == len(test_texts), "Tous les textes n'ont pas été traités"
     for result in results:
         assert isinstance(result, str), "Le résultat n'est pas une chaîne de caractères"
         assert result.islower(), "Le texte n'est pas en minuscules"
         assert "http" not in result, "Les URLs n'ont pas été supprimées"
         assert "@" not in result, "Les mentions n'ont pas été supprimées"
         assert "#" not in result, "Les hashtags n'ont pas été supprimés"
+    
+    benchmark("cleaner.preprocess_batch_100", lambda: list(text_cleaner.preprocess_batch(test_texts)), repeat=5)
 
 def test_memory_efficiency(text_cleaner):
     """Test l'efficacité mémoire en traitant un grand nombre de textes."""
@@ -85,3 +69,106 @@ def test_error_handling(text_cleaner):
     # Test avec une liste
     result = text_cleaner.preprocess_text(["test"])
     assert result == "", "La liste n'a pas été gérée correctement"
+
+
+def legacy_clean_text(text):
+    """Nettoyage d'origine : cinq re.sub successifs sur des motifs non compilés."""
+    text = re.sub(r"http\S+|www\S+", "", text)
+    text = re.sub(r"@\S+", "", text)
+    text = re.sub(r"#\S+", "", text)
+    text = re.sub(r"[^a-zA-Z0-9\s]", "", text)
+    text = re.sub(r"\s+", " ", text)
+    return text.lower().strip()
+
+def test_regex_cleaning_matches_legacy():
+    """La passe regex fusionnée et précompilée donne le même résultat que l'implémentation d'origine."""
+    test_texts = BATCH_TEXTS * 20
+    assert [regex_clean_text(t) for t in test_texts] == [legacy_clean_text(t) for t in test_texts]
+
+def test_benchmark_regex_cleaning(benchmark):
+    """Benchmark apparié : passe regex précompilée contre l'implémentation d'origine, sur 100 textes courts."""
+    test_texts = BATCH_TEXTS * 20
+    legacy = benchmark("cleaner.clean_text_legacy_100", lambda: [legacy_clean_text(t) for t in test_texts], number=20)
+    fast = benchmark("cleaner.clean_text_100", lambda: [regex_clean_text(t) for t in test_texts], number=20)
+    assert fast["median_s"] < legacy["median_s"], "La passe précompilée n'est pas plus rapide que l'implémentation d'origine"
+
+
+# Modèle : petit backend local (app.tests.benchmark.TinyBackend), sans réseau ni
+# poids à télécharger. Le nettoyage spaCy, mesuré plus haut, est remplacé par un
+# nettoyage minimal, et les caches sont désactivés pour mesurer le calcul.
+@pytest.fixture
+def analyzer(monkeypatch):
+    monkeypatch.setattr(pipeline_sentiment, "load_backend", TinyBackend)
+    monkeypatch.setattr(
+        pipeline_sentiment, "preprocess_batch", lambda texts: [t.lower().strip() for t in texts]
+    )
+    monkeypatch.setattr(settings, "cache_enabled", False)
+    monkeypatch.setattr(settings, "token_cache_max_tokens", 0)
+    monkeypatch.setattr(settings, "persistent_cache_path", None)
+    analyzer = SentimentAnalyzer()
+    yield analyzer
+    analyzer.close()
+
+def test_benchmark_analyze_texts(analyzer, benchmark):
+    """Benchmark : tokenisation, lots par longueur et passe du modèle sur 512 textes."""
+    texts = synthetic_texts(512)
+    assert len(analyzer.analyze_texts(texts)) == len(texts)
+    benchmark("analyzer.analyze_texts_512", lambda: analyzer.analyze_texts(texts))
+
+@pytest.mark.parametrize("node_count", [100, 1000, 5000])
+def test_benchmark_analyze_graph(analyzer, benchmark, node_count):
+    """Benchmark : analyse de graphes synthétiques de taille croissante (2 edges par node)."""
+    nodes, edges = synthetic_graph(node_count)
+    result = analyzer.analyze_graph(nodes, edges)
+    assert len(result["nodes"]) == node_count
+    benchmark(f"analyzer.analyze_graph_{node_count}", lambda: analyzer.analyze_graph(nodes, edges), repeat=5)
+
+def test_benchmark_graph_aggregation(analyzer, benchmark, monkeypatch):
+    """Benchmark : edges et métriques d'un graphe de 100 000 edges, scores des nodes déjà connus."""
+    nodes, edges = synthetic_graph(10000, edges_per_node=10)
+    texts = [node["text"] for node in nodes]
+    sentiments = dict(zip(texts, analyzer.analyze_texts(texts)))
+    monkeypatch.setattr(analyzer, "analyze_texts", lambda texts: [sentiments[text] for text in texts])
+    assert len(analyzer.analyze_graph(nodes, edges)["edges"]) == len(edges)
+    benchmark(
+        "analyzer.graph_aggregation_100000_edges",
+        lambda: analyzer.analyze_graph(nodes, edges),
+        repeat=3
+    )
+
+def test_benchmark_graph_response(analyzer, benchmark):
+    """Benchmark : mise en forme et encodage JSON de la réponse d'un graphe de 10 000 nodes."""
+    from app.api.routes import build_graph_response
+    
+    nodes, edges = synthetic_graph(10000)
+    result = analyzer.analyze_graph(nodes, edges)
+    benchmark(
+        "api.build_graph_response_10000",
+        lambda: build_graph_response(result["nodes"], result["edges"], result["metrics"]),
+        repeat=5
+    )
+
+def test_benchmark_api_throughput(analyzer, benchmark, monkeypatch):
+    """Benchmark de bout en bout (ASGI) : rafales de 64 requêtes /predict concurrentes."""
+    monkeypatch.setattr(model_registry, "_factory", lambda: analyzer)
+    monkeypatch.setattr(settings, "warmup_on_startup", False)
+    model_registry.release()
+    texts = synthetic_texts(64)
+    headers = {"X-API-Key": settings.api_key}
+    
+    async def burst(client):
+        responses = await asyncio.gather(*(
+            client.post("/api/v1/inference/predict", json={"text": text}, headers=headers)
+            for text in texts
+        ))
+        assert all(response.status_code == 200 for response in responses)
+    
+    loop = asyncio.new_event_loop()
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+    loop.run_until_complete(app.router.startup())
+    try:
+        benchmark("api.predict_burst_64", lambda: loop.run_until_complete(burst(client)), repeat=5)
+    finally:
+        loop.run_until_complete(client.aclose())
+        loop.run_until_complete(app.router.shutdown())
+        loop.close()
@@ -0,0 +1,102 @@
+import json
+import pytest
+from app.service.persistent_cache import (
+    PersistentSentimentCache,
+    iter_jsonl_texts,
+    prefill_from_jsonl
+)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "cache" / "sentiments.db")
+
+
+def test_results_are_shared_between_instances(db_path):
+    writer = PersistentSentimentCache(db_path)
+    writer.set_many({"k1": {"label": "positive", "score": 0.91}})
+
+    # A second instance stands in for another uvicorn worker
+    reader = PersistentSentimentCache(db_path)
+    assert reader.get_many(["k1", "k2"]) == {"k1": {"label": "positive", "score": 0.91}}
+    assert reader.stats()["hits"] == 1
+    assert reader.stats()["misses"] == 1
+
+
+def test_compaction_drops_oldest_entries(db_path):
+    cache = PersistentSentimentCache(db_path, max_bytes=1, compaction_check_interval=10**9)
+    cache.set_many({f"old{i}": {"label": "negative", "score": 0.6} for i in range(50)})
+    cache.set_many({f"new{i}": {"label": "positive", "score": 0.9} for i in range(50)})
+
+    removed = cache.compact(keep_ratio=0.5)
+
+    assert removed == 50
+    assert cache.count() == 50
+    assert cache.get_many(["old0", "new0"]) == {"new0": {"label": "positive", "score": 0.9}}
+
+
+def test_writes_start_compaction_in_the_background(db_path, monkeypatch):
+    cache = PersistentSentimentCache(db_path, max_bytes=1, compaction_check_interval=10)
+    calls = []
+    monkeypatch.setattr(cache, "compact_in_background", lambda: calls.append(1))
+    cache.set_many({f"k{i}": {"label": "positive", "score": 0.9} for i in range(5)})
+    assert calls == []
+    cache.set_many({f"m{i}": {"label": "positive", "score": 0.9} for i in range(5)})
+    assert calls == [1]
+    assert cache.count() == 10
+
+    monkeypatch.undo()
+    thread = cache.compact_in_background()
+    thread.join(timeout=10)
+    assert cache.count() == 7
+
+
+def test_stats_without_refresh_do_not_query_the_store(db_path, monkeypatch):
+    cache = PersistentSentimentCache(db_path)
+    cache.set_many({"k": {"label": "positive", "score": 0.9}})
+    assert cache.stats(refresh=False)["entries"] == 0
+    assert cache.stats()["entries"] == 1
+
+    monkeypatch.setattr(cache, "count", lambda: pytest.fail("stats(refresh=False) counted the entries"))
+    monkeypatch.setattr(cache, "size_bytes", lambda: pytest.fail("stats(refresh=False) read the file size"))
+    assert cache.stats(refresh=False)["entries"] == 1
+
+
+def test_no_compaction_under_size_limit(db_path):
+    cache = PersistentSentimentCache(db_path, max_bytes=10 * 1024 * 1024)
+    cache.set_many({"k": {"label": "positive", "score": 0.9}})
+    assert cache.compact() == 0
+    assert cache.count() == 1
+
+
+def test_iter_jsonl_texts(tmp_path):
+    path = tmp_path / "requests.jsonl"
+    path.write_text(
+        json.dumps({"title": "Create Game", "body": "Architecture"}) + "\n"
+        + "\n"
+        + "not json\n"
+        + json.dumps({"title": "", "body": "Fix login bug"}) + "\n",
+        encoding="utf-8"
+    )
+    assert list(iter_jsonl_texts(str(path), ["title", "body"])) == [
+        "Create Game", "Architecture", "Fix login bug"
+    ]
+
+
+def test_prefill_scores_every_text_in_batches(tmp_path, db_path):
+    path = tmp_path / "requests.jsonl"
+    path.write_text(
+        "\n".join(json.dumps({"text": f"text {i}"}) for i in range(5)),
+        encoding="utf-8"
+    )
+
+    class FakeAnalyzer:
+        persistent_cache = PersistentSentimentCache(db_path)
+        calls = []
+
+        def analyze_texts(self, texts):
+            self.calls.append(list(texts))
+
+    analyzer = FakeAnalyzer()
+    assert prefill_from_jsonl(analyzer, str(path), batch_size=2) == 5
+    assert [len(call) for call in analyzer.calls] == [2, 2, 1]
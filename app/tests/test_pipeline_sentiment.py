@@ -0,0 +1,233 @@
+import numpy as np
+import pytest
+from app.core.config import settings
+from app.core.metrics import cache_lookups, stage_latency
+from app.service import pipeline_sentiment
+from app.service.pipeline_sentiment import (
+    GraphArrays,
+    SentimentAnalyzer,
+    build_edge_analysis,
+    compute_graph_metrics,
+    mean_units
+)
+
+
+class StubBackend:
+    """Scores texts with an odd word count as positive; records every forward batch size."""
+
+    name = "stub"
+
+    def __init__(self):
+        self.batches = []
+
+    max_length = 6
+    num_special_tokens = 2
+
+    def tokenize(self, texts):
+        return [[1] * len(text.split()) for text in texts]
+
+    def tokenize_untruncated(self, texts):
+        return [[1] * len(text.split()) for text in texts]
+
+    def with_special_tokens(self, token_ids):
+        return [0] + list(token_ids) + [0]
+
+    def predict_ids(self, token_ids):
+        self.batches.append(len(token_ids))
+        return [
+            {"label": "POSITIVE", "score": 0.9} if len(ids) % 2 else {"label": "NEGATIVE", "score": 0.2}
+            for ids in token_ids
+        ]
+
+
+@pytest.fixture
+def analyzer(monkeypatch):
+    monkeypatch.setattr(pipeline_sentiment, "load_backend", StubBackend)
+    monkeypatch.setattr(
+        pipeline_sentiment, "preprocess_batch", lambda texts: [t.lower().strip() for t in texts]
+    )
+    monkeypatch.setattr(settings, "persistent_cache_path", None)
+    analyzer = SentimentAnalyzer()
+    yield analyzer
+    analyzer.close()
+
+
+def test_analyze_text(analyzer):
+    assert analyzer.analyze_text("Create game") == {"label": "negative", "score": 0.2}
+    assert analyzer.analyze_text("Create game now") == {"label": "positive", "score": 0.9}
+
+
+def test_warmup_runs_one_forward_pass_without_caching(analyzer, monkeypatch):
+    cleaners = []
+    monkeypatch.setattr(pipeline_sentiment, "get_text_cleaner", lambda: cleaners.append(True))
+    analyzer.warmup()
+    assert cleaners == [True]
+    assert analyzer.backend.batches == [1]
+    assert len(analyzer.cache) == 0
+
+
+def test_self_test_bypasses_the_caches(analyzer):
+    first = analyzer.self_test("Test health check")
+    second = analyzer.self_test("Test health check")
+    assert first == second == {"label": "positive", "score": 0.9}
+    assert analyzer.backend.batches == [1, 1]
+    assert len(analyzer.cache) == 0
+    assert analyzer.tokenization.stats()["cached_texts"] == 0
+
+
+def test_self_test_tokenizes_under_the_shared_tokenizer_lock(analyzer, monkeypatch):
+    held = []
+    tokenize = analyzer.backend.tokenize
+    lock = analyzer.tokenization.tokenizer_lock
+    monkeypatch.setattr(analyzer.tokenization, "_tokenize", lambda texts: held.append(lock.locked()) or tokenize(texts))
+    analyzer.self_test("Test health check")
+    assert held == [True]
+
+
+def test_results_keep_input_order(analyzer):
+    texts = ["one", "one two", "one two three", "x", "a b c d"]
+    results = analyzer.analyze_texts(texts)
+    expected = ["positive", "negative", "positive", "positive", "negative"]
+    assert [r["label"] for r in results] == expected
+
+
+def test_repeated_texts_hit_the_cache(analyzer):
+    hits = cache_lookups.value(level="memory", result="hit")
+    forward_passes = stage_latency.count(stage="forward")
+    analyzer.analyze_text("Create Game – Architecture")
+    analyzer.analyze_text("Create Game – Architecture")
+    assert analyzer.cache.stats()["hits"] == 1
+    assert sum(analyzer.backend.batches) == 1
+    assert cache_lookups.value(level="memory", result="hit") == hits + 1
+    assert stage_latency.count(stage="forward") == forward_passes + 1
+
+
+def test_persistent_results_are_not_shared_across_model_modes(monkeypatch, tmp_path):
+    class ModeBackend(StubBackend):
+        def __init__(self):
+            super().__init__()
+            self.mode = settings.model_mode
+
+    monkeypatch.setattr(pipeline_sentiment, "load_backend", ModeBackend)
+    monkeypatch.setattr(
+        pipeline_sentiment, "preprocess_batch", lambda texts: [t.lower().strip() for t in texts]
+    )
+    monkeypatch.setattr(settings, "cache_enabled", False)
+    monkeypatch.setattr(settings, "persistent_cache_path", str(tmp_path / "sentiments.db"))
+
+    fp32 = SentimentAnalyzer()
+    fp32.analyze_texts(["create game"])
+    monkeypatch.setattr(settings, "model_mode", "quantized")
+    quantized = SentimentAnalyzer()
+    quantized.analyze_texts(["create game"])
+    again = SentimentAnalyzer()
+    again.analyze_texts(["create game"])
+
+    # The quantized analyzer scores the text itself, then shares it with its own mode only
+    assert fp32.backend.batches == [1]
+    assert quantized.backend.batches == [1]
+    assert again.backend.batches == []
+    rows = quantized.persistent_cache._connection().execute("SELECT model FROM sentiments ORDER BY model")
+    assert [model for (model,) in rows] == [fp32.model_identity, quantized.model_identity]
+    assert quantized.model_identity.endswith("|quantized")
+    for analyzer in (fp32, quantized, again):
+        analyzer.close()
+
+
+def test_analyze_graph_scores_each_node_once(analyzer):
+    nodes = [
+        {"id": "a", "text": "fix login bug"},
+        {"id": "b", "text": "create game"},
+        {"id": "c", "text": "fix login bug"},
+    ]
+    edges = [
+        {"id": "ab", "source": "a", "target": "b"},
+        {"id": "bc", "source": "b", "target": "c"},
+        {"id": "ax", "source": "a", "target": "missing"},
+    ]
+
+    result = analyzer.analyze_graph(nodes, edges)
+
+    # Two distinct texts, scored in one pass; edges reuse node scores
+    assert sum(analyzer.backend.batches) == 2
+    assert [e["edge_id"] for e in result["edges"]] == ["ab", "bc"]
+    assert result["edges"][0]["sentiment"] == {"label": "positive", "score": 0.55}
+    assert result["edges"][0]["connected_nodes"] == ["a", "b"]
+    assert result["metrics"] == {
+        "average_node_sentiment": round((0.9 + 0.2 + 0.9) / 3, 4),
+        "average_edge_sentiment": 0.55,
+        "sentiment_distribution": {
+            "positive_nodes": 2,
+            "negative_nodes": 1,
+            "positive_edges": 2,
+            "negative_edges": 0
+        }
+    }
+
+
+def test_edge_mean_is_computed_in_score_units():
+    # Odd pair sums are exact half units, rounded up, for scalars and arrays alike
+    assert mean_units(9001, 2) == 4501
+    assert mean_units(9000, 2) == 4500
+    assert mean_units(np.array([1, 3, 4]), 2).tolist() == [1, 2, 2]
+    node = lambda score: {"node_id": "n", "sentiment": {"label": "positive", "score": score}}
+    assert build_edge_analysis({"id": "e"}, [node(0.0001), node(0.0002)])["sentiment"]["score"] == 0.0002
+    # Exactly 0.5 is not positive
+    assert build_edge_analysis({"id": "e"}, [node(0.4999), node(0.5001)])["sentiment"] == {
+        "label": "negative", "score": 0.5
+    }
+    assert build_edge_analysis({"id": "e"}, [node(0.4999), node(0.5002)])["sentiment"] == {
+        "label": "positive", "score": 0.5001
+    }
+
+
+def test_graph_arrays_match_per_edge_results():
+    rng = np.random.default_rng(1)
+    texts = [f"text {i}" for i in range(50)]
+    sentiments = {
+        text: {"label": "positive" if score > 0.5 else "negative", "score": score}
+        for text, score in zip(texts, (rng.integers(0, 10001, len(texts)) / 10000).tolist())
+    }
+    nodes = [{"id": f"n{i % 180}", "text": texts[i % 50], "metadata": {"i": i}} for i in range(200)]
+    edges = [
+        {"id": f"e{i}", "source": f"n{source}", "target": f"n{target}"}
+        for i, (source, target) in enumerate(rng.integers(0, 190, (1000, 2)).tolist())
+    ]
+
+    graph = GraphArrays(nodes, edges, sentiments)
+    node_analyses = [
+        {"node_id": node["id"], "sentiment": dict(sentiments[node["text"]]), "metadata": node["metadata"]}
+        for node in nodes
+    ]
+    # Duplicate ids: edges use the last node with the id
+    by_id = {analysis["node_id"]: analysis for analysis in node_analyses}
+    edge_analyses = [
+        build_edge_analysis(edge, [by_id[edge["source"]], by_id[edge["target"]]])
+        for edge in edges if edge["source"] in by_id and edge["target"] in by_id
+    ]
+    assert graph.node_analyses() == node_analyses
+    assert graph.edge_analyses() == edge_analyses
+    assert len(edge_analyses) < len(edges)
+    assert graph.metrics() == compute_graph_metrics(node_analyses, edge_analyses)
+
+    empty = GraphArrays([], [], {})
+    assert empty.edge_analyses() == []
+    assert empty.metrics() == compute_graph_metrics([], [])
+
+
+def test_long_text_is_scored_in_overlapping_windows(analyzer, monkeypatch):
+    monkeypatch.setattr(settings, "long_text_window_overlap", 1)
+    # 9 words, windows of 4 content tokens overlapping by 1: 0-4, 3-7, 6-9
+    result = analyzer.analyze_long_text("w " * 9, aggregation="max_confidence")
+    assert result["chunks"] == 3
+    assert result["aggregation"] == "max_confidence"
+    assert sorted(analyzer.backend.batches) == [3]
+
+
+def test_long_texts_share_one_pass_and_keep_order(analyzer, monkeypatch):
+    monkeypatch.setattr(settings, "long_text_window_overlap", 0)
+    results = analyzer.analyze_long_texts(["a b c", "w " * 12, "a b"], aggregation="mean")
+    assert [r["chunks"] for r in results] == [1, 3, 1]
+    # A text that fits in one window gets the same result as analyze_texts
+    assert {"label": results[0]["label"], "score": results[0]["score"]} == analyzer.analyze_text("a b c")
+    assert analyzer.backend.batches[0] == 5
@@ -0,0 +1,192 @@
+import asyncio
+import os
+import pstats
+import threading
+import pytest
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.core.metrics import stage_latency
+from app.core.profiling import (
+    RequestProfile,
+    active_profile,
+    in_profile_context,
+    prune_dumps,
+    record_stage,
+    run_profiled
+)
+from app.main import app
+from app.service.batching import BatchScheduler
+from app.service.model_registry import model_registry
+
+HEADERS = {"X-API-Key": settings.api_key}
+
+
+class FakeAnalyzer:
+    """Records a forward stage per call, as the real pipeline does."""
+
+    def warmup(self):
+        pass
+
+    def self_test(self, text):
+        return {"label": "positive", "score": 0.9}
+
+    def analyze_texts(self, texts):
+        with stage_latency.time(stage="forward"):
+            return [{"label": "positive", "score": 0.9} for _ in texts]
+
+    def analyze_nodes(self, nodes):
+        sentiments = self.analyze_texts([node["text"] for node in nodes])
+        return [
+            {"node_id": node["id"], "sentiment": sentiment, "metadata": node["metadata"]}
+            for node, sentiment in zip(nodes, sentiments)
+        ]
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    monkeypatch.setattr(model_registry, "_factory", FakeAnalyzer)
+    monkeypatch.setattr(settings, "request_profiling_enabled", True)
+    monkeypatch.setattr(settings, "request_profiling_dump_dir", str(tmp_path))
+    with TestClient(app) as client:
+        yield client
+
+
+def test_stages_are_recorded_only_under_an_active_profile():
+    profile = RequestProfile()
+    record_stage(0.5, stage="forward")
+    with profile.activate():
+        assert active_profile() is profile
+        record_stage(0.25, stage="forward")
+        record_stage(0.25, stage="forward")
+    record_stage(0.5, stage="forward")
+
+    assert active_profile() is None
+    assert profile.stage_totals() == {"forward": (0.5, 2)}
+    assert profile.to_dict()["stages"] == {"forward": {"ms": 500.0, "calls": 2}}
+
+
+def test_profile_follows_work_to_another_thread():
+    profile = RequestProfile()
+    with profile.activate():
+        thread = threading.Thread(target=in_profile_context(record_stage), args=(0.1, "tokenize"))
+    thread.start()
+    thread.join()
+    assert profile.stage_totals() == {"tokenize": (0.1, 1)}
+
+
+def test_run_profiled_returns_stages_and_cprofile_stats():
+    def work(value):
+        record_stage(0.2, stage="forward")
+        return value * 2
+
+    result, stages, stats = run_profiled(work, 21, capture_cprofile=True)
+    assert result == 42
+    assert stages == {"forward": (0.2, 1)}
+    assert any(function[2] == "work" for function in stats)
+    assert run_profiled(work, 1)[2] is None
+
+
+def test_batched_requests_share_the_batch_stages():
+    async def runner(texts):
+        record_stage(0.3, stage="forward")
+        return [{"label": "positive", "score": 0.9} for _ in texts]
+
+    async def scenario():
+        scheduler = BatchScheduler(runner, max_batch_size=2, max_wait_ms=50)
+        profile = RequestProfile()
+
+        async def profiled_submit():
+            with profile.activate():
+                return await scheduler.submit("a")
+
+        await asyncio.gather(profiled_submit(), scheduler.submit("b"))
+        await scheduler.stop()
+        return profile
+
+    profile = asyncio.run(scenario())
+    stages = profile.stage_totals()
+    assert stages["forward"] == (0.3, 1)
+    assert stages["batch_queue"][1] == 1
+    assert profile.details["micro_batch_size"] == 2
+
+
+def test_profiled_request_reports_stages(client):
+    response = client.post(
+        "/api/v1/inference/predict/batch",
+        json={"texts": ["Create game", "Ship it"]},
+        headers={**HEADERS, "X-Profile": "timings"}
+    )
+    assert response.status_code == 200
+    profile = response.json()["metadata"]["profile"]
+    assert {"executor_queue", "forward", "response_build"} <= set(profile["stages"])
+    assert profile["total_ms"] >= profile["stages"]["forward"]["ms"]
+    assert "cprofile_path" not in profile
+
+
+def test_cprofile_dump_of_a_batched_request(client):
+    response = client.post(
+        "/api/v1/inference/predict?profile=cprofile",
+        json={"text": "Create game"},
+        headers=HEADERS
+    )
+    assert response.status_code == 200
+    profile = response.json()["metadata"]["profile"]
+    assert {"batch_queue", "forward"} <= set(profile["stages"])
+    assert profile["micro_batch_size"] == 1
+    stats = pstats.Stats(profile["cprofile_path"])
+    assert any(function[2] == "analyze_texts" for function in stats.stats)
+
+
+def test_requests_are_not_profiled_by_default(client):
+    response = client.post("/api/v1/inference/predict", json={"text": "Create game"}, headers=HEADERS)
+    assert response.status_code == 200
+    assert response.json()["metadata"] is None
+
+
+def test_profile_flag_needs_a_valid_mode_and_api_key(client):
+    response = client.post(
+        "/api/v1/inference/predict?profile=everything",
+        json={"text": "Create game"},
+        headers=HEADERS
+    )
+    assert response.status_code == 400
+    response = client.post(
+        "/api/v1/inference/predict?profile=timings",
+        json={"text": "Create game"},
+        headers={"X-API-Key": "wrong"}
+    )
+    assert response.status_code == 403
+
+
+def test_profiling_is_disabled_by_default(client, monkeypatch):
+    monkeypatch.setattr(settings, "request_profiling_enabled", type(settings)().request_profiling_enabled)
+    response = client.post(
+        "/api/v1/inference/predict?profile=cprofile",
+        json={"text": "Create game"},
+        headers=HEADERS
+    )
+    assert response.status_code == 200
+    assert response.json()["metadata"] is None
+
+
+def test_cprofile_dumps_are_capped(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "request_profiling_max_dumps", 2)
+    paths = []
+    for _ in range(4):
+        response = client.post(
+            "/api/v1/inference/predict?profile=cprofile",
+            json={"text": "Create game"},
+            headers=HEADERS
+        )
+        paths.append(response.json()["metadata"]["profile"]["cprofile_path"])
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(path) for path in paths[-2:])
+
+
+def test_prune_dumps_keeps_the_newest_and_other_files(tmp_path):
+    for index, name in enumerate(["a.prof", "b.prof", "c.prof", "notes.txt"]):
+        path = tmp_path / name
+        path.write_bytes(b"")
+        os.utime(path, (index, index))
+    assert prune_dumps(str(tmp_path), 1) == 2
+    assert sorted(os.listdir(tmp_path)) == ["c.prof", "notes.txt"]
+    assert prune_dumps(str(tmp_path), 0, keep=str(tmp_path / "c.prof")) == 0
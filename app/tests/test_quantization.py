@@ -0,0 +1,55 @@
+import json
+import pytest
+from app.service.quantization import evaluate_quantization, load_samples
+
+
+class FakeBackend:
+    """fp32 is always right; int8 flips the last sample and shifts scores slightly."""
+
+    def __init__(self, name, mode):
+        self.mode = mode
+
+    def predict(self, texts):
+        text = texts[0]
+        label = "POSITIVE" if "good" in text else "NEGATIVE"
+        score = 0.9
+        if self.mode == "quantized":
+            score = 0.88
+            if text == "good but flipped":
+                label = "NEGATIVE"
+        return [{"label": label, "score": score}]
+
+    def size_bytes(self):
+        return (4 if self.mode == "fp32" else 1) * 1024 * 1024
+
+
+def test_evaluate_quantization_report():
+    samples = [("good day", "positive"), ("bad day", "negative"), ("good but flipped", "positive")]
+
+    report = evaluate_quantization(samples, backend_name="torch", backend_factory=FakeBackend, warmup=0)
+
+    assert report["samples"] == 3
+    assert report["label_agreement"] == pytest.approx(2 / 3, abs=1e-4)
+    # Two samples drift by 0.02, the flipped one from P(pos)=0.9 to 0.12
+    assert report["mean_score_drift"] == pytest.approx((0.02 + 0.02 + 0.78) / 3, abs=1e-6)
+    assert report["modes"]["fp32"]["accuracy"] == 1.0
+    assert report["modes"]["quantized"]["accuracy"] == pytest.approx(2 / 3, abs=1e-4)
+    assert report["modes"]["fp32"]["size_mb"] == 4.0
+    assert report["modes"]["quantized"]["size_mb"] == 1.0
+    for mode in ("fp32", "quantized"):
+        assert report["modes"][mode]["p99_ms"] >= report["modes"][mode]["p50_ms"]
+
+
+def test_evaluate_quantization_requires_samples():
+    with pytest.raises(ValueError):
+        evaluate_quantization([], backend_factory=FakeBackend)
+
+
+def test_load_samples(tmp_path):
+    path = tmp_path / "samples.jsonl"
+    path.write_text(
+        json.dumps({"text": "good day", "label": "POSITIVE"}) + "\n"
+        + json.dumps({"text": "no label"}) + "\n",
+        encoding="utf-8"
+    )
+    assert load_samples(str(path)) == [("good day", "positive"), ("no label", None)]
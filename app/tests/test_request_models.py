@@ -0,0 +1,58 @@
+import pytest
+from pydantic import ValidationError
+from app.core.config import settings
+from app.models.request import BatchSentimentRequest, GraphSentimentRequest, LongTextSentimentRequest
+
+
+def test_batch_request_accepts_texts_and_nodes():
+    request = BatchSentimentRequest(
+        texts=["Create Game – Architecture"],
+        nodes=[{"id": "node_1", "text": "Fix login bug"}]
+    )
+    assert request.texts == ["Create Game – Architecture"]
+    assert request.nodes[0].id == "node_1"
+
+
+def test_batch_request_requires_items():
+    with pytest.raises(ValidationError):
+        BatchSentimentRequest()
+    with pytest.raises(ValidationError):
+        BatchSentimentRequest(texts=[], nodes=[])
+
+
+def test_batch_request_rejects_empty_text():
+    with pytest.raises(ValidationError):
+        BatchSentimentRequest(texts=[""])
+
+
+def test_batch_request_item_limit(monkeypatch):
+    monkeypatch.setattr(settings, "batch_request_max_items", 3)
+    BatchSentimentRequest(texts=["a", "b"], nodes=[{"id": "n", "text": "c"}])
+    with pytest.raises(ValidationError):
+        BatchSentimentRequest(texts=["a", "b", "c", "d"])
+
+
+def test_graph_request_defaults_to_no_edges():
+    request = GraphSentimentRequest(nodes=[{"id": "n1", "text": "Fix login bug"}])
+    assert request.edges == []
+
+
+def test_graph_request_requires_nodes():
+    with pytest.raises(ValidationError):
+        GraphSentimentRequest(nodes=[])
+
+
+def test_graph_request_edge_limit(monkeypatch):
+    monkeypatch.setattr(settings, "graph_delta_max_edges", 2)
+    nodes = [{"id": "a", "text": "Create game"}, {"id": "b", "text": "Fix login bug"}]
+    edges = [{"id": f"e{i}", "source": "a", "target": "b"} for i in range(3)]
+    assert len(GraphSentimentRequest(nodes=nodes, edges=edges[:2]).edges) == 2
+    with pytest.raises(ValidationError, match="At most 2 edges per graph"):
+        GraphSentimentRequest(nodes=nodes, edges=edges)
+
+
+def test_long_text_request_accepts_texts_over_the_short_limit():
+    request = LongTextSentimentRequest(text="word " * 1000, aggregation="length_weighted")
+    assert request.aggregation == "length_weighted"
+    with pytest.raises(ValidationError):
+        LongTextSentimentRequest(text="word", aggregation="median")
@@ -0,0 +1,159 @@
+import asyncio
+import json
+import pytest
+from fastapi.testclient import TestClient
+from starlette.requests import ClientDisconnect
+from app.core.config import settings
+from app.main import app
+from app.service import pipeline_sentiment
+from app.service.model_registry import model_registry
+from app.service.pipeline_sentiment import SentimentAnalyzer
+from app.tests.test_pipeline_sentiment import StubBackend
+
+HEADERS = {"X-API-Key": settings.api_key}
+
+
+@pytest.fixture
+def analyzer(monkeypatch):
+    monkeypatch.setattr(pipeline_sentiment, "load_backend", StubBackend)
+    monkeypatch.setattr(
+        pipeline_sentiment, "preprocess_batch", lambda texts: [t.lower().strip() for t in texts]
+    )
+    monkeypatch.setattr(settings, "persistent_cache_path", None)
+    analyzer = SentimentAnalyzer()
+    yield analyzer
+    analyzer.close()
+
+
+@pytest.fixture
+def client(analyzer, monkeypatch):
+    monkeypatch.setattr(model_registry, "_factory", lambda: analyzer)
+    monkeypatch.setattr(settings, "warmup_on_startup", False)
+    with TestClient(app) as client:
+        yield client
+
+
+def test_long_text_is_scored_in_windows(client, monkeypatch):
+    monkeypatch.setattr(settings, "long_text_window_overlap", 1)
+    url = "/api/v1/inference/predict/long"
+    # StubBackend: windows of 4 tokens, overlapping by 1, cover 10 words in 3 windows
+    response = client.post(url, json={
+        "text": " ".join(["word"] * 10), "node_id": "doc", "context": "report",
+        "aggregation": "length_weighted"
+    }, headers=HEADERS)
+    default = client.post(url, json={"text": "create game"}, headers=HEADERS)
+    invalid = client.post(url, json={"text": "create game", "aggregation": "median"}, headers=HEADERS)
+
+    assert response.status_code == 200
+    (node,) = response.json()["nodes"]
+    assert node["node_id"] == "doc"
+    assert node["metadata"] == {
+        "context": "report", "inference_type": "long_text_sentiment",
+        "chunks": 3, "aggregation": "length_weighted"
+    }
+    assert node["sentiment"]["label"] in ("positive", "negative")
+    (node,) = default.json()["nodes"]
+    assert node["node_id"] == "temp_node"
+    assert node["metadata"]["chunks"] == 1
+    assert node["metadata"]["aggregation"] == settings.long_text_aggregation
+    assert invalid.status_code == 422
+
+
+def test_batch_returns_texts_then_nodes_through_analyze_nodes(client, analyzer, monkeypatch):
+    calls = []
+    analyze_nodes = analyzer.analyze_nodes
+    monkeypatch.setattr(analyzer, "analyze_nodes", lambda nodes: calls.append(nodes) or analyze_nodes(nodes))
+    response = client.post("/api/v1/inference/predict/batch", json={
+        "texts": ["create game", "fix login bug"],
+        "nodes": [{"id": "n1", "text": "ship it now", "metadata": {"type": "task"}}],
+        "context": "nightly"
+    }, headers=HEADERS)
+
+    assert response.status_code == 200
+    assert len(calls) == 1
+    nodes = response.json()["nodes"]
+    assert [node["node_id"] for node in nodes] == ["text_0", "text_1", "n1"]
+    assert [node["sentiment"]["label"] for node in nodes] == ["negative", "positive", "positive"]
+    assert nodes[0]["metadata"] == {"context": "nightly", "inference_type": "text_sentiment"}
+    assert nodes[2]["metadata"] == {"type": "task", "context": "nightly", "inference_type": "node_sentiment"}
+    assert response.json()["metrics"]["sentiment_distribution"]["positive_nodes"] == 2
+
+
+def test_batch_validation(client, monkeypatch):
+    monkeypatch.setattr(settings, "batch_request_max_items", 3)
+    url = "/api/v1/inference/predict/batch"
+    within = client.post(url, json={"texts": ["a", "b"], "nodes": [{"id": "n", "text": "c"}]}, headers=HEADERS)
+    too_many = client.post(url, json={"texts": ["a", "b"], "nodes": [{"id": "n", "text": "c"}, {"id": "m", "text": "d"}]},
+                           headers=HEADERS)
+    empty = client.post(url, json={"texts": [], "nodes": []}, headers=HEADERS)
+    empty_text = client.post(url, json={"texts": [""]}, headers=HEADERS)
+    unauthorized = client.post(url, json={"texts": ["a"]}, headers={"X-API-Key": "wrong"})
+
+    assert within.status_code == 200
+    assert len(within.json()["nodes"]) == 3
+    assert too_many.status_code == 422
+    assert "At most 3 texts and nodes" in too_many.text
+    assert empty.status_code == 422
+    assert empty_text.status_code == 422
+    assert unauthorized.status_code in (401, 403)
+
+
+def test_stream_returns_one_line_per_input_line_in_order(client, monkeypatch):
+    monkeypatch.setattr(settings, "stream_batch_size", 2)
+    lines = [
+        json.dumps({"id": "a", "text": "create game"}),
+        "not json",
+        json.dumps({"id": "b", "text": "fix login bug"}),
+        "",
+        json.dumps({"id": "c"}),
+        json.dumps({"id": "d", "text": "x" * 1001}),
+        json.dumps({"id": "e", "text": "ship it now"})
+    ]
+    response = client.post(
+        "/api/v1/inference/predict/stream", content="\n".join(lines) + "\n", headers=HEADERS
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert [result["line"] for result in results] == [1, 2, 3, 5, 6, 7]
+    assert results[0] == {"line": 1, "id": "a", "sentiment": {"label": "negative", "score": 0.2}}
+    assert results[1] == {"line": 2, "error": "Invalid JSON"}
+    assert results[2]["sentiment"]["label"] == "positive"
+    assert results[3] == {"line": 5, "id": "c", "error": "Missing or empty 'text' field"}
+    assert results[4]["error"] == "'text' is longer than 1000 characters"
+    assert results[5]["id"] == "e"
+
+
+def test_stream_stops_when_the_client_disconnects(client, monkeypatch):
+    monkeypatch.setattr(settings, "stream_batch_size", 1)
+    monkeypatch.setattr(settings, "stream_max_in_flight_batches", 1)
+    body = [
+        {"type": "http.request", "body": (json.dumps({"id": "a", "text": "create game"}) + "\n").encode(),
+         "more_body": True},
+        {"type": "http.disconnect"}
+    ]
+    sent = []
+
+    async def receive():
+        return body.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    async def call():
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+            "method": "POST", "scheme": "http", "path": "/api/v1/inference/predict/stream",
+            "raw_path": b"/api/v1/inference/predict/stream", "root_path": "", "query_string": b"",
+            "headers": [(b"x-api-key", settings.api_key.encode())],
+            "client": ("test", 1), "server": ("test", 80)
+        }
+        with pytest.raises(ClientDisconnect):
+            await asyncio.wait_for(app(scope, receive, send), timeout=5)
+
+    client.portal.call(call)
+    bodies = b"".join(message.get("body", b"") for message in sent if message["type"] == "http.response.body")
+    # The line read before the disconnect was answered, then the stream ended
+    assert [json.loads(line)["id"] for line in bodies.splitlines()] == ["a"]
+    assert body == []
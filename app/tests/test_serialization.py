@@ -0,0 +1,128 @@
+import json
+import numpy as np
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.main import app
+from app.models.response import ColumnarGraphSentimentResponse, GraphSentimentResponse
+from app.service import pipeline_sentiment, serialization
+from app.service.model_registry import model_registry
+from app.service.pipeline_sentiment import SentimentAnalyzer
+from app.service.serialization import columnar_graph_response, encode_json, graph_response
+from app.tests.benchmark import TinyBackend, synthetic_graph
+
+HEADERS = {"X-API-Key": settings.api_key}
+
+
+@pytest.fixture
+def analyzer(monkeypatch):
+    monkeypatch.setattr(pipeline_sentiment, "load_backend", TinyBackend)
+    monkeypatch.setattr(
+        pipeline_sentiment, "preprocess_batch", lambda texts: [t.lower().strip() for t in texts]
+    )
+    monkeypatch.setattr(settings, "persistent_cache_path", None)
+    analyzer = SentimentAnalyzer()
+    yield analyzer
+    analyzer.close()
+
+
+def validated_json(nodes, edges, metrics):
+    """JSON of the validated pydantic model, as the routes produced it before the fast path."""
+    model = GraphSentimentResponse(nodes=nodes, edges=edges, metrics=metrics)
+    return json.loads(json.dumps(jsonable_encoder(GraphSentimentResponse.validate(model))))
+
+
+def test_fast_path_matches_the_response_schema(analyzer):
+    nodes, edges = synthetic_graph(200)
+    for index, node in enumerate(nodes):
+        node["metadata"] = {"type": "task", "rank": index}
+    result = analyzer.analyze_graph(nodes, edges)
+
+    fast = json.loads(encode_json(graph_response(result["nodes"], result["edges"], result["metrics"])))
+    assert fast == validated_json(result["nodes"], result["edges"], result["metrics"])
+    GraphSentimentResponse.parse_obj(fast)
+
+
+def test_fast_path_drops_extra_fields_and_encodes_numpy_scalars():
+    nodes = [{"node_id": "a", "text": "dropped", "sentiment": {"label": "positive", "score": np.float64(0.75)}}]
+    edges = [{
+        "edge_id": "ab",
+        "sentiment": {"label": "negative", "score": 0.25, "chunks": 3},
+        "connected_nodes": ("a", "b"),
+        "metadata": {"weight": 2}
+    }]
+    metrics = pipeline_sentiment.compute_graph_metrics(nodes, edges)
+    fast = json.loads(encode_json(graph_response(nodes, edges, metrics)))
+    assert fast == validated_json(nodes, edges, metrics)
+    # jsonable_encoder rejects NumPy integers; the fast path encodes them
+    assert json.loads(encode_json({"weight": np.int64(2)})) == {"weight": 2}
+
+
+def test_json_fallback_without_orjson(monkeypatch):
+    content = {"text": "émoji 😊", "score": np.float32(0.5), "values": [1, None, True]}
+    with_orjson = encode_json(content)
+    monkeypatch.setattr(serialization, "orjson", None)
+    assert json.loads(encode_json(content)) == json.loads(with_orjson)
+
+
+def test_columnar_rows_rebuild_the_graph_response(analyzer):
+    nodes, edges = synthetic_graph(50)
+    result = analyzer.analyze_graph(nodes, edges)
+    response = graph_response(result["nodes"], result["edges"], result["metrics"])
+    columnar = columnar_graph_response(response)
+
+    columns = columnar["nodes"]
+    rebuilt_nodes = [
+        {"node_id": node_id, "sentiment": {"label": label, "score": score}, "metadata": metadata}
+        for node_id, label, score, metadata in zip(
+            columns["node_id"], columns["label"], columns["score"], columns["metadata"]
+        )
+    ]
+    columns = columnar["edges"]
+    rebuilt_edges = [
+        {"edge_id": edge_id, "sentiment": {"label": label, "score": score},
+         "connected_nodes": connected, "metadata": metadata}
+        for edge_id, label, score, connected, metadata in zip(
+            columns["edge_id"], columns["label"], columns["score"],
+            columns["connected_nodes"], columns["metadata"]
+        )
+    ]
+    assert columnar["format"] == "columnar"
+    assert rebuilt_nodes == response["nodes"]
+    assert rebuilt_edges == response["edges"]
+    assert columnar["metrics"] == response["metrics"]
+
+
+def test_routes_return_the_same_json_with_and_without_validation(analyzer, monkeypatch):
+    monkeypatch.setattr(model_registry, "_factory", lambda: analyzer)
+    monkeypatch.setattr(settings, "warmup_on_startup", False)
+    nodes, edges = synthetic_graph(30)
+    body = {"nodes": nodes, "edges": edges}
+    with TestClient(app) as client:
+        fast = client.post("/api/v1/inference/analyze-graph", json=body, headers=HEADERS)
+        monkeypatch.setattr(settings, "validate_responses", True)
+        validated = client.post("/api/v1/inference/analyze-graph", json=body, headers=HEADERS)
+        columnar = client.post("/api/v1/inference/analyze-graph?format=columnar", json=body, headers=HEADERS)
+        invalid = client.post("/api/v1/inference/analyze-graph?format=xml", json=body, headers=HEADERS)
+
+    assert fast.status_code == 200
+    assert fast.headers["content-type"] == "application/json"
+    assert fast.json() == validated.json()
+    GraphSentimentResponse.parse_obj(fast.json())
+    assert columnar.json()["nodes"]["node_id"] == [node["id"] for node in nodes]
+    ColumnarGraphSentimentResponse.parse_obj(columnar.json())
+    assert invalid.status_code == 422
+
+
+def test_openapi_documents_both_response_formats():
+    schema = app.openapi()
+    refs = {"#/components/schemas/GraphSentimentResponse", "#/components/schemas/ColumnarGraphSentimentResponse"}
+    for path, method, status in [
+        ("/api/v1/inference/predict", "post", "200"),
+        ("/api/v1/inference/analyze-graph", "post", "200"),
+        ("/api/v1/inference/graph/sessions", "post", "201"),
+        ("/api/v1/inference/graph/sessions/{session_id}", "patch", "200")
+    ]:
+        response = schema["paths"][path][method]["responses"][status]
+        assert {option["$ref"] for option in response["content"]["application/json"]["schema"]["anyOf"]} == refs
@@ -0,0 +1,96 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+from app.core.startup_profile import StartupProfile, startup_profile, timed_import
+
+# Budget d'import de app.main, surchargeable sur les machines lentes
+COLD_START_BUDGET_SECONDS = float(os.environ.get("COLD_START_BUDGET_SECONDS", "2.0"))
+HEAVY_MODULES = ["torch", "transformers", "spacy", "nltk", "onnxruntime"]
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+COLD_IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "seconds": elapsed,
+    "loaded": [name for name in %r if name in sys.modules]
+}))
+""" % (HEAVY_MODULES,)
+
+# Services chargés avant l'import mesuré des routes (leur coût échapperait au profil)
+ROUTES_IMPORT_SCRIPT = """
+import json, sys
+from app.core import startup_profile
+timed_import = startup_profile.timed_import
+loaded = {}
+def spy(name):
+    loaded[name] = sorted(module for module in sys.modules if module.startswith("app.service"))
+    return timed_import(name)
+startup_profile.timed_import = spy
+import app.main
+print(json.dumps(loaded["app.api.routes"]))
+"""
+
+
+def test_phase_records_duration():
+    profile = StartupProfile()
+    with profile.phase("model_load"):
+        pass
+    with pytest.raises(RuntimeError):
+        with profile.phase("warmup"):
+            raise RuntimeError("load failed")
+
+    report = profile.to_dict()
+    assert set(report["phases"]) == {"model_load", "warmup"}
+    assert not report["ready"]
+    assert report["time_to_ready_seconds"] is None
+
+
+def test_mark_ready_reports_time_since_process_start():
+    profile = StartupProfile()
+    profile.mark_ready()
+    report = profile.to_dict()
+    assert report["ready"]
+    assert report["time_to_ready_seconds"] >= 0
+
+
+def test_timed_import_records_new_modules_only():
+    sys.modules.pop("colorsys", None)
+    module = timed_import("colorsys")
+    assert module is sys.modules["colorsys"]
+    assert "colorsys" in startup_profile.imports
+
+    startup_profile.imports.pop("json", None)
+    timed_import("json")
+    assert "json" not in startup_profile.imports
+
+
+def test_cold_import_defers_heavy_dependencies():
+    result = subprocess.run(
+        [sys.executable, "-c", COLD_IMPORT_SCRIPT],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    assert report["loaded"] == []
+    assert report["seconds"] < COLD_START_BUDGET_SECONDS, (
+        f"Import de app.main en {report['seconds']:.2f}s "
+        f"(budget {COLD_START_BUDGET_SECONDS}s)"
+    )
+
+
+def test_routes_import_measures_the_services():
+    result = subprocess.run(
+        [sys.executable, "-c", ROUTES_IMPORT_SCRIPT],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == []
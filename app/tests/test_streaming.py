@@ -0,0 +1,137 @@
+import asyncio
+import json
+from app.service.executor import QueueFullError
+from app.service.streaming import iter_lines, stream_sentiments
+
+
+async def chunked(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def fake_runner(texts):
+    await asyncio.sleep(0)
+    return [{"label": "positive", "score": round(len(text) / 100, 4)} for text in texts]
+
+
+def run_stream(data: bytes, chunk_size: int = 7, **kwargs):
+    async def scenario():
+        return [
+            json.loads(line)
+            async for line in stream_sentiments(chunked(data, chunk_size), **kwargs)
+        ]
+    return asyncio.run(scenario())
+
+
+def ndjson(records):
+    return "".join(json.dumps(record) + "\n" for record in records).encode("utf-8")
+
+
+def test_one_result_per_line_in_order():
+    records = [{"id": f"r{i}", "text": "x" * (i + 1)} for i in range(25)]
+    results = run_stream(ndjson(records), runner=fake_runner, batch_size=4, max_in_flight=3)
+
+    assert [r["id"] for r in results] == [f"r{i}" for i in range(25)]
+    assert [r["line"] for r in results] == list(range(1, 26))
+    assert [r["sentiment"]["score"] for r in results] == [round((i + 1) / 100, 4) for i in range(25)]
+
+
+def test_invalid_lines_are_reported_without_stopping_the_stream():
+    data = b'{"id": "a", "text": "fine"}\nnot json\n\n{"id": "b"}\n["list"]\n{"id": "c", "text": "ok"}'
+    results = run_stream(data, runner=fake_runner, batch_size=2, max_in_flight=1)
+
+    assert [r["line"] for r in results] == [1, 2, 4, 5, 6]
+    assert "sentiment" in results[0]
+    assert results[1]["error"] == "Invalid JSON"
+    assert results[2] == {"line": 4, "id": "b", "error": "Missing or empty 'text' field"}
+    assert results[3]["error"] == "Expected a JSON object"
+    assert results[4]["id"] == "c" and "sentiment" in results[4]
+
+
+def test_custom_text_and_id_fields():
+    data = ndjson([{"request_id": "user-001", "body": "Batch the nodes"}])
+    results = run_stream(data, runner=fake_runner, text_field="body", id_field="request_id")
+    assert results[0]["id"] == "user-001"
+    assert "sentiment" in results[0]
+
+
+def test_oversized_line_is_skipped():
+    data = b'{"text": "' + b"a" * 100 + b'"}\n{"text": "short"}\n'
+
+    async def scenario():
+        return [item async for item in iter_lines(chunked(data, 16), max_line_bytes=50)]
+
+    items = asyncio.run(scenario())
+    assert items[0] == {"line": 1, "error": "Line exceeds 50 bytes"}
+    assert items[1] == {"line": 2, "raw": b'{"text": "short"}'}
+
+
+def test_in_flight_batches_are_bounded():
+    pulled = 0
+    running = 0
+    max_running = 0
+
+    async def source():
+        nonlocal pulled
+        for i in range(1000):
+            pulled += 1
+            yield (json.dumps({"id": i, "text": f"text {i}"}) + "\n").encode("utf-8")
+
+    async def slow_runner(texts):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.001)
+        running -= 1
+        return [{"label": "negative", "score": 0.1} for _ in texts]
+
+    async def scenario():
+        stream = stream_sentiments(source(), runner=slow_runner, batch_size=10, max_in_flight=2)
+        first = await stream.__anext__()
+        pulled_before_first_result = pulled
+        rest = [line async for line in stream]
+        return first, pulled_before_first_result, rest
+
+    first, pulled_before_first_result, rest = asyncio.run(scenario())
+    assert json.loads(first)["id"] == 0
+    assert len(rest) == 999
+    assert max_running <= 2
+    # Only the batches in flight (plus the one being formed) were read ahead
+    assert pulled_before_first_result <= 3 * 10
+
+
+def test_failed_batch_reports_errors_and_full_queue_is_retried():
+    calls = []
+
+    async def flaky_runner(texts):
+        calls.append(list(texts))
+        if len(calls) == 1:
+            raise QueueFullError(retry_after=0)
+        if "boom" in texts:
+            raise RuntimeError("model crashed")
+        return [{"label": "positive", "score": 0.9} for _ in texts]
+
+    data = ndjson([{"id": "a", "text": "ok"}, {"id": "b", "text": "boom"}])
+    results = run_stream(data, runner=flaky_runner, batch_size=1, max_in_flight=1)
+
+    assert results[0]["sentiment"] == {"label": "positive", "score": 0.9}
+    assert results[1] == {"line": 2, "id": "b", "error": "Inference failed"}
+    assert len(calls) == 3
+
+
+def test_full_queue_wait_is_capped():
+    calls = []
+
+    async def saturated_runner(texts):
+        calls.append(list(texts))
+        raise QueueFullError(retry_after=1)
+
+    data = ndjson([{"id": "a", "text": "ok"}, {"id": "b"}])
+    results = run_stream(data, runner=saturated_runner, batch_size=2, max_queue_wait=0.05)
+
+    assert results == [
+        {"line": 1, "id": "a", "error": "Inference queue is full"},
+        {"line": 2, "id": "b", "error": "Missing or empty 'text' field"}
+    ]
+    # One try, a wait shortened to the cap, one last try
+    assert len(calls) == 2
@@ -1,9 +1,7 @@
+import itertools
+import re
 import pytest
-from app.utils.text_cleaner import TextCleaner
-
-@pytest.fixture
-def text_cleaner():
-    return TextCleaner()
+from app.utils.text_cleaner import _compile_removal_patterns
 
 def test_clean_text_basic(text_cleaner):
     text = "Hello! This is a test #hashtag @mention http://example.com"
@@ -46,3 +44,58 @@ def test_preprocess_text_special_characters(text_cleaner):
     assert "��" not in processed
     assert "@" not in processed
     assert "#" not in processed
+
+
+def test_preprocess_batch_matches_single_text(text_cleaner):
+    texts = [
+        "RT @user: The quick brown fox #jumps over the lazy dog! http://example.com",
+        "running jumping swimming",
+        "",
+        None,
+    ]
+    batch = text_cleaner.preprocess_batch(texts, batch_size=2)
+    assert not isinstance(batch, list), "Le prétraitement par lots doit être un générateur"
+    assert list(batch) == [text_cleaner.preprocess_text(text) for text in texts]
+
+def test_preprocess_batch_streams_input(text_cleaner):
+    consumed = []
+
+    def source():
+        for text in ["running dogs", "jumping cats", "swimming fish"]:
+            consumed.append(text)
+            yield text
+
+    batch = text_cleaner.preprocess_batch(source(), batch_size=1)
+    assert next(batch) == "run dog"
+    assert len(consumed) < 3
+
+def test_spacy_pipeline_is_pruned(text_cleaner):
+    assert "parser" not in text_cleaner.nlp.pipe_names
+    assert "ner" not in text_cleaner.nlp.pipe_names
+    assert "lemmatizer" in text_cleaner.nlp.pipe_names
+
+@pytest.mark.parametrize("flags", list(itertools.product([True, False], repeat=4)))
+def test_compiled_patterns_match_sequential_rules(flags):
+    remove_urls, remove_mentions, remove_hashtags, remove_special_chars = flags
+    texts = [
+        "Hello! This is a test #hashtag @mention http://example.com",
+        "#www#bb!#www #awwwp",
+        "@http#www péah#b!bt",
+        "!@#wwwth!#éwww.www@@",
+        "a@bhttp://x y #a@b www.site.com",
+    ]
+    for text in texts:
+        expected = text
+        if remove_urls:
+            expected = re.sub(r"http\S+|www\S+", "", expected)
+        if remove_mentions:
+            expected = re.sub(r"@\S+", "", expected)
+        if remove_hashtags:
+            expected = re.sub(r"#\S+", "", expected)
+        if remove_special_chars:
+            expected = re.sub(r"[^a-zA-Z0-9\s]", "", expected)
+
+        result = text
+        for pattern in _compile_removal_patterns(*flags):
+            result = pattern.sub("", result)
+        assert result == expected
@@ -0,0 +1,84 @@
+import threading
+import pytest
+from app.service import tokenization
+from app.service.tokenization import TokenizationStage
+
+
+class FakeTokenizer:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return [[len(word) for word in text.split()] for text in texts]
+
+
+@pytest.fixture
+def tokenizer():
+    return FakeTokenizer()
+
+
+def test_cached_texts_are_not_tokenized_again(tokenizer):
+    stage = TokenizationStage(tokenizer, max_cached_tokens=100)
+    first = stage.encode(["create game", "fix login bug"])
+    second = stage.encode(["fix login bug", "new text", "new text"])
+
+    assert [ids.tolist() for ids in first] == [[6, 4], [3, 5, 3]]
+    assert [ids.tolist() for ids in second] == [[3, 5, 3], [3, 4], [3, 4]]
+    # Duplicates within a call are encoded once, cached texts not at all
+    assert tokenizer.calls == [["create game", "fix login bug"], ["new text"]]
+    assert stage.stats()["hits"] == 1
+
+
+def test_cache_is_bounded_by_tokens(tokenizer):
+    stage = TokenizationStage(tokenizer, max_cached_tokens=4)
+    stage.encode(["a b", "c d"])
+    stage.encode(["e f g"])
+
+    stats = stage.stats()
+    assert stats["cached_tokens"] <= 4
+    assert stats["evictions"] == 2
+    stage.encode(["a b"])
+    assert tokenizer.calls[-1] == ["a b"]
+
+
+def test_disabled_cache(tokenizer):
+    stage = TokenizationStage(tokenizer, max_cached_tokens=0)
+    stage.encode(["a b"])
+    stage.encode(["a b"])
+    assert len(tokenizer.calls) == 2
+    assert stage.stats()["cached_texts"] == 0
+
+
+def test_encode_async(tokenizer):
+    stage = TokenizationStage(tokenizer, max_cached_tokens=100)
+    try:
+        future = stage.encode_async(["create game"])
+        assert [ids.tolist() for ids in future.result(timeout=5)] == [[6, 4]]
+    finally:
+        stage.close()
+
+
+def test_concurrent_first_calls_share_one_thread(tokenizer, monkeypatch):
+    created = []
+    pool_class = tokenization.ThreadPoolExecutor
+
+    def counting_pool(*args, **kwargs):
+        created.append(1)
+        return pool_class(*args, **kwargs)
+
+    monkeypatch.setattr(tokenization, "ThreadPoolExecutor", counting_pool)
+    stage = TokenizationStage(tokenizer, max_cached_tokens=100)
+    barrier = threading.Barrier(8)
+
+    def first_call(index):
+        barrier.wait()
+        return stage.encode_async([f"text {index}"]).result(timeout=5)
+
+    try:
+        with pool_class(max_workers=8) as callers:
+            results = list(callers.map(first_call, range(8)))
+        assert len(results) == 8
+        assert created == [1]
+    finally:
+        stage.close()
@@ -0,0 +1,45 @@
+import pytest
+from app.service.windowing import aggregate_windows, plan_windows
+
+
+def test_short_sequence_fits_one_window():
+    assert plan_windows(10, window_size=510, overlap=128) == [(0, 10)]
+    assert plan_windows(0, window_size=510, overlap=128) == [(0, 0)]
+
+
+def test_windows_overlap_and_cover_the_sequence():
+    windows = plan_windows(25, window_size=10, overlap=3)
+    assert windows == [(0, 10), (7, 17), (14, 24), (21, 25)]
+    for (_, previous_end), (start, _) in zip(windows, windows[1:]):
+        assert previous_end - start == 3
+
+
+def test_overlap_is_capped_below_window_size():
+    assert plan_windows(4, window_size=2, overlap=5) == [(0, 2), (1, 3), (2, 4)]
+
+
+RESULTS = [
+    {"label": "positive", "score": 0.9},
+    {"label": "negative", "score": 0.6},
+    {"label": "negative", "score": 0.99}
+]
+
+
+def test_mean_averages_positive_probability():
+    # P(positive) = 0.9, 0.4, 0.01 -> 0.4367
+    assert aggregate_windows(RESULTS, [10, 10, 10], "mean") == {"label": "negative", "score": 0.5633}
+
+
+def test_length_weighted_favours_long_windows():
+    result = aggregate_windows(RESULTS, [100, 10, 1], "length_weighted")
+    assert result["label"] == "positive"
+    assert result["score"] == round((100 * 0.9 + 10 * 0.4 + 1 * 0.01) / 111, 4)
+
+
+def test_max_confidence_keeps_most_certain_window():
+    assert aggregate_windows(RESULTS, [100, 10, 1], "max_confidence") == {"label": "negative", "score": 0.99}
+
+
+def test_unknown_strategy():
+    with pytest.raises(ValueError):
+        aggregate_windows(RESULTS, [1, 1, 1], "median")
@@ -1,12 +1,14 @@
 import re 
 import unicodedata
-import nltk
-import spacy
-from nltk.corpus import stopwords
-from typing import Optional, List
+from typing import Optional, List, Pattern, Tuple, Iterable, Iterator
+from functools import lru_cache
 import logging
+import threading
+import time
 from dataclasses import dataclass
 from app.core.config import settings
+from app.core.startup_profile import timed_import
+from app.core.metrics import stage_latency
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
@@ -20,45 +22,91 @@ class CleaningConfig:
     remove_special_chars: bool = True
     to_lowercase: bool = True
 
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+_DEFAULT_CONFIG = CleaningConfig()
+
+# Composants spaCy inutiles à la lemmatisation (le lemmatiseur n'utilise que tagger/attribute_ruler)
+_UNUSED_SPACY_COMPONENTS = ["parser", "ner"]
+
+@lru_cache(maxsize=None)
+def _compile_removal_patterns(
+    remove_urls: bool,
+    remove_mentions: bool,
+    remove_hashtags: bool,
+    remove_special_chars: bool
+) -> Tuple[Pattern, ...]:
+    """
+    Précompile les règles de suppression actives.
+    
+    Quand la suppression des caractères spéciaux est active, toutes les règles
+    sont fusionnées en une seule expression : les alternatives URL/mention/
+    hashtag passent avant la classe des caractères spéciaux, et le résultat est
+    identique aux re.sub successifs. Sans elle, un "@" ou "#" laissé par une
+    règle précédente resterait dans le texte ; les règles sont alors gardées
+    séparées (mais précompilées) pour conserver exactement le même résultat.
+    """
+    marker_rules = []
+    if remove_urls:
+        marker_rules.append(r"http\S+|www\S+")
+    if remove_mentions:
+        marker_rules.append(r"@\S+")
+    if remove_hashtags:
+        marker_rules.append(r"#\S+")
+    if remove_special_chars:
+        return (re.compile("|".join(marker_rules + [r"[^a-zA-Z0-9\s]"])),)
+    return tuple(re.compile(rule) for rule in marker_rules)
+
+def regex_clean_text(text: str, config: Optional[CleaningConfig] = None) -> str:
+    """
+    Passe regex du nettoyage (URLs, mentions, hashtags, caractères spéciaux,
+    espaces, minuscules), sans spaCy ni NLTK.
+    
+    Args:
+        text (str): Le texte à nettoyer
+        config (Optional[CleaningConfig]): Règles actives (toutes par défaut)
+        
+    Returns:
+        str: Le texte nettoyé
+    """
+    config = config or _DEFAULT_CONFIG
+    patterns = _compile_removal_patterns(
+        config.remove_urls,
+        config.remove_mentions,
+        config.remove_hashtags,
+        config.remove_special_chars
+    )
+    for pattern in patterns:
+        text = pattern.sub("", text)
+    text = _WHITESPACE_PATTERN.sub(" ", text)
+    if config.to_lowercase:
+        text = text.lower()
+    return text.strip()
+
 class TextCleaner:
     def __init__(self, config: Optional[CleaningConfig] = None):
         self.config = config or CleaningConfig()
         self.logger = logging.getLogger(__name__)
         try:
-            self.nlp = spacy.load("en_core_web_sm")
+            # spaCy et NLTK sont importés ici et non au chargement du module,
+            # pour ne pas ralentir le démarrage de l'API
+            spacy = timed_import("spacy")
+            stopwords = timed_import("nltk.corpus").stopwords
+            self.nlp = spacy.load("en_core_web_sm", exclude=_UNUSED_SPACY_COMPONENTS)
             self.stop_words = set(stopwords.words("english"))
             logger.info("TextCleaner initialisé avec succès")
         except Exception as e:
             logger.error(f"Erreur lors de l'initialisation de TextCleaner: {str(e)}")
             raise
 
-    def _apply_regex_cleaning(self, text: str) -> str:
-        """Applique les règles de nettoyage regex."""
-        if self.config.remove_urls:
-            text = re.sub(r"http\S+|www\S+", "", text)
-        if self.config.remove_mentions:
-            text = re.sub(r"@\S+", "", text)
-        if self.config.remove_hashtags:
-            text = re.sub(r"#\S+", "", text)
-        if self.config.remove_special_chars:
-            text = re.sub(r"[^a-zA-Z0-9\s]", "", text)
-        return text
-
     def clean_text(self, text: str) -> str:
         """Nettoie le texte selon la configuration."""
-        if not text:
+        if not text or not isinstance(text, str):
             return ""
             
         try:
-            # Nettoyage de base
-            text = self._apply_regex_cleaning(text)
-            text = re.sub(r"\s+", " ", text)
-            
-            # Conversion en minuscules si configuré
-            if self.config.to_lowercase:
-                text = text.lower()
-                
-            return text.strip()
+            # Règles regex précompilées (une passe par défaut)
+            return regex_clean_text(text, self.config)
             
         except Exception as e:
             self.logger.error(f"Erreur lors du nettoyage: {str(e)}")
@@ -115,7 +163,7 @@ class TextCleaner:
         Returns:
             str: Le texte prétraité
         """
-        if not text:
+        if not text or not isinstance(text, str):
             return ""
             
         try:
@@ -126,3 +174,124 @@ class TextCleaner:
         except Exception as e:
             logger.error(f"Erreur lors du prétraitement: {str(e)}")
             return text
+
+    def lemmatize_batch(
+        self,
+        texts: Iterable[str],
+        batch_size: Optional[int] = None,
+        n_process: Optional[int] = None
+    ) -> Iterator[str]:
+        """
+        Lemmatise un flux de textes avec nlp.pipe.
+        
+        Args:
+            texts (Iterable[str]): Les textes à lemmatiser
+            batch_size (Optional[int]): Textes par lot spaCy (défaut : settings.spacy_batch_size)
+            n_process (Optional[int]): Processus spaCy (défaut : settings.spacy_n_process)
+            
+        Yields:
+            str: Les textes lemmatisés, dans le même ordre
+        """
+        docs = self.nlp.pipe(
+            texts,
+            batch_size=batch_size or settings.spacy_batch_size,
+            n_process=n_process or settings.spacy_n_process
+        )
+        try:
+            for doc in docs:
+                yield " ".join([token.lemma_ for token in doc])
+        except Exception as e:
+            logger.error(f"Erreur lors de la lemmatisation par lots: {str(e)}")
+            raise
+
+    def preprocess_batch(
+        self,
+        texts: Iterable[str],
+        batch_size: Optional[int] = None,
+        n_process: Optional[int] = None
+    ) -> Iterator[str]:
+        """
+        Prétraite un flux de textes : nettoyage, mots vides puis lemmatisation par lots.
+        
+        Les textes sont consommés et produits au fil de l'eau, sans tout garder en mémoire.
+        
+        Args:
+            texts (Iterable[str]): Les textes à prétraiter
+            batch_size (Optional[int]): Textes par lot spaCy (défaut : settings.spacy_batch_size)
+            n_process (Optional[int]): Processus spaCy (défaut : settings.spacy_n_process)
+            
+        Returns:
+            Iterator[str]: Générateur des textes prétraités, dans le même ordre
+        """
+        without_stopwords = (self.remove_stopwords(self.clean_text(text)) for text in texts)
+        return self.lemmatize_batch(without_stopwords, batch_size=batch_size, n_process=n_process)
+
+def _timed_stage(items: Iterator[str], stage: str) -> Iterator[str]:
+    """
+    Mesure le temps passé dans un générateur (hors temps du consommateur).
+    
+    Args:
+        items (Iterator[str]): Le générateur à mesurer
+        stage (str): Étape de pipeline enregistrée dans les métriques
+        
+    Yields:
+        str: Les éléments du générateur, inchangés
+    """
+    elapsed = 0.0
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(items)
+        except StopIteration:
+            break
+        finally:
+            elapsed += time.perf_counter() - start
+        yield item
+    stage_latency.observe(elapsed, stage=stage)
+
+# Instance partagée, construite au premier usage (chargement spaCy/NLTK coûteux)
+_shared_cleaner: Optional[TextCleaner] = None
+_shared_cleaner_lock = threading.Lock()
+
+def get_text_cleaner() -> TextCleaner:
+    """Retourne le TextCleaner partagé du processus, construit au premier appel."""
+    global _shared_cleaner
+    if _shared_cleaner is None:
+        with _shared_cleaner_lock:
+            if _shared_cleaner is None:
+                _shared_cleaner = TextCleaner()
+    return _shared_cleaner
+
+def preprocess_text(text: str) -> str:
+    """
+    Prétraite un texte avec le TextCleaner partagé.
+    
+    Args:
+        text (str): Le texte à prétraiter
+        
+    Returns:
+        str: Le texte prétraité
+    """
+    with stage_latency.time(stage="clean"):
+        return get_text_cleaner().preprocess_text(text)
+
+def preprocess_batch(
+    texts: Iterable[str],
+    batch_size: Optional[int] = None,
+    n_process: Optional[int] = None
+) -> Iterator[str]:
+    """
+    Prétraite un flux de textes avec le TextCleaner partagé (lemmatisation via nlp.pipe).
+    
+    Args:
+        texts (Iterable[str]): Les textes à prétraiter
+        batch_size (Optional[int]): Textes par lot spaCy (défaut : settings.spacy_batch_size)
+        n_process (Optional[int]): Processus spaCy (défaut : settings.spacy_n_process)
+        
+    Returns:
+        Iterator[str]: Générateur des textes prétraités, dans le même ordre
+    """
+    return _timed_stage(
+        get_text_cleaner().preprocess_batch(texts, batch_size=batch_size, n_process=n_process),
+        "clean"
+    )